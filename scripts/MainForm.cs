@@ -1418,6 +1418,32 @@ namespace CS2KZMappingTools
             }
             menu.Items.Add(opacityMenu);
             
+            // Frame cap of the Python tool windows (they read it from settings.json, live)
+            var fpsMenu = new ToolStripMenuItem("Tool FPS Cap");
+            fpsMenu.DropDown.BackColor = theme.WindowBackground;
+            fpsMenu.DropDown.ForeColor = theme.Text;
+            fpsMenu.DropDown.Renderer = new ToolStripProfessionalRenderer(new CustomColorTable(theme));
+            ((ToolStripDropDownMenu)fpsMenu.DropDown).ShowCheckMargin = true;
+            ((ToolStripDropDownMenu)fpsMenu.DropDown).ShowImageMargin = false;
+            fpsMenu.DropDown.ShowItemToolTips = false;
+            
+            int[] fpsValues = { 30, 60, 120, 144, 240 };
+            
+            foreach (int fps in fpsValues)
+            {
+                int fpsValue = fps;
+                var fpsItem = new ToolStripMenuItem($"{fps} FPS")
+                {
+                    Checked = _settings.ImguiMaxFps == fpsValue
+                };
+                fpsItem.Click += (s, e) =>
+                {
+                    _settings.ImguiMaxFps = fpsValue;
+                };
+                fpsMenu.DropDownItems.Add(fpsItem);
+            }
+            menu.Items.Add(fpsMenu);
+            
             menu.Items.Add(new ToolStripSeparator());
             
             // Auto-Update Source2Viewer toggle
@@ -130,6 +130,12 @@ namespace CS2KZMappingTools
             get => _settings.GitHubToken;
             set { _settings.GitHubToken = value; SaveSettings(); }
         }
+
+        public int ImguiMaxFps
+        {
+            get => _settings.ImguiMaxFps;
+            set { _settings.ImguiMaxFps = value; SaveSettings(); }
+        }
     }
 
     public class Settings
@@ -171,5 +177,7 @@ namespace CS2KZMappingTools
         public float Scale { get; set; } = 1.0f;
         public bool ShowConsole { get; set; } = false;
         public string GitHubToken { get; set; } = ""; // Optional: increases API rate limit from 60 to 5000/hour
+        [JsonProperty("imgui_max_fps")]
+        public int ImguiMaxFps { get; set; } = 60; // Frame cap of the Python tools (Sounds, CS2 Importer) while animating
     }
 }
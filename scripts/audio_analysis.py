@@ -0,0 +1,250 @@
+"""
+Audio analysis for the CS2 Sounds Manager
+Decodes WAV samples with NumPy and builds min/max peak pyramids for the timeline
+"""
+
+import os
+import struct
+
+import numpy as np
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+PEAK_BASE_FRAMES = 256  # Frames per peak at the finest pyramid level
+PEAK_MIN_LEVEL_SIZE = 64  # Stop halving once a level is this small
+DECODE_BLOCK_FRAMES = PEAK_BASE_FRAMES * 4096  # Frames converted to float at a time (bounded memory)
+
+
+class PeakPyramid:
+    """Min/max peaks of an audio signal at several zoom levels.
+
+    Level 0 holds the min and max of every PEAK_BASE_FRAMES frames (across all
+    channels); every following level halves the resolution. A view picks the
+    coarsest level that still has a peak per output point, so zooming in never
+    needs the samples again.
+    """
+
+    def __init__(self, mins, maxs, framerate, n_frames):
+        self.framerate = framerate
+        self.n_frames = n_frames
+        self.levels = [(mins, maxs)]
+        while len(mins) > PEAK_MIN_LEVEL_SIZE:
+            if len(mins) % 2:
+                mins = np.append(mins, mins[-1])
+                maxs = np.append(maxs, maxs[-1])
+            mins = np.minimum(mins[0::2], mins[1::2])
+            maxs = np.maximum(maxs[0::2], maxs[1::2])
+            self.levels.append((mins, maxs))
+
+        base_mins, base_maxs = self.levels[0]
+        self.peak = float(max(-base_mins.min(), base_maxs.max())) if len(base_mins) else 0.0
+        self.last_view = (None, None)  # (key, result) of the last get_peaks call
+
+    @property
+    def duration_ms(self):
+        return int(self.n_frames * 1000 / self.framerate) if self.framerate else 0
+
+    def frames_per_peak(self, level):
+        return PEAK_BASE_FRAMES << level
+
+    def get_peaks(self, start_ms, end_ms, num_points):
+        """Return (mins, maxs) arrays of num_points for the range start_ms..end_ms"""
+        key = (start_ms, end_ms, num_points)
+        last_key, last_result = self.last_view
+        if key == last_key:
+            return last_result
+
+        start_frame = max(0, int(start_ms * self.framerate / 1000))
+        end_frame = min(self.n_frames, int(end_ms * self.framerate / 1000))
+        frames_per_point = max(1, end_frame - start_frame) / max(1, num_points)
+
+        # Coarsest level that still has at least one peak per point
+        level = 0
+        while level + 1 < len(self.levels) and self.frames_per_peak(level + 1) <= frames_per_point:
+            level += 1
+
+        mins, maxs = self.levels[level]
+        if not len(mins):
+            result = (np.zeros(num_points, np.float32), np.zeros(num_points, np.float32))
+        else:
+            step = self.frames_per_peak(level)
+            first = min(start_frame // step, len(mins) - 1)
+            last = min(max(first + 1, -(-end_frame // step)), len(mins))
+            edges = np.linspace(0, last - first, num_points, endpoint=False).astype(np.intp)
+            result = (np.minimum.reduceat(mins[first:last], edges), np.maximum.reduceat(maxs[first:last], edges))
+
+        self.last_view = (key, result)
+        return result
+
+    def get_envelope(self, num_points):
+        """Peak amplitude (max of |min|, |max|) over the whole file as a list of num_points floats"""
+        mins, maxs = self.get_peaks(0, self.duration_ms, num_points)
+        return np.maximum(-mins, maxs).tolist()
+
+
+class PeakAccumulator:
+    """Builds level 0 peaks from decoded chunks as they arrive (streamed decodes).
+
+    to_pyramid() can be called at any time; the part that is not decoded yet is
+    padded with silence so the time axis of the timeline stays put while it fills.
+    """
+
+    def __init__(self, framerate, expected_frames=0):
+        self.framerate = framerate
+        self.expected_frames = expected_frames
+        self.n_frames = 0
+        self.mins = []
+        self.maxs = []
+        self.pending = None  # Frames that do not fill a whole bucket yet
+
+    def add(self, frames):
+        """Add a float32 (frames, channels) chunk"""
+        self.n_frames += len(frames)
+        if self.pending is not None:
+            frames = np.concatenate((self.pending, frames))
+            self.pending = None
+
+        whole = len(frames) - len(frames) % PEAK_BASE_FRAMES
+        if whole:
+            chunk_mins, chunk_maxs = frames_to_peaks(frames[:whole])
+            self.mins.append(chunk_mins)
+            self.maxs.append(chunk_maxs)
+        if whole < len(frames):
+            self.pending = frames[whole:]
+
+    def to_pyramid(self, final=False):
+        """Peak pyramid of everything decoded so far (final: the decode is complete)"""
+        mins = list(self.mins)
+        maxs = list(self.maxs)
+        if final and self.pending is not None:
+            pending_mins, pending_maxs = frames_to_peaks(self.pending)
+            mins.append(pending_mins)
+            maxs.append(pending_maxs)
+
+        mins = np.concatenate(mins) if mins else np.zeros(0, np.float32)
+        maxs = np.concatenate(maxs) if maxs else np.zeros(0, np.float32)
+
+        n_frames = self.n_frames if final else max(self.n_frames, self.expected_frames)
+        missing = -(-n_frames // PEAK_BASE_FRAMES) - len(mins)
+        if missing > 0:
+            mins = np.concatenate((mins, np.zeros(missing, np.float32)))
+            maxs = np.concatenate((maxs, np.zeros(missing, np.float32)))
+        return PeakPyramid(mins.astype(np.float32), maxs.astype(np.float32), self.framerate, n_frames)
+
+
+def read_wav_format(f):
+    """Parse the RIFF chunks of a WAV file.
+
+    Returns (format_tag, channels, framerate, bits_per_sample, data_offset, data_size)
+    """
+    header = f.read(12)
+    if len(header) < 12 or header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+        raise ValueError("Not a RIFF/WAVE file")
+
+    fmt = None
+    while True:
+        chunk_header = f.read(8)
+        if len(chunk_header) < 8:
+            raise ValueError("WAV file has no data chunk")
+        chunk_id, chunk_size = struct.unpack('<4sI', chunk_header)
+
+        if chunk_id == b'fmt ':
+            chunk = f.read(chunk_size)
+            format_tag, channels, framerate, _, _, bits = struct.unpack_from('<HHIIHH', chunk, 0)
+            if format_tag == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 26:
+                # Real format is the first two bytes of the SubFormat GUID
+                format_tag = struct.unpack_from('<H', chunk, 24)[0]
+            fmt = (format_tag, channels, framerate, bits)
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise ValueError("WAV data chunk before fmt chunk")
+            data_offset = f.tell()
+            # Streamed WAVs may carry a placeholder size, clamp to what is really there
+            file_size = os.fstat(f.fileno()).st_size
+            data_size = min(chunk_size, file_size - data_offset)
+            return fmt + (data_offset, data_size)
+        else:
+            f.seek(chunk_size, os.SEEK_CUR)
+
+        # Chunks are word aligned
+        if chunk_size % 2:
+            f.seek(1, os.SEEK_CUR)
+
+
+def samples_to_float(raw, format_tag, bits, channels):
+    """Convert raw little-endian sample bytes into a float32 (frames, channels) array in -1..1"""
+    if format_tag == WAVE_FORMAT_IEEE_FLOAT:
+        if bits == 32:
+            samples = np.frombuffer(raw, '<f4').astype(np.float32)  # Copy, never a view into the mapping
+        elif bits == 64:
+            samples = np.frombuffer(raw, '<f8').astype(np.float32)
+        else:
+            raise ValueError(f"Unsupported float WAV ({bits}-bit)")
+    elif format_tag == WAVE_FORMAT_PCM:
+        if bits == 8:
+            samples = (np.frombuffer(raw, np.uint8).astype(np.float32) - 128.0) / 128.0
+        elif bits == 16:
+            samples = np.frombuffer(raw, '<i2').astype(np.float32) / 32768.0
+        elif bits == 24:
+            # Place the 3 bytes in the top of an int32 so the shift sign-extends
+            triplets = np.frombuffer(raw, np.uint8).reshape(-1, 3)
+            widened = np.zeros((len(triplets), 4), np.uint8)
+            widened[:, 1:] = triplets
+            samples = (widened.view('<i4').ravel() >> 8).astype(np.float32) / 8388608.0
+        elif bits == 32:
+            samples = np.frombuffer(raw, '<i4').astype(np.float32) / 2147483648.0
+        else:
+            raise ValueError(f"Unsupported PCM WAV ({bits}-bit)")
+    else:
+        raise ValueError(f"Unsupported WAV format 0x{format_tag:04x}")
+
+    return samples.reshape(-1, channels)
+
+
+def frames_to_peaks(frames):
+    """Per-bucket min/max (across channels) of a (frames, channels) float array"""
+    frame_mins = frames.min(axis=1)
+    frame_maxs = frames.max(axis=1)
+    starts = np.arange(0, len(frame_mins), PEAK_BASE_FRAMES)
+    return np.minimum.reduceat(frame_mins, starts), np.maximum.reduceat(frame_maxs, starts)
+
+
+def analyze_wav(file_path):
+    """
+    Build the peak pyramid of a WAV file
+
+    The data chunk is memory mapped and converted block by block, so long
+    ambience files never exist as one big float array.
+
+    Returns:
+        (PeakPyramid, channels, bits_per_sample)
+    """
+    with open(file_path, 'rb') as f:
+        format_tag, channels, framerate, bits, data_offset, data_size = read_wav_format(f)
+
+    if channels < 1 or framerate < 1 or bits < 8:
+        raise ValueError("Invalid WAV format header")
+
+    frame_bytes = channels * (bits // 8)
+    n_frames = data_size // frame_bytes
+    mins = []
+    maxs = []
+
+    if n_frames:
+        data = np.memmap(file_path, np.uint8, mode='r', offset=data_offset, shape=(n_frames * frame_bytes,))
+        try:
+            block_bytes = DECODE_BLOCK_FRAMES * frame_bytes
+            for start in range(0, len(data), block_bytes):
+                frames = samples_to_float(data[start:start + block_bytes], format_tag, bits, channels)
+                block_mins, block_maxs = frames_to_peaks(frames)
+                mins.append(block_mins)
+                maxs.append(block_maxs)
+        finally:
+            # Release the mapping right away (Windows keeps the file locked while mapped)
+            del data
+
+    mins = np.concatenate(mins) if mins else np.zeros(0, np.float32)
+    maxs = np.concatenate(maxs) if maxs else np.zeros(0, np.float32)
+    return PeakPyramid(mins.astype(np.float32), maxs.astype(np.float32), framerate, n_frames), channels, bits
@@ -0,0 +1,105 @@
+"""
+Background job queue for the mapping tools
+Runs slow work (copies, conversions, compiles) on worker threads and hands progress back to the render loop
+"""
+
+import queue
+import threading
+
+
+class Job:
+    """One queued piece of work and its progress as last reported"""
+
+    def __init__(self, job_id, title):
+        self.id = job_id
+        self.title = title
+        self.state = 'queued'  # queued -> running -> done / failed
+        self.progress = 0.0  # 0..1
+        self.message = ''
+        self.result = None
+        self.error = None
+        self.owner = None  # JobQueue the job was submitted to
+
+    def report(self, progress, message=''):
+        """Called by the job function to publish progress (any thread)"""
+        self.progress = progress
+        self.message = message
+        self.owner.post('progress', self)
+
+
+class JobQueue:
+    """FIFO of jobs executed by a fixed number of daemon worker threads.
+
+    Job functions run as func(job, *args) and report progress with job.report().
+    Every state change is also posted as an event; the render loop drains them
+    with poll_events() once per frame, so nothing on the UI side is touched from
+    a worker thread. on_event (e.g. FramePacer.wake) is called after every post
+    so an idle render loop wakes up for it.
+    """
+
+    def __init__(self, workers=1, on_event=None):
+        self.workers = workers
+        self.on_event = on_event
+        self.pending = queue.Queue()
+        self.events = queue.Queue()
+        self.jobs = []  # Jobs not finished yet, in submission order
+        self.jobs_lock = threading.Lock()
+        self.next_id = 1
+        self.threads = []
+
+    def submit(self, title, func, *args):
+        """Queue func(job, *args) and return its Job"""
+        with self.jobs_lock:
+            job = Job(self.next_id, title)
+            self.next_id += 1
+            job.owner = self
+            self.jobs.append(job)
+
+        # Workers start on the first job
+        while len(self.threads) < self.workers:
+            thread = threading.Thread(target=self._work, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+        self.pending.put((job, func, args))
+        self.post('queued', job)
+        return job
+
+    def get_jobs(self):
+        """Unfinished jobs (running first, then queued)"""
+        with self.jobs_lock:
+            return sorted(self.jobs, key=lambda job: job.state != 'running')
+
+    def is_busy(self):
+        with self.jobs_lock:
+            return bool(self.jobs)
+
+    def post(self, kind, job):
+        self.events.put((kind, job))
+        if self.on_event:
+            self.on_event()
+
+    def poll_events(self):
+        """All (kind, job) events posted since the last call; kind is queued/started/progress/done/failed"""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def _work(self):
+        while True:
+            job, func, args = self.pending.get()
+            job.state = 'running'
+            self.post('started', job)
+            try:
+                job.result = func(job, *args)
+                job.state = 'done'
+                job.progress = 1.0
+            except Exception as e:
+                job.error = e
+                job.state = 'failed'
+            with self.jobs_lock:
+                self.jobs.remove(job)
+            self.post(job.state, job)
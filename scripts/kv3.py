@@ -0,0 +1,339 @@
+"""
+KV3 text reader/writer for the mapping tools
+Parses Source 2 KeyValues3 text (soundevents, encoding.txt, ...) into dicts/lists and writes it back
+"""
+
+import os
+import re
+
+DEFAULT_HEADER = '<!-- kv3 encoding:text:version{e21c7f3c-8a33-41c5-9977-a76d3a32aa0d} format:generic:version{7412167c-06e9-4698-aff2-e63eb59037e7} -->'
+
+IDENTIFIER_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_.]*\Z')
+NUMBER_RE = re.compile(r'[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?')
+BARE_WORD_RE = re.compile(r'[A-Za-z0-9_.+\-]+')
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '"': '"', '\\': '\\'}
+
+
+class Flagged:
+    """A value with a KV3 flag prefix, e.g. resource:"sounds/wind.vsnd" """
+
+    def __init__(self, flag, value):
+        self.flag = flag
+        self.value = value
+
+    def __eq__(self, other):
+        return isinstance(other, Flagged) and (self.flag, self.value) == (other.flag, other.value)
+
+    def __repr__(self):
+        return f"Flagged({self.flag!r}, {self.value!r})"
+
+
+class KV3Error(ValueError):
+    pass
+
+
+class Parser:
+    """Recursive descent parser over the KV3 text syntax"""
+
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+        self.depth = 0
+        self.root_spans = {}  # Root key -> (start, end) of its "key = value" text
+        self.root_end = None  # Offset of the root object's closing brace
+
+    def error(self, message):
+        line = self.text.count('\n', 0, self.pos) + 1
+        return KV3Error(f"{message} (line {line})")
+
+    def skip_whitespace(self):
+        text = self.text
+        while self.pos < len(text):
+            char = text[self.pos]
+            if char in ' \t\r\n':
+                self.pos += 1
+            elif text.startswith('//', self.pos):
+                end = text.find('\n', self.pos)
+                self.pos = len(text) if end == -1 else end + 1
+            elif text.startswith('/*', self.pos):
+                end = text.find('*/', self.pos + 2)
+                if end == -1:
+                    raise self.error("Unterminated comment")
+                self.pos = end + 2
+            elif text.startswith('<!--', self.pos):
+                end = text.find('-->', self.pos + 4)
+                if end == -1:
+                    raise self.error("Unterminated header")
+                self.pos = end + 3
+            else:
+                break
+
+    def peek(self):
+        self.skip_whitespace()
+        return self.text[self.pos] if self.pos < len(self.text) else ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise self.error(f"Expected '{char}'")
+        self.pos += 1
+
+    def parse_document(self):
+        value = self.parse_value()
+        if self.peek():
+            raise self.error("Unexpected text after the root value")
+        return value
+
+    def parse_value(self):
+        char = self.peek()
+        if char == '{':
+            return self.parse_object()
+        if char == '[':
+            return self.parse_array()
+        if char == '"':
+            return self.parse_string()
+        if not char:
+            raise self.error("Unexpected end of file")
+
+        match = BARE_WORD_RE.match(self.text, self.pos)
+        if not match:
+            raise self.error(f"Unexpected character '{char}'")
+        word = match.group()
+        self.pos = match.end()
+
+        # flag:value
+        if self.text.startswith(':', self.pos) and IDENTIFIER_RE.match(word):
+            self.pos += 1
+            return Flagged(word, self.parse_value())
+
+        if word == 'true':
+            return True
+        if word == 'false':
+            return False
+        if word == 'null':
+            return None
+        if NUMBER_RE.fullmatch(word):
+            if any(c in word for c in '.eE'):
+                return float(word)
+            return int(word)
+        raise self.error(f"Unknown value '{word}'")
+
+    def parse_object(self):
+        self.expect('{')
+        self.depth += 1
+        result = {}
+        while True:
+            char = self.peek()
+            if char == '}':
+                if self.depth == 1:
+                    self.root_end = self.pos
+                self.depth -= 1
+                self.pos += 1
+                return result
+            start = self.pos
+            if char == '"':
+                key = self.parse_string()
+            else:
+                match = BARE_WORD_RE.match(self.text, self.pos)
+                if not match:
+                    raise self.error("Expected a key")
+                key = match.group()
+                self.pos = match.end()
+            self.expect('=')
+            result[key] = self.parse_value()
+            if self.depth == 1:
+                self.root_spans[key] = (start, self.pos)
+
+    def parse_array(self):
+        self.expect('[')
+        result = []
+        while True:
+            if self.peek() == ']':
+                self.pos += 1
+                return result
+            result.append(self.parse_value())
+            char = self.peek()
+            if char == ',':
+                self.pos += 1
+            elif char != ']':
+                raise self.error("Expected ',' or ']'")
+
+    def parse_string(self):
+        text = self.text
+        if text.startswith('"""', self.pos):
+            end = text.find('"""', self.pos + 3)
+            if end == -1:
+                raise self.error("Unterminated multi-line string")
+            value = text[self.pos + 3:end]
+            self.pos = end + 3
+            # The line breaks right after the opening and before the closing quotes are not part of the value
+            if value.startswith('\n'):
+                value = value[1:]
+            elif value.startswith('\r\n'):
+                value = value[2:]
+            if value.endswith('\n'):
+                value = value[:-2] if value.endswith('\r\n') else value[:-1]
+            return value
+
+        self.pos += 1
+        parts = []
+        start = self.pos
+        while True:
+            if self.pos >= len(text):
+                raise self.error("Unterminated string")
+            char = text[self.pos]
+            if char == '"':
+                parts.append(text[start:self.pos])
+                self.pos += 1
+                return ''.join(parts)
+            if char == '\\' and self.pos + 1 < len(text):
+                parts.append(text[start:self.pos])
+                escaped = text[self.pos + 1]
+                parts.append(ESCAPES.get(escaped, '\\' + escaped))
+                self.pos += 2
+                start = self.pos
+            else:
+                self.pos += 1
+
+
+def loads(text):
+    """Parse KV3 text. Objects become dicts (in file order), arrays lists"""
+    return Parser(text).parse_document()
+
+
+def loads_with_spans(text):
+    """Like loads, plus where every root key sits in text: (document, {key: (start, end)}, root_end).
+    Lets a writer splice edited keys into the original text (see splice_root)"""
+    parser = Parser(text)
+    document = parser.parse_document()
+    return document, parser.root_spans, parser.root_end
+
+
+def read_header(text):
+    """The <!-- kv3 ... --> header line of a document, or DEFAULT_HEADER"""
+    stripped = text.lstrip()
+    if stripped.startswith('<!--'):
+        end = stripped.find('-->')
+        if end != -1:
+            return stripped[:end + 3]
+    return DEFAULT_HEADER
+
+
+def format_key(key, quote):
+    if quote or not IDENTIFIER_RE.match(key):
+        return format_string(key)
+    return key
+
+
+def format_string(value):
+    if '\n' in value:
+        return f'"""\n{value}\n"""'
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def format_scalar(value):
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if value is None:
+        return 'null'
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, str):
+        return format_string(value)
+    if isinstance(value, Flagged):
+        return f"{value.flag}:{format_scalar(value.value)}"
+    raise TypeError(f"Cannot write {type(value).__name__} as KV3")
+
+
+def is_container(value):
+    if isinstance(value, Flagged):
+        return is_container(value.value)
+    return isinstance(value, (dict, list))
+
+
+def write_value(lines, value, indent, prefix, suffix='', quote_root_keys=True, flag=''):
+    """Append the lines of value; prefix is the text before it on its first line (key = , or nothing).
+    flag is written in front of the opening bracket of a flagged container (flag:{ ... })"""
+    tabs = '\t' * indent
+    if isinstance(value, Flagged) and is_container(value.value):
+        write_value(lines, value.value, indent, prefix, suffix, quote_root_keys, flag + f"{value.flag}:")
+    elif isinstance(value, dict):
+        if prefix:
+            lines.append(f"{tabs}{prefix}")
+        lines.append(f"{tabs}{flag}{{")
+        for key, child in value.items():
+            write_value(lines, child, indent + 1, f"{format_key(key, quote_root_keys and indent == 0)} =")
+        lines.append(f"{tabs}}}{suffix}")
+    elif isinstance(value, list):
+        if not any(is_container(item) for item in value):
+            # Short scalar arrays stay on one line
+            items = ', '.join(format_scalar(item) for item in value)
+            lines.append(f"{tabs}{prefix + ' ' if prefix else ''}{flag}[{items}]{suffix}")
+            return
+        if prefix:
+            lines.append(f"{tabs}{prefix}")
+        lines.append(f"{tabs}{flag}[")
+        for item in value:
+            write_value(lines, item, indent + 1, '', ',')
+        lines.append(f"{tabs}]{suffix}")
+    else:
+        lines.append(f"{tabs}{prefix + ' ' if prefix else ''}{format_scalar(value)}{suffix}")
+
+
+def dumps(value, header=DEFAULT_HEADER, quote_root_keys=True):
+    """Serialize a KV3 document (root keys quoted by default, like Valve's soundevents files)"""
+    lines = [header] if header else []
+    write_value(lines, value, 0, '', quote_root_keys=quote_root_keys)
+    return '\n'.join(lines) + '\n'
+
+
+def dumps_member(key, value, quote_key=True):
+    """Serialize one root "key = value" member, indented like the members written by dumps"""
+    lines = []
+    write_value(lines, value, 1, f"{format_key(key, quote_key)} =")
+    return '\n'.join(lines)
+
+
+def splice_root(text, spans, root_end, document, changed, quote_keys=True):
+    """Rewrite only the changed root keys of a document parsed with loads_with_spans.
+
+    Keys in changed are re-serialized in place, keys missing from document are cut
+    out and new keys are appended before the closing brace. Every other member keeps
+    its original text, comments and number formatting included.
+    """
+    pieces = []
+    pos = 0
+    for key, (start, end) in spans.items():
+        if key not in document:
+            # A member on lines of its own goes with those lines
+            line_start = text.rfind('\n', 0, start) + 1
+            line_end = text.find('\n', end)
+            if not text[line_start:start].strip() and line_end != -1 and not text[end:line_end].strip():
+                start, end = line_start, line_end + 1
+            pieces.append(text[pos:start])
+            pos = end
+        elif key in changed:
+            pieces.append(text[pos:start])
+            pieces.append(dumps_member(key, document[key], quote_keys).lstrip('\t'))
+            pos = end
+
+    additions = [dumps_member(key, value, quote_keys) for key, value in document.items() if key not in spans]
+    pieces.append(text[pos:root_end])
+    if additions:
+        if not ''.join(pieces).endswith('\n'):
+            pieces.append('\n')
+        pieces.append('\n'.join(additions) + '\n')
+    pieces.append(text[root_end:])
+    return ''.join(pieces)
+
+
+def write_file(path, text):
+    """Write a file atomically (temp file + rename, a crash never leaves it half written)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(text)
+    os.replace(temp_path, path)
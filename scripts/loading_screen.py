@@ -1,7 +1,6 @@
 import os
 import shutil
 import sys
-import subprocess
 import time
 import re
 from PIL import Image
@@ -9,6 +8,8 @@ import winreg
 import vdf
 import glob
 
+from resource_compiler import compile_files
+
 # The following functions for finding the Steam/CS2 directory were provided by the user.
 def get_steam_directory():
     """Get the Steam installation directory from the Windows Registry."""
@@ -154,95 +155,22 @@ def handle_compiled_files(game_root, map_name, addon_name):
     # Note: Keeping .vmat and .vmat_c files as they are needed
     print("\nKeeping compiled files (.vmat and .vmat_c) as they are required.")
 
-def compile_vmat_files(game_root, vmat_files, map_name, addon_name=None):
-    """
-    Compiles a list of .vmat files using resourcecompiler.exe.
-    """
-    # If addon_name not provided, use map_name for backwards compatibility
-    if addon_name is None:
-        addon_name = map_name
-    
-    compiler_path = os.path.join(game_root, 'game', 'bin', 'win64', 'resourcecompiler.exe')
-    if not os.path.exists(compiler_path):
-        print(f"Error: resourcecompiler.exe not found at {compiler_path}")
-        return
-
-    # Set the working directory for the compiler
-    compiler_cwd = os.path.join(game_root, 'game')
-
-    for vmat_file in vmat_files:
-        print(f"Compiling {os.path.basename(vmat_file)}...")
-        try:
-            # The input file path needs to be relative to the 'game' directory
-            relative_vmat_path = os.path.relpath(vmat_file, start=compiler_cwd).replace("\\", "/")
-            
-            command = [compiler_path, relative_vmat_path]
-            result = subprocess.run(command, cwd=compiler_cwd, check=True, capture_output=True, text=True)
-            print(f"Compilation successful for {os.path.basename(vmat_file)}")
-            print("--- Compiler Output (stdout) ---")
-            print(result.stdout)
-            print("--------------------------------")
-        except subprocess.CalledProcessError as e:
-            print(f"Compilation failed for {os.path.basename(vmat_file)}: {e}")
-            print("--- Compiler Output (stdout) ---")
-            print(e.stdout)
-            print("--- Compiler Error (stderr) ---")
-            print(e.stderr)
-            print("--------------------------------")
-            # If a compilation fails, we can't handle the compiled files for it, so we break
-            return
-        except FileNotFoundError:
-            print(f"Error: resourcecompiler.exe not found. Please check the path: {compiler_path}")
-            break
-        except Exception as e:
-            print(f"An unexpected error occurred during compilation: {e}")
-            break
-
-    # After all files are compiled successfully, handle the compiled files
-    handle_compiled_files(game_root, map_name, addon_name)
-
-def compile_svg_files(game_root, svg_files, map_name, addon_name=None):
+def compile_content_files(game_root, vmat_files, svg_files, map_name, addon_name=None):
     """
-    Compiles a list of .svg files using resourcecompiler.exe.
+    Compiles the generated .vmat and .svg files with a single resourcecompiler.exe run.
     """
     # If addon_name not provided, use map_name for backwards compatibility
     if addon_name is None:
         addon_name = map_name
-    compiler_path = os.path.join(game_root, 'game', 'bin', 'win64', 'resourcecompiler.exe')
-    if not os.path.exists(compiler_path):
-        print(f"Error: resourcecompiler.exe not found at {compiler_path}")
-        return
 
-    # Set the working directory for the compiler
-    compiler_cwd = os.path.join(game_root, 'game')
+    results = compile_files(game_root, list(vmat_files) + list(svg_files))
+    failed = [path for path, ok in results.items() if not ok]
+    if failed:
+        print(f"Compilation failed for: {', '.join(os.path.basename(path) for path in failed)}")
 
-    for svg_file in svg_files:
-        print(f"Compiling {os.path.basename(svg_file)}...")
-        try:
-            # The input file path needs to be relative to the 'game' directory
-            relative_svg_path = os.path.relpath(svg_file, start=compiler_cwd).replace("\\", "/")
-            
-            command = [compiler_path, relative_svg_path]
-            result = subprocess.run(command, cwd=compiler_cwd, check=True, capture_output=True, text=True)
-            print(f"Compilation successful for {os.path.basename(svg_file)}")
-            print("--- Compiler Output (stdout) ---")
-            print(result.stdout)
-            print("--------------------------------")
-        except subprocess.CalledProcessError as e:
-            print(f"Compilation failed for {os.path.basename(svg_file)}: {e}")
-            print("--- Compiler Output (stdout) ---")
-            print(e.stdout)
-            print("--- Compiler Error (stderr) ---")
-            print(e.stderr)
-            print("--------------------------------")
-            # If a compilation fails, we can't handle the compiled files for it, so we break
-            return
-        except FileNotFoundError:
-            print(f"Error: resourcecompiler.exe not found. Please check the path: {compiler_path}")
-            break
-        except Exception as e:
-            print(f"An unexpected error occurred during compilation: {e}")
-            break
+    # Move the compiled files only once every vmat compiled (the compiler adds hashes to the generated names)
+    if vmat_files and all(results[path] for path in vmat_files):
+        handle_compiled_files(game_root, map_name, addon_name)
 
 def create_vmat_content(map_name, index):
     """
@@ -389,13 +317,9 @@ def create_map_files():
         shutil.copy(source_txt_path, description_file_path)
         print(f"Copied and renamed {txt_files[0]} to {description_file_path}")
 
-    # Compile all the generated VMAT files
-    if vmat_files_to_compile:
-        compile_vmat_files(game_root, vmat_files_to_compile, map_name)
-    
-    # Compile all the SVG files
-    if svg_files_to_compile:
-        compile_svg_files(game_root, svg_files_to_compile, map_name)
+    # Compile all the generated VMAT and SVG files in one compiler run
+    if vmat_files_to_compile or svg_files_to_compile:
+        compile_content_files(game_root, vmat_files_to_compile, svg_files_to_compile, map_name)
 
     print("\nProcess completed.") 
     time.sleep(3)
@@ -0,0 +1,289 @@
+"""
+Converted asset cache for the CS2 importer
+Keeps the .vmat/.vmdl files (and everything they reference) made by source1import and cs_mdl_import, shared by every addon
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+
+# Try to import optional modules
+try:
+    import vpk
+except ImportError:
+    vpk = None
+
+# Bump when the entry layout or the key changes so old entries are ignored
+CACHE_VERSION = 2
+
+DEFAULT_ASSET_CACHE_BYTES = 4 * 1024 * 1024 * 1024
+
+# Outputs whose text names further outputs (textures of a material, meshes of a model)
+TEXT_OUTPUT_EXTENSIONS = ('.vmat', '.vmdl', '.vmdl_prefab')
+QUOTED_PATH_RE = re.compile(r'"([^"\r\n]+\.[A-Za-z0-9_]+)"')
+
+# Material outputs, left out of model entries (the materials a model uses are cached on their own, keyed by their textures)
+MATERIAL_OUTPUT_EXTENSIONS = ('.vmat', '.vtex', '.tga', '.png', '.psd', '.jpg', '.jpeg', '.exr', '.tif', '.tiff')
+
+# "key" "value" (quoted or bare) at the start of a VMT line
+VMT_PAIR_RE = re.compile(r'^\s*(?:"([^"]*)"|([^\s"{}]+))\s+(?:"([^"]*)"|([^\s"{}]+))')
+VMT_INCLUDE_DEPTH = 2  # Patch materials include their base material, which is not a patch itself
+
+
+class ConvertedAssetCache:
+    """Content-addressed cache of converted Source 1 assets.
+
+    Every entry is a folder named after a hash of the source paths, their version
+    (CRC32 from the CS:GO VPK directory tree, or the SHA1 of a loose file) and the
+    size/mtime of the Valve tool that converted them. It holds the converted files
+    under their path relative to the addon's content folder plus an entry.json
+    listing them. A later import into any addon copies the files instead of running
+    the tool again; a changed source or tool update changes the key. Entries are
+    touched on every hit and evicted least recently used first.
+    """
+
+    def __init__(self, s1gamecsgo, cache_dir=None, max_bytes=DEFAULT_ASSET_CACHE_BYTES):
+        self.s1gamecsgo = s1gamecsgo
+        self.cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), '.cs2kz-mapping-tools', 'Porting', 'assets')
+        self.max_bytes = max_bytes
+        self.pak = None  # pak01_dir.vpk, opened on the first lookup
+        self.pak_opened = False
+        self.versions = {}  # Lowercased source path -> version string (or None if not found)
+        self.hits = 0
+        self.stores = 0
+
+    def get_pak(self):
+        if not self.pak_opened:
+            self.pak_opened = True
+            pak_path = os.path.join(self.s1gamecsgo, 'pak01_dir.vpk')
+            if vpk is not None and os.path.exists(pak_path):
+                try:
+                    self.pak = vpk.open(pak_path)
+                except Exception as e:
+                    print(f"Warning: Could not read {pak_path} for the asset cache: {e}")
+        return self.pak
+
+    def get_source_version(self, source_path):
+        """Version of one Source 1 file: SHA1 of the loose file, else CRC32 of its VPK entry, else None"""
+        source_path = source_path.replace('\\', '/').lower()
+        if source_path in self.versions:
+            return self.versions[source_path]
+
+        version = None
+        loose_path = os.path.join(self.s1gamecsgo, source_path)
+        if os.path.isfile(loose_path):
+            sha1 = hashlib.sha1()
+            with open(loose_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    sha1.update(chunk)
+            version = 'sha1:' + sha1.hexdigest()
+        else:
+            pak = self.get_pak()
+            if pak is not None:
+                try:
+                    version = f"crc:{pak.get_file_meta(source_path)['crc32']:08x}"
+                except Exception:
+                    version = None
+
+        self.versions[source_path] = version
+        return version
+
+    def read_source(self, source_path):
+        """Text of a Source 1 file (loose file first, then pak01), or None"""
+        source_path = source_path.replace('\\', '/').lower()
+        loose_path = os.path.join(self.s1gamecsgo, source_path)
+        try:
+            if os.path.isfile(loose_path):
+                with open(loose_path, 'rb') as f:
+                    return f.read().decode('utf-8', errors='ignore')
+            pak = self.get_pak()
+            if pak is not None:
+                return pak.get_file(source_path).read().decode('utf-8', errors='ignore')
+        except Exception:
+            pass
+        return None
+
+    def get_material_sources(self, vmt_path, depth=0):
+        """vmt_path plus every .vtf (and included .vmt) it references, the inputs of converting one material"""
+        sources = [vmt_path]
+        text = self.read_source(vmt_path)
+        if text is None:
+            return sources
+
+        for line in text.splitlines():
+            match = VMT_PAIR_RE.match(line.split('//', 1)[0])
+            if not match:
+                continue
+            key = (match.group(1) or match.group(2)).lower()
+            value = (match.group(3) if match.group(3) is not None else match.group(4)).strip().replace('\\', '/')
+            if not value:
+                continue
+            if key == 'include':
+                if depth < VMT_INCLUDE_DEPTH:
+                    for source in self.get_material_sources(value, depth + 1):
+                        if source not in sources:
+                            sources.append(source)
+                continue
+            # Any value naming an existing texture ($basetexture, $bumpmap, $detail, $envmapmask, ...)
+            texture_path = f"materials/{value.lower()}"
+            if not texture_path.endswith('.vtf'):
+                texture_path += '.vtf'
+            if texture_path not in sources and self.get_source_version(texture_path) is not None:
+                sources.append(texture_path)
+        return sources
+
+    @staticmethod
+    def get_tool_signature(tool_path):
+        try:
+            stat = os.stat(tool_path)
+            return f"{os.path.basename(tool_path).lower()}:{stat.st_size}:{int(stat.st_mtime)}"
+        except OSError:
+            return os.path.basename(tool_path).lower()
+
+    def make_key(self, tool_path, source_paths):
+        """Cache key of source_paths (primary file first, optional companions after) converted by tool_path.
+        None if the primary file cannot be versioned, such assets are never cached"""
+        parts = [f"v{CACHE_VERSION}", self.get_tool_signature(tool_path)]
+        for i, source_path in enumerate(source_paths):
+            version = self.get_source_version(source_path)
+            if version is None and i == 0:
+                return None
+            parts.append(f"{source_path.replace(chr(92), '/').lower()}={version}")
+        return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:20]
+
+    def get_entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def restore(self, key, content_root):
+        """Copy a cached entry into content_root. Returns True on a hit"""
+        if key is None:
+            return False
+        entry_dir = self.get_entry_dir(key)
+        try:
+            with open(os.path.join(entry_dir, 'entry.json'), 'r', encoding='utf-8') as f:
+                files = json.load(f)['files']
+        except (OSError, ValueError, KeyError):
+            return False
+
+        try:
+            for relative in files:
+                source = os.path.join(entry_dir, 'files', relative)
+                target = os.path.join(content_root, relative)
+                # Files already in the addon (an earlier import of the same asset) are kept as they are
+                if os.path.exists(target):
+                    continue
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copy2(source, target)
+        except OSError as e:
+            print(f"Warning: Could not restore cached asset {key}: {e}")
+            return False
+
+        self.touch(entry_dir)
+        self.hits += 1
+        return True
+
+    def collect_outputs(self, content_root, primary_outputs, skip_extensions=()):
+        """Relative paths of primary_outputs plus every existing file their text references
+        (except files with skip_extensions, which are neither collected nor followed)"""
+        found = []
+        seen = set()
+        pending = [output.replace('\\', '/') for output in primary_outputs]
+        while pending:
+            relative = pending.pop()
+            if relative.lower() in seen:
+                continue
+            seen.add(relative.lower())
+            full_path = os.path.join(content_root, relative)
+            if not os.path.isfile(full_path) or relative.lower().endswith(skip_extensions):
+                continue
+            found.append(relative)
+            if relative.lower().endswith(TEXT_OUTPUT_EXTENSIONS):
+                try:
+                    with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
+                        text = f.read()
+                except OSError:
+                    continue
+                pending.extend(match.replace('\\', '/') for match in QUOTED_PATH_RE.findall(text))
+        return found
+
+    def store(self, key, content_root, primary_outputs, skip_extensions=()):
+        """Save the converted files of an asset. primary_outputs are relative to content_root (e.g. the .vmat),
+        referenced files with skip_extensions stay out of the entry (the key does not cover them)"""
+        if key is None:
+            return False
+        entry_dir = self.get_entry_dir(key)
+        if os.path.exists(os.path.join(entry_dir, 'entry.json')):
+            return True
+
+        files = self.collect_outputs(content_root, primary_outputs, skip_extensions)
+        if not files:
+            return False
+
+        # Build the entry next to its final place and rename, a crash never leaves a half entry
+        temp_dir = entry_dir + '.tmp'
+        try:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            for relative in files:
+                target = os.path.join(temp_dir, 'files', relative)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copy2(os.path.join(content_root, relative), target)
+            with open(os.path.join(temp_dir, 'entry.json'), 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'files': files}, f, indent=1)
+            os.replace(temp_dir, entry_dir)
+        except OSError as e:
+            print(f"Warning: Could not add asset to the cache: {e}")
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return False
+
+        self.stores += 1
+        return True
+
+    def touch(self, entry_path):
+        """Mark an entry as recently used"""
+        try:
+            os.utime(entry_path, None)
+        except OSError:
+            pass
+
+    def get_entry_size(self, entry_path):
+        total = 0
+        for root, _, files in os.walk(entry_path):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits its size budget"""
+        try:
+            if not os.path.exists(self.cache_dir):
+                return
+
+            entries = []
+            total = 0
+            for name in os.listdir(self.cache_dir):
+                entry_path = os.path.join(self.cache_dir, name)
+                if not os.path.isdir(entry_path):
+                    continue
+                try:
+                    size = self.get_entry_size(entry_path)
+                    mtime = os.path.getmtime(entry_path)
+                except OSError:
+                    continue
+                entries.append((mtime, entry_path, size))
+                total += size
+
+            # Oldest first
+            entries.sort()
+            for _, entry_path, size in entries:
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(entry_path, ignore_errors=True)
+                total -= size
+        except Exception as e:
+            print(f"Warning: Asset cache cleanup failed: {e}")
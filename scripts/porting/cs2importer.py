@@ -63,6 +63,17 @@ except ImportError:
                 'button_bg': '#2d2d2d',
                 'button_hover': '#3d3d3d'
             }
+        def get_setting(self, key, default=None):
+            return default
+
+try:
+    from frame_pacer import FramePacer, DEFAULT_MAX_FPS
+except ImportError:
+    FramePacer = None
+
+# Shared with import_map_community_jakke.py (same folder)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from vmf_summary import has_versioninfo
 
 class CS2ImporterApp:
     def __init__(self):
@@ -72,6 +83,11 @@ class CS2ImporterApp:
         # Theme manager
         self.theme_manager = ThemeManager()
         
+        # Sleeps between frames while nothing moves (FPS cap from the main app's settings)
+        self.frame_pacer = FramePacer() if FramePacer else None
+        if self.frame_pacer:
+            self.frame_pacer.set_max_fps(self.theme_manager.get_setting('imgui_max_fps', DEFAULT_MAX_FPS))
+        
         # Application state
         self.vmf_default_path = "C:\\"
         self.csgo_basefolder = None
@@ -81,6 +97,7 @@ class CS2ImporterApp:
         self.map_name = None
         self.previous_map_name = None  # Track previous map to detect changes
         self.launch_options = "-usebsp"
+        self.model_import_workers = 0  # Parallel cs_mdl_import processes (0 = one per core), set in the UI and saved to cs2importer.cfg
         
         # UI state
         self.vmf_path_display = "None selected"
@@ -128,7 +145,7 @@ class CS2ImporterApp:
         self.prerequisites_height = 0  # Track prerequisites section height
         
         # Window dimensions
-        self.base_window_height = 280  # Base height for main UI (increased to add space under GO button)
+        self.base_window_height = 305  # Base height for main UI (increased to add space under GO button and for the model workers row)
         self.helper_text_height = 50  # Height added when BSP is selected (for helper text)
         self.progress_tracking_height = 110  # Height added when showing progress tracking
         self.completed_height = 80  # Height added when import completes (for failed assets section if needed)
@@ -196,6 +213,14 @@ class CS2ImporterApp:
                 if material_name not in self.failed_materials:
                     self.failed_materials.append(material_name)
         
+        # Track failed model imports
+        elif "Failed to import model" in msg:
+            model_match = re.search(r'model ([^\s:]+)', msg)
+            if model_match:
+                model_name = model_match.group(1)
+                if model_name not in self.failed_models:
+                    self.failed_models.append(model_name)
+        
         # Track total models found
         elif "unique model references in VMF" in msg:
             match = re.search(r'Found (\d+) unique model references', msg)
@@ -660,10 +685,6 @@ class CS2ImporterApp:
     def fix_vmf_structure(self, vmf_path):
         """Add proper VMF header structure for CS2 importer compatibility and fix tool textures"""
         try:
-            # Read the VMF file
-            with open(vmf_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
             # Fix tool textures that BSPSource incorrectly converts
             # BSPSource often converts nodraw faces to playerclip/skip/hint/etc based on brush properties
             # But for CS2 import, we want to preserve nodraw on void-facing faces
@@ -687,8 +708,8 @@ class CS2ImporterApp:
             # Actually, don't replace them - let VBSP handle it with the original BSP
             # The issue is BSPSource guessing wrong, but VBSP with -usebsp uses original BSP geo
             
-            # Check if it already has versioninfo (Hammer-formatted VMF)
-            if 'versioninfo' in content.lower():
+            # Check if it already has versioninfo (Hammer-formatted VMF), only the first block is read
+            if has_versioninfo(vmf_path):
                 self.log("VMF already has proper structure")
                 return
             
@@ -712,12 +733,12 @@ viewsettings
 \t"nGridSpacing" "64"
 }
 '''
-            # Prepend header to existing content
-            new_content = vmf_header + content
-            
-            # Write back
-            with open(vmf_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            # Prepend header by streaming the VMF into a temp file, large VMFs are never held in memory
+            temp_path = vmf_path + '.tmp'
+            with open(vmf_path, 'rb') as src, open(temp_path, 'wb') as dst:
+                dst.write(vmf_header.encode('utf-8'))
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            os.replace(temp_path, vmf_path)
             
             self.log("✓ Fixed VMF structure for CS2 compatibility")
             
@@ -1098,7 +1119,8 @@ viewsettings
         default_path = self.vmf_default_path if self.vmf_default_path else 'C:\\'
         temp = f"""{self.launch_options}
 {self.csgo_basefolder if self.csgo_basefolder else ''}
-{default_path}"""
+{default_path}
+{self.model_import_workers}"""
         
         with open(config_path, "w") as f:
             f.write(temp)
@@ -1122,6 +1144,8 @@ viewsettings
                 self.set_csgo_folder(temp[1].strip())
             if len(temp) > 2 and temp[2].strip():
                 self.vmf_default_path = temp[2].strip()
+            if len(temp) > 3 and temp[3].strip():
+                self.model_import_workers = max(0, int(temp[3].strip()))
         except:
             pass
 
@@ -1209,6 +1233,8 @@ viewsettings
             command += self.addon + ' '
             command += self.map_name + ' '
             command += self.launch_options
+            if self.model_import_workers > 0:
+                command += f' -modelworkers {self.model_import_workers}'
             
             self.log("Starting import process...")
             
@@ -1390,6 +1416,8 @@ viewsettings
         # Check for theme updates
         if self.theme_manager.check_for_updates():
             self.setup_style()
+            if self.frame_pacer:
+                self.frame_pacer.set_max_fps(self.theme_manager.get_setting('imgui_max_fps', DEFAULT_MAX_FPS))
         
         # Render custom title bar first
         self.render_custom_title_bar()
@@ -1539,6 +1567,17 @@ viewsettings
         _, self.addon = imgui.input_text("##addon", self.addon, 256)
         self.text_input_hovered = imgui.is_item_hovered()
         
+        # Parallel model imports (0 = automatic, one per core up to 8)
+        imgui.text("Model Workers:")
+        imgui.same_line()
+        imgui.set_next_item_width(80)
+        changed, workers = imgui.input_int("##modelworkers", self.model_import_workers)
+        if imgui.is_item_hovered():
+            imgui.set_tooltip("Models imported in parallel (0 = one per CPU core, up to 8)")
+        if changed:
+            self.model_import_workers = max(0, min(32, workers))
+            self.save_to_cfg()
+        
         imgui.spacing()
         imgui.separator()
         
@@ -1747,12 +1786,21 @@ viewsettings
             
             imgui.end_popup()
 
+    def is_animating(self):
+        """Whether frames have to keep coming without input (import progress, drags, text cursor)"""
+        return (self.import_in_progress or self.dragging_window
+                or any(imgui.is_mouse_down(button) for button in range(3))
+                or imgui.get_io().want_text_input)
+    
     def run(self):
         """Main application loop"""
         self.init_window()
         
         while not glfw.window_should_close(self.window):
-            glfw.poll_events()
+            if self.frame_pacer:
+                self.frame_pacer.wait(self.is_animating())
+            else:
+                glfw.poll_events()
             self.impl.process_inputs()
             
             # Handle window dragging
@@ -1817,6 +1865,8 @@ viewsettings
             self.impl.render(imgui.get_draw_data())
             glfw.swap_buffers(self.window)
         
+        if self.frame_pacer:
+            FramePacer.close()
         self.impl.shutdown()
         glfw.terminate()
 
@@ -11,7 +11,10 @@ import argparse
 import time
 import ast
 import shutil
+import re
+import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Force unbuffered output for real-time progress updates
 sys.stdout.reconfigure(line_buffering=True) if hasattr(sys.stdout, 'reconfigure') else None
@@ -26,6 +29,8 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from utils import utlc as utl
+from vmf_summary import get_vmf_summary
+from asset_cache import ConvertedAssetCache, MATERIAL_OUTPUT_EXTENSIONS
 
 ##########################################################################################################################################
 # Get full path to source1import.exe
@@ -37,11 +42,57 @@ def GetSource1ImportPath():
 	source1import_path = os.path.abspath("../../bin/win64/source1import.exe")
 	return source1import_path
 
+##########################################################################################################################################
+# Number of parallel cs_mdl_import processes
+##########################################################################################################################################
+DEFAULT_MAX_MODEL_IMPORT_WORKERS = 8
+
+def GetModelImportWorkers():
+	"""-modelworkers from the command line (cs2importer.cfg), or one per core up to DEFAULT_MAX_MODEL_IMPORT_WORKERS."""
+	if modelworkers > 0:
+		return modelworkers
+	return max(1, min(DEFAULT_MAX_MODEL_IMPORT_WORKERS, os.cpu_count() or 1))
+
+##########################################################################################################################################
+# Converted asset cache shared by every addon (-noassetcache disables it)
+##########################################################################################################################################
+def RestoreCachedAssets(tool_path, sources, content_root):
+	"""Copy assets converted by an earlier import (into any addon) from the asset cache.
+	sources maps each asset to its Source 1 files, primary file first. Returns (restored assets, asset -> cache key)."""
+	restored = set()
+	keys = {}
+	if assetcache is None:
+		return restored, keys
+	for asset, source_paths in sources.items():
+		keys[asset] = assetcache.make_key(tool_path, source_paths)
+		if assetcache.restore(keys[asset], content_root):
+			restored.add(asset)
+	return restored, keys
+
+def StoreCachedAsset(keys, asset, content_root, primary_outputs, skip_extensions=()):
+	"""Add a freshly converted asset to the cache, primary_outputs relative to content_root."""
+	if assetcache is not None and keys.get(asset) is not None:
+		assetcache.store(keys[asset], content_root, primary_outputs, skip_extensions)
+
+def MaterialSources(vmt_path):
+	"""Source files a converted material depends on: the .vmt and the .vtf textures (and includes) it names."""
+	if assetcache is None:
+		return [vmt_path]
+	return assetcache.get_material_sources(vmt_path)
+
+def VMATPath(vmt_path):
+	"""materials/x y.vmt -> materials/x_y.vmat, the name source1import writes"""
+	return vmt_path.replace(' ', '_')[:-len('.vmt')] + '.vmat'
+
 ##########################################################################################################################################
 # Case-insensitive file finder
 ##########################################################################################################################################
-def FindFileInsensitive(path):
-	"""Find a file with case-insensitive matching. Returns the actual path if found, or original path if not."""
+def FindFileInsensitive(path, index=None):
+	"""Find a file with case-insensitive matching. Returns the actual path if found, or original path if not.
+	With a CaseFoldedPathIndex covering path this is a lookup instead of directory listings."""
+	if index is not None:
+		return index.Find(path)
+	
 	if os.path.exists(path):
 		return path
 	
@@ -67,6 +118,43 @@ def FindFileInsensitive(path):
 	
 	return path  # Return original if not found
 
+class CaseFoldedPathIndex:
+	"""Every file below root, keyed by its lowercased relative path ('a/b/c.vmt').
+	Built with one os.walk on first use, so case-insensitive lookups are dict hits
+	instead of a directory listing per file. Rename() keeps it in sync."""
+
+	def __init__(self, root):
+		self.root = os.path.normpath(root)
+		self.paths = None
+
+	def RelativePath(self, path):
+		return os.path.relpath(os.path.normpath(path), self.root).replace('\\', '/')
+
+	def Build(self):
+		self.paths = {}
+		for dirpath, dirnames, filenames in os.walk(self.root):
+			for filename in filenames:
+				relative = self.RelativePath(os.path.join(dirpath, filename))
+				self.paths[relative.lower()] = relative
+
+	def Find(self, path):
+		"""Actual path of a file below root matching path case-insensitively, or path itself if there is none
+		(or if it already has the same case)"""
+		if self.paths is None:
+			self.Build()
+		relative = self.RelativePath(path)
+		actual = self.paths.get(relative.lower())
+		if actual is None or actual == relative:
+			return path
+		return os.path.normpath(os.path.join(self.root, actual))
+
+	def Rename(self, old_path, new_path):
+		os.rename(old_path, new_path)
+		if self.paths is not None:
+			self.paths.pop(self.RelativePath(old_path).lower(), None)
+			relative = self.RelativePath(new_path)
+			self.paths[relative.lower()] = relative
+
 ##########################################################################################################################################
 # Get path to CS2 SDK tool
 ##########################################################################################################################################
@@ -88,23 +176,15 @@ def GetCS2ToolPath(tool_name, s2gamecsgo):
 def FixMaterialCase(vmf_path, game_dir):
 	"""Read VMF file and rename material files to match the case used in the VMF.
 	game_dir should point to the CS:GO installation root (contains 'csgo' folder)"""
-	import re
-	
 	try:
-		with open(vmf_path, 'r', encoding='utf-8', errors='ignore') as f:
-			vmf_content = f.read()
-		
-		# Find all material references in the VMF (they appear in "material" keys)
-		material_pattern = re.compile(r'"material"\s+"([^"]+)"', re.IGNORECASE)
-		materials = set(material_pattern.findall(vmf_content))
-		
-		# Also find materials in texture references
-		texture_pattern = re.compile(r'"texture"\s+"([^"]+)"', re.IGNORECASE)
-		materials.update(texture_pattern.findall(vmf_content))
+		# "material" and "texture" keys, from the shared single-pass summary of the VMF
+		materials = get_vmf_summary(vmf_path).materials
 		
 		print(f"Found {len(materials)} unique material references in VMF")
 		
 		# For each material, try to find and rename the .vmt and .vtf files
+		# csgo\materials is indexed once instead of listing directories for every file
+		materials_index = CaseFoldedPathIndex(os.path.join(game_dir, "csgo", "materials"))
 		renamed_count = 0
 		for material in materials:
 			# Clean up the material path
@@ -121,15 +201,15 @@ def FixMaterialCase(vmf_path, game_dir):
 			vtf_full = os.path.join(game_dir, vtf_rel_path).replace('\\\\', '\\')
 			
 			# Find actual files case-insensitively
-			actual_vmt = FindFileInsensitive(vmt_full)
-			actual_vtf = FindFileInsensitive(vtf_full)
+			actual_vmt = FindFileInsensitive(vmt_full, materials_index)
+			actual_vtf = FindFileInsensitive(vtf_full, materials_index)
 			
 			# Rename if found and case doesn't match
 			if actual_vmt != vmt_full and os.path.exists(actual_vmt):
 				try:
 					# Ensure target directory exists
 					os.makedirs(os.path.dirname(vmt_full), exist_ok=True)
-					os.rename(actual_vmt, vmt_full)
+					materials_index.Rename(actual_vmt, vmt_full)
 					print(f"Renamed: {os.path.basename(actual_vmt)} -> {os.path.basename(vmt_full)}")
 					renamed_count += 1
 				except Exception as e:
@@ -138,7 +218,7 @@ def FixMaterialCase(vmf_path, game_dir):
 			if actual_vtf != vtf_full and os.path.exists(actual_vtf):
 				try:
 					os.makedirs(os.path.dirname(vtf_full), exist_ok=True)
-					os.rename(actual_vtf, vtf_full)
+					materials_index.Rename(actual_vtf, vtf_full)
 					print(f"Renamed: {os.path.basename(actual_vtf)} -> {os.path.basename(vtf_full)}")
 					renamed_count += 1
 				except Exception as e:
@@ -444,19 +524,13 @@ def ImportAndCompileMapRefs( refsFile, s2addon, errorCallback ):
 ##########################################################################################################################################
 def ImportVMFModels(vmf_path, s1gamecsgo, s2addon, s2contentcsgoimported, errorCallback):
 	"""Import all models referenced in the VMF file from pak01 before VMF import"""
-	import re
-	
 	# Define a non-aborting error callback for model imports
 	def non_aborting_callback(cmd):
 		print(f"Warning: Command failed but continuing: {cmd}")
 	
 	try:
-		with open(vmf_path, 'r', encoding='utf-8', errors='ignore') as f:
-			vmf_content = f.read()
-		
-		# Find all model references in the VMF (they appear in "model" keys for prop_static, etc.)
-		model_pattern = re.compile(r'"model"\s+"([^"]+\.mdl)"', re.IGNORECASE)
-		models = set(model_pattern.findall(vmf_content))
+		# "model" keys of prop_static etc., from the shared single-pass summary of the VMF
+		models = get_vmf_summary(vmf_path).models
 		
 		if not models:
 			print("No models found in VMF")
@@ -465,48 +539,92 @@ def ImportVMFModels(vmf_path, s1gamecsgo, s2addon, s2contentcsgoimported, errorC
 		print(f"Found {len(models)} unique model references in VMF, importing from pak01...")
 		sys.stdout.flush()
 		
-		# Import models one by one to avoid batch failure
+		# Import models on a bounded pool of cs_mdl_import processes, each model writes its own outputs
 		imported_models = []
 		failed_count = 0
 		model_materials = set()
 		
+		models = sorted({model.strip().replace('\\', '/') for model in models} - {''})
+		cs_mdl_import = GetCS2ToolPath("cs_mdl_import.exe", s2gamecsgo)
+		workers = GetModelImportWorkers()
+		print(f"Importing models with {workers} parallel cs_mdl_import processes")
+		sys.stdout.flush()
+		
+		def collect_model_materials(model):
+			# Check if a _refs.txt file was created for this model
+			refs_name = s2contentcsgoimported + "\\" + model.replace(".mdl", "_refs.txt").replace("/", "\\")
+			if os.path.exists(refs_name):
+				refs = utl.ReadTextFile(refs_name)
+				str_refs = utl.ListStringFromRefs(refs)
+				mtllist = str_refs.split("\n")
+				materials_found = 0
+				for mtlname in mtllist:
+					if mtlname.strip():
+						model_materials.add(mtlname.strip())
+						materials_found += 1
+				if materials_found > 0:
+					print(f"  Found {materials_found} materials in refs for {model}")
+			else:
+				print(f"  No refs file found for {model} at {refs_name}")
+		
+		# Models converted by an earlier import are copied from the asset cache (with their _refs.txt for the material step)
+		model_sources = {model: [model] + [model[:-len('.mdl')] + ext for ext in ('.vvd', '.dx90.vtx', '.phy')] for model in models}
+		cached, cache_keys = RestoreCachedAssets(cs_mdl_import, model_sources, s2contentcsgoimported)
+		if cached:
+			print(f"Restored {len(cached)} models from the asset cache")
 		for model in models:
-			model = model.strip().replace('\\', '/')
-			if not model:
-				continue
-			try:
-				# Use cs_mdl_import to import the model from pak01
-				cs_mdl_import = GetCS2ToolPath("cs_mdl_import.exe", s2gamecsgo)
-				import_cmd = f"\"{cs_mdl_import}\" -nop4 -i \"{s1gamecsgo}\" -o \"{s2contentcsgoimported}\" \"{model}\""
-				utl.RunCommand(import_cmd, non_aborting_callback)
+			if model in cached:
+				imported_models.append(model)
+				collect_model_materials(model)
+		
+		def import_model(model):
+			# Use cs_mdl_import to import the model from pak01
+			import_cmd = f"\"{cs_mdl_import}\" -nop4 -i \"{s1gamecsgo}\" -o \"{s2contentcsgoimported}\" \"{model}\""
+			result = subprocess.run(import_cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors="replace")
+			return import_cmd, result.returncode, result.stdout
+		
+		with ThreadPoolExecutor(max_workers=workers) as pool:
+			futures = {pool.submit(import_model, model): model for model in models if model not in cached}
+			# Results are handled here on the main thread, so the output of one model stays together
+			# and the counters and material set need no locking
+			for future in as_completed(futures):
+				model = futures[future]
+				try:
+					import_cmd, returncode, output = future.result()
+				except Exception as e:
+					print(f"Failed to import model {model}: {e}")
+					failed_count += 1
+					continue
+				
+				utl.print_I("- Ran Command: " + import_cmd)
+				if output:
+					print(output.rstrip())
+				if returncode != 0:
+					print(f"Failed to import model {model}: cs_mdl_import exited with code {returncode}")
+					failed_count += 1
+					continue
+				
 				imported_models.append(model)
+				# Materials stay out of the model entry, the model-material step restores or imports them under their own keys
+				StoreCachedAsset(cache_keys, model, s2contentcsgoimported, [model.replace(".mdl", ".vmdl"), model.replace(".mdl", "_refs.txt")], MATERIAL_OUTPUT_EXTENSIONS)
 				# Print progress after each model
 				print(f"Imported {len(imported_models)} models")
 				sys.stdout.flush()
 				
-				# Check if a _refs.txt file was created for this model
-				refs_name = s2contentcsgoimported + "\\" + model.replace(".mdl", "_refs.txt").replace("/", "\\")
-				if os.path.exists(refs_name):
-					refs = utl.ReadTextFile(refs_name)
-					str_refs = utl.ListStringFromRefs(refs)
-					mtllist = str_refs.split("\n")
-					materials_found = 0
-					for mtlname in mtllist:
-						if mtlname.strip():
-							model_materials.add(mtlname.strip())
-							materials_found += 1
-					if materials_found > 0:
-						print(f"  Found {materials_found} materials in refs for {model}")
-				else:
-					print(f"  No refs file found for {model} at {refs_name}")
-			except Exception as e:
-				failed_count += 1
+				collect_model_materials(model)
 		
 		print(f"Imported {len(imported_models)} models from pak01, {failed_count} skipped/failed")
 		sys.stdout.flush()
 		
 		print(f"Collected {len(model_materials)} unique materials from model refs files")
 		
+		# Materials used by the models that an earlier import already converted come from the asset cache
+		source1import_exe = GetSource1ImportPath()
+		cached_materials, material_keys = RestoreCachedAssets(source1import_exe, {mtl: MaterialSources(mtl.replace("\\", "/")) for mtl in model_materials if mtl.lower().endswith(".vmt")}, s2contentcsgoimported)
+		if cached_materials:
+			print(f"Restored {len(cached_materials)} model materials from the asset cache")
+			model_materials -= cached_materials
+		
 		# Import materials used by the models
 		if model_materials:
 			print(f"Importing {len(model_materials)} materials used by models...")
@@ -522,13 +640,16 @@ def ImportVMFModels(vmf_path, s1gamecsgo, s2addon, s2contentcsgoimported, errorC
 			print(f"Created model material refs file: {temp_refs}")
 			
 			# Import model materials from pak01
-			source1import_exe = GetSource1ImportPath()
 			importRefsCmd = f"\"{source1import_exe}\" -retail -nop4 -nop4sync -src1gameinfodir \"{s1gamecsgo}\" -s2addon {s2addon} -game csgo -usefilelist \"{temp_refs}\""
 			try:
 				utl.RunCommand(importRefsCmd, non_aborting_callback)
 			except Exception as e:
 				print(f"Warning: Some model materials may have failed to import: {e}")
 			
+			for mtl in model_materials:
+				if mtl in material_keys:
+					StoreCachedAsset(material_keys, mtl, s2contentcsgoimported, [VMATPath(mtl.replace("\\", "/"))])
+			
 			# Skip compilation - CS2 Hammer will compile assets when the map is opened
 			# for mtlfile in model_materials:
 			# 	if mtlfile.startswith("-") or mtlfile == "":
@@ -567,25 +688,49 @@ def ImportVMFModels(vmf_path, s1gamecsgo, s2addon, s2contentcsgoimported, errorC
 		print(f"Warning: VMF model import failed: {e}")
 		print("Continuing with VMF import...")
 
+##########################################################################################################################################
+# Attribute source1import errors to the materials of a batched import
+##########################################################################################################################################
+SOURCE1IMPORT_FAILURE_MARKERS = ('error', 'fail', 'unable', 'could not', "can't", 'cannot', 'not found', 'missing')
+
+# File paths in source1import output, removed before looking for failure markers
+SOURCE1IMPORT_PATH_RE = re.compile(r'[^\s"\']*materials/[^\s"\']*')
+# What may follow a material name: its .vmt/.vmat or the end of the name (never another extension like .vtf)
+SOURCE1IMPORT_NAME_END_RE = re.compile(r'\.(?:vmt|vmat)\b|["\'\s:)]|$')
+
+# A material named in source1import output (materials/x.vmt or the .vmat it writes), group 1 is x lowercased
+SOURCE1IMPORT_MATERIAL_RE = re.compile(r'materials/([^"\'\s]+?)\.(?:vmt|vmat)\b')
+
+def FindFailedMaterials(output_lines, materials):
+	"""Map each material named on a failure line of the tool output to that line.
+	Only a hint next to the .vmat checks: markers count outside file paths, and only the .vmt/.vmat names the material."""
+	lookup = {f"materials/{material}".lower(): material for material in materials}
+	failed = {}
+	for line in output_lines:
+		lowered = line.lower().replace('\\', '/')
+		# "Wrote materials/errorbox/a.vmat" is no failure
+		message = SOURCE1IMPORT_PATH_RE.sub(' ', lowered)
+		if not any(marker in message for marker in SOURCE1IMPORT_FAILURE_MARKERS):
+			continue
+		for key, material in lookup.items():
+			# Match "materials/x" followed by .vmt/.vmat or the end of the name, not "materials/x_2" or "materials/x.vtf"
+			index = lowered.find(key)
+			while index != -1:
+				if SOURCE1IMPORT_NAME_END_RE.match(lowered, index + len(key)):
+					failed.setdefault(material, line.strip())
+					break
+				index = lowered.find(key, index + 1)
+	return failed
+
 ##########################################################################################################################################
 # Import all materials referenced in VMF from pak01
 ##########################################################################################################################################
 def ImportVMFMaterials(vmf_path, s1gamecsgo, s2addon, s2contentcsgoimported, errorCallback):
 	"""Import all materials referenced in the VMF file from pak01 before VMF import.
 	Returns a set of successfully imported material paths for deduplication."""
-	import re
-	
 	try:
-		with open(vmf_path, 'r', encoding='utf-8', errors='ignore') as f:
-			vmf_content = f.read()
-		
-		# Find all material references in the VMF (they appear in "material" keys)
-		material_pattern = re.compile(r'"material"\s+"([^"]+)"', re.IGNORECASE)
-		materials = set(material_pattern.findall(vmf_content))
-		
-		# Also find materials in texture references
-		texture_pattern = re.compile(r'"texture"\s+"([^"]+)"', re.IGNORECASE)
-		materials.update(texture_pattern.findall(vmf_content))
+		# "material" and "texture" keys, from the shared single-pass summary of the VMF
+		materials = get_vmf_summary(vmf_path).materials
 		
 		if not materials:
 			print("No materials found in VMF")
@@ -594,29 +739,63 @@ def ImportVMFMaterials(vmf_path, s1gamecsgo, s2addon, s2contentcsgoimported, err
 		print(f"Found {len(materials)} unique material references in VMF, importing from pak01...")
 		sys.stdout.flush()  # Ensure progress is shown immediately
 		
-		# Import materials one by one to avoid batch failure
-		imported_materials = []
-		failed_count = 0
+		materials = sorted({material.strip().replace('\\', '/') for material in materials} - {''})
+		source1import_exe = GetSource1ImportPath()
 		
-		def material_error_callback(cmd):
-			# Don't abort on individual material import failures
-			print(f"Warning: Material import command failed: {cmd}")
+		# Materials converted by an earlier import are copied from the asset cache
+		cached, cache_keys = RestoreCachedAssets(source1import_exe, {material: MaterialSources(f"materials/{material}.vmt") for material in materials}, s2contentcsgoimported)
+		imported_materials = [material for material in materials if material in cached]
+		if cached:
+			print(f"Restored {len(cached)} materials from the asset cache")
+			print(f"Imported {len(imported_materials)} materials")
+		materials = [material for material in materials if material not in cached]
 		
-		for material in materials:
-			material = material.strip().replace('\\', '/')
-			if not material:
-				continue
-			try:
-				source1import_exe = GetSource1ImportPath()
-				import_cmd = f"\"{source1import_exe}\" -retail -nop4 -nop4sync -src1gameinfodir \"{s1gamecsgo}\" -src1contentdir \"{s1gamecsgo}\" -s2addon {s2addon} -game csgo \"materials/{material}.vmt\""
-				utl.RunCommand(import_cmd, material_error_callback)
-				imported_materials.append(material)
-				# Print progress after each material
-				print(f"Imported {len(imported_materials)} materials")
-				sys.stdout.flush()  # Force immediate output
-			except Exception as e:
-				print(f"Warning: Failed to import material {material}: {e}")
-				failed_count += 1
+		failed_count = 0
+		if materials:
+			# Import every material in a single source1import run (process startup and gameinfo mount paid once)
+			refs_file = vmf_path.replace('.vmf', '_vmf_mtl_refs.txt')
+			utl.EnsureFileWritable(refs_file)
+			with open(refs_file, 'w') as fw:
+				fw.write(utl.RefsStringFromList([f"materials/{material}.vmt" for material in materials]))
+			
+			import_cmd = f"\"{source1import_exe}\" -retail -nop4 -nop4sync -src1gameinfodir \"{s1gamecsgo}\" -src1contentdir \"{s1gamecsgo}\" -s2addon {s2addon} -game csgo -usefilelist \"{refs_file}\""
+			print(f"Importing {len(materials)} materials with one source1import run...")
+			sys.stdout.flush()
+			
+			# Progress while the batch runs: each material counts once the tool output names it
+			pending = {material.lower(): material for material in materials}
+			processed = [len(imported_materials)]
+			def report_progress(line):
+				for match in SOURCE1IMPORT_MATERIAL_RE.finditer(line.replace('\\', '/').lower()):
+					if pending.pop(match.group(1), None) is not None:
+						processed[0] += 1
+						print(f"Imported {processed[0]} materials")
+						sys.stdout.flush()
+			
+			run_started = time.time()
+			returncode, output = utl.RunCommandOutput(import_cmd, report_progress)
+			if returncode != 0:
+				print(f"Warning: Material import command failed (exit code {returncode}), checking which materials were imported")
+			
+			# One broken material must not hide the rest: attribute failures per file
+			reported = FindFailedMaterials(output, materials)
+			for material in materials:
+				vmat_rel_path = VMATPath(f"materials/{material}.vmt")
+				# A fresh .vmat decides, the output lines only explain a failure
+				if not os.path.exists(os.path.join(s2contentcsgoimported, vmat_rel_path)):
+					print(f"Failed to import material {material}: {reported.get(material, 'no .vmat was written')}")
+					failed_count += 1
+				elif os.path.getmtime(os.path.join(s2contentcsgoimported, vmat_rel_path)) < run_started - 2:
+					# Left over from an earlier import, this run did not write it
+					print(f"Failed to import material {material}: {reported.get(material, 'the .vmat was not updated by this run')}")
+					failed_count += 1
+				elif material in reported:
+					# Written, but with an error, kept out of the asset cache so the next import tries again
+					print(f"Warning: Imported material {material} with errors: {reported[material]}")
+					imported_materials.append(material)
+				else:
+					imported_materials.append(material)
+					StoreCachedAsset(cache_keys, material, s2contentcsgoimported, [vmat_rel_path])
 		
 		print(f"Imported {len(imported_materials)} materials, {failed_count} failed")
 		sys.stdout.flush()
@@ -722,12 +901,15 @@ parser.add_argument( 'mapname', help='Name of map to import, relative to maps\\
 parser.add_argument( '-usebsp', action='store_true', default=False, help='Generate and use bsp on import' )
 parser.add_argument( '-usebsp_nomergeinstances', action='store_true', default=False, help='if using bsp, do not merge instances' )
 parser.add_argument( '-skipdeps', action='store_true', default=False, help='do not import and compile dependencies (imports .vmf to .vmap only)' )
+parser.add_argument( '-modelworkers', type=int, default=0, help='number of models imported in parallel (0 = one per core, up to 8)' )
+parser.add_argument( '-noassetcache', action='store_true', default=False, help='always run source1import/cs_mdl_import instead of reusing assets converted by earlier imports' )
 args = parser.parse_args()
 
 mapname = args.mapname
 usebsp = args.usebsp
 nomergeinstances = args.usebsp_nomergeinstances
 skipdeps = args.skipdeps
+modelworkers = args.modelworkers
 
 # setup paths
 s1gamecsgo = args.s1gameinfodir
@@ -735,6 +917,9 @@ s1contentcsgo = args.s1contentdir
 s2gamecsgo = args.s2gameinfodir
 s2addon = args.s2addon
 
+# Assets converted by earlier imports (into any addon), keyed by source version
+assetcache = None if args.noassetcache else ConvertedAssetCache(s1gamecsgo)
+
 s1gamecsgotxt = s1gamecsgo + "\\" + "gameinfo.txt"
 if ( not os.path.exists( s1gamecsgotxt ) ):
 	utl.Error( "%s not found, aborting" % s1gamecsgotxt )
@@ -908,6 +1093,13 @@ try:
 
 	print("VMF import process completed.")
 	
+	# Parse the VMF once, every stage below reuses this summary
+	try:
+		vmf_summary = get_vmf_summary(vmf_file_path)
+		print(f"VMF references {len(vmf_summary.materials)} materials, {len(vmf_summary.models)} models, {len(vmf_summary.sounds)} sounds, {len(vmf_summary.instances)} instances ({vmf_summary.entity_count} entities)")
+	except OSError as e:
+		print(f"Warning: Could not read VMF {vmf_file_path}: {e}")
+
 	# Now import materials and models AFTER the VMF has been processed
 	# Fix material file case to match VMF before import
 	print("Fixing material file case to match VMF references...")
@@ -936,6 +1128,10 @@ try:
 		traceback.print_exc()
 		print("Continuing with post-processing...")
 
+	if assetcache is not None:
+		print(f"Asset cache: {assetcache.hits} assets reused, {assetcache.stores} added")
+		assetcache.evict()
+
 	# replace 'instance' paths with 'prefab' 
 	mapname = mapname.replace( "instances", "prefabs" )
 
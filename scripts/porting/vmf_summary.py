@@ -0,0 +1,174 @@
+"""
+Single-pass VMF reader for the CS2 importer
+Streams a VMF (KeyValues) once and collects the materials, models, sounds and instances it references
+"""
+
+import os
+import re
+
+# "quoted string" | { | } | bare word, // comments are cut off before matching
+TOKEN_RE = re.compile(r'"([^"]*)"|([{}])|([^\s{}"]+)')
+
+ENTITY_BLOCKS = ('entity', 'world')
+MATERIAL_KEYS = ('material', 'texture')
+SOUND_EXTENSIONS = ('.wav', '.mp3')
+
+_summaries = {}  # (path, size, mtime_ns) -> VMFSummary, shared by every importer stage in this process
+
+
+def tokenize(f):
+    """Yield the tokens of a KeyValues text stream line by line (braces as '{' / '}')"""
+    for line in f:
+        comment = line.find('//')
+        if comment != -1 and line.count('"', 0, comment) % 2 == 0:
+            line = line[:comment]
+        for quoted, brace, bare in TOKEN_RE.findall(line):
+            if brace:
+                yield brace, False
+            elif bare:
+                yield bare, False
+            else:
+                yield quoted, True
+
+
+class EntityRefs:
+    """References found inside one entity (or the world) block"""
+
+    def __init__(self):
+        self.classname = ''
+        self.materials = set()
+        self.models = set()
+        self.sounds = set()
+        self.instances = set()
+        self.message = None  # ambient_generic keeps its sound in "message"
+
+
+class VMFSummary:
+    """Dependencies of a VMF.
+
+    materials/models/sounds/instances hold every reference (exact case, as the
+    stages that fix file case need it); by_class groups them per entity class,
+    e.g. by_class['prop_static']['models'].
+    """
+
+    def __init__(self):
+        self.materials = set()
+        self.models = set()
+        self.sounds = set()
+        self.instances = set()
+        self.by_class = {}
+        self.has_versioninfo = False
+        self.entity_count = 0
+
+    def add_entity(self, refs):
+        classname = refs.classname or 'unknown'
+        if classname == 'ambient_generic' and refs.message:
+            refs.sounds.add(refs.message)
+
+        self.entity_count += 1
+        self.materials |= refs.materials
+        self.models |= refs.models
+        self.sounds |= refs.sounds
+        self.instances |= refs.instances
+
+        groups = self.by_class.get(classname)
+        if groups is None:
+            groups = self.by_class[classname] = {'count': 0, 'materials': set(), 'models': set(), 'sounds': set(), 'instances': set()}
+        groups['count'] += 1
+        groups['materials'] |= refs.materials
+        groups['models'] |= refs.models
+        groups['sounds'] |= refs.sounds
+        groups['instances'] |= refs.instances
+
+
+def parse_vmf(path):
+    """Read a VMF in one streaming pass and return its VMFSummary"""
+    summary = VMFSummary()
+    stack = []  # (block name, EntityRefs or None) of the open blocks
+    entity = None  # EntityRefs of the innermost open entity/world block
+    stray = EntityRefs()  # Keys outside any entity (e.g. hand-written fragments)
+    pending = None  # Previous token, a key or a block name
+
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for token, quoted in tokenize(f):
+            if token == '{' and not quoted:
+                name = (pending or '').lower()
+                pending = None
+                if name == 'versioninfo' and not stack:
+                    summary.has_versioninfo = True
+                refs = EntityRefs() if name in ENTITY_BLOCKS else None
+                stack.append((name, refs))
+                if refs is not None:
+                    entity = refs
+                continue
+
+            if token == '}' and not quoted:
+                pending = None
+                if stack:
+                    _, refs = stack.pop()
+                    if refs is not None:
+                        summary.add_entity(refs)
+                        entity = next((r for _, r in reversed(stack) if r is not None), None)
+                continue
+
+            if pending is None:
+                pending = token
+                continue
+
+            # key/value pair
+            key = pending.lower()
+            value = token
+            pending = None
+            target = entity if entity is not None else stray
+            lowered = value.lower()
+
+            if key == 'classname':
+                target.classname = lowered
+            elif key in MATERIAL_KEYS:
+                target.materials.add(value)
+            elif key == 'model' and lowered.endswith('.mdl'):
+                target.models.add(value)
+            elif key == 'file' and lowered.endswith('.vmf'):
+                target.instances.add(value)
+            elif key == 'message':
+                target.message = value
+            elif lowered.endswith(SOUND_EXTENSIONS):
+                target.sounds.add(value)
+
+    # Blocks left open by a truncated file still count
+    while stack:
+        _, refs = stack.pop()
+        if refs is not None:
+            summary.add_entity(refs)
+    if stray.materials or stray.models or stray.sounds or stray.instances:
+        summary.add_entity(stray)
+    return summary
+
+
+def get_vmf_summary(path):
+    """VMFSummary of path, parsed once per file version and shared by all callers"""
+    stat = os.stat(path)
+    key = (os.path.normcase(os.path.abspath(path)), stat.st_size, stat.st_mtime_ns)
+    summary = _summaries.get(key)
+    if summary is None:
+        summary = _summaries[key] = parse_vmf(path)
+    return summary
+
+
+def has_versioninfo(path):
+    """Check for a top-level versioninfo block, reading only up to the first top-level block"""
+    depth = 0
+    pending = None
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for token, quoted in tokenize(f):
+            if token == '{' and not quoted:
+                if depth == 0 and (pending or '').lower() == 'versioninfo':
+                    return True
+                depth += 1
+            elif token == '}' and not quoted:
+                depth -= 1
+                if depth <= 0:
+                    # versioninfo comes first in Hammer-formatted VMFs
+                    return False
+            pending = token
+    return False
@@ -0,0 +1,310 @@
+"""
+In-process preview player for the CS2 Sounds Manager
+Decodes a sound once into memory and streams it (loop region, crossfade, pitch, volume) through a pygame channel
+"""
+
+import threading
+import time
+
+import numpy as np
+import pygame
+
+from audio_analysis import WAVE_FORMAT_PCM, read_wav_format
+
+PLAYER_RATE = 44100  # Mixer format the player owns (16-bit stereo)
+PLAYER_CHANNELS = 2
+MIXER_BUFFER = 512
+CHUNK_FRAMES = 4096  # Frames per queued chunk (~93ms, outlasts a UI frame at any FPS cap), setting changes land within one chunk
+MIN_RATE = 0.1  # Pitch range accepted by set_rate
+MAX_RATE = 4.0
+
+
+def read_pcm16_wav(wav_path):
+    """Read a 16-bit PCM WAV at PLAYER_RATE into an int16 (frames, 2) array"""
+    with open(wav_path, 'rb') as f:
+        format_tag, channels, framerate, bits, data_offset, data_size = read_wav_format(f)
+        if format_tag != WAVE_FORMAT_PCM or bits != 16 or framerate != PLAYER_RATE or channels < 1:
+            raise ValueError("WAV is not 16-bit PCM at the player rate")
+        f.seek(data_offset)
+        raw = f.read(data_size - data_size % (channels * 2))
+
+    samples = np.frombuffer(raw, '<i2').reshape(-1, channels)
+    if channels == 1:
+        return np.repeat(samples, PLAYER_CHANNELS, axis=1)
+    return np.ascontiguousarray(samples[:, :PLAYER_CHANNELS])
+
+
+def decode_to_memory(file_path, transcode=None, use_mixer=True):
+    """
+    Decode an audio file into an int16 (frames, 2) array at PLAYER_RATE
+
+    Args:
+        file_path: Audio file to decode
+        transcode: Optional callable returning a cached 16-bit WAV of file_path at
+                   PLAYER_RATE (or None), shared with export so ffmpeg runs once
+        use_mixer: Allow the pygame fallback; worker threads pass False and get None
+                   when only pygame can decode the file
+    """
+    # WAVs already in the player format are read as-is
+    if file_path.lower().endswith('.wav'):
+        try:
+            return read_pcm16_wav(file_path)
+        except ValueError:
+            pass
+
+    wav_path = transcode(file_path) if transcode else None
+    if wav_path:
+        return read_pcm16_wav(wav_path)
+
+    if not use_mixer:
+        return None
+
+    # pygame converts to the mixer format (PLAYER_RATE, 16-bit, stereo) while loading
+    raw = pygame.mixer.Sound(file_path).get_raw()
+    frame_bytes = PLAYER_CHANNELS * 2
+    return np.frombuffer(raw[:len(raw) - len(raw) % frame_bytes], '<i2').reshape(-1, PLAYER_CHANNELS).copy()
+
+
+def ms_to_frames(ms):
+    return int(ms * PLAYER_RATE / 1000)
+
+
+class PreviewPlayer:
+    """Streams a decoded sound through a reserved pygame channel.
+
+    The file is decoded once into memory on a background thread; pump(), called by
+    the UI loop every frame, resamples small chunks out of it and queues them back to
+    back on the channel. Loop points, crossfade, pitch and volume are read again for
+    every chunk, so changing them never needs a re-decode or a mixer restart.
+    pygame objects are only made on the UI thread, the one that re-initializes the
+    mixer.
+    """
+
+    def __init__(self):
+        self.loaded = (None, None)  # (file path, int16 (frames, 2) samples), swapped as one
+        self.channel = None
+        self.lock = threading.Lock()  # Guards the stream state shared with the decode thread
+        self.generation = 0  # Bumped by play/stop, an outdated decode is dropped
+        self.playing = False
+        self.playhead = (None, 0.0)  # (source position of every output frame of the current chunk, start time)
+
+        # Stream of the current generation, advanced by pump()
+        self.samples = None  # Decoded samples once ready
+        self.mixer_decode = None  # File only pygame can decode, pump() does it on the UI thread
+        self.cursor = 0  # Fractional source frame of the next chunk
+        self.pending = None  # Source frames of the queued chunk
+        self.finished = False
+        self.on_error = None
+
+        # Live settings, read by pump() for every chunk
+        self.loop_enabled = False
+        self.loop_start_ms = 0
+        self.loop_end_ms = 0
+        self.crossfade_ms = 0
+        self.volume = 1.0
+        self.rate = 1.0  # Playback speed = pitch (2.0 plays an octave up)
+
+    def ensure_mixer(self):
+        """Open the mixer in the player's format (once) and reserve its channel"""
+        if pygame.mixer.get_init() != (PLAYER_RATE, -16, PLAYER_CHANNELS):
+            pygame.mixer.quit()
+            pygame.mixer.init(frequency=PLAYER_RATE, size=-16, channels=PLAYER_CHANNELS, buffer=MIXER_BUFFER)
+            self.channel = None
+        if self.channel is None:
+            pygame.mixer.set_reserved(1)
+            self.channel = pygame.mixer.Channel(0)
+
+    def set_loop(self, enabled, start_ms, end_ms, crossfade_ms):
+        """Update the loop region (takes effect with the next chunk)"""
+        self.loop_enabled = enabled
+        self.loop_start_ms = start_ms
+        self.loop_end_ms = end_ms
+        self.crossfade_ms = crossfade_ms
+
+    def set_volume(self, volume):
+        """Gain applied to every chunk as it is rendered"""
+        self.volume = volume
+
+    def set_rate(self, rate):
+        """Pitch as a resampling rate (takes effect with the next chunk)"""
+        self.rate = min(max(rate, MIN_RATE), MAX_RATE)
+
+    def play(self, file_path, transcode=None, start_ms=0, on_error=None):
+        """Start playing file_path from start_ms (decoding it first unless it is the loaded sound)"""
+        self.ensure_mixer()
+        with self.lock:
+            self.generation += 1
+            generation = self.generation
+            self.channel.stop()
+            self.channel.set_volume(1.0)  # Volume is applied to the samples instead
+            self.playing = True
+            self.playhead = (None, 0.0)
+            self.samples = None
+            self.mixer_decode = None
+            self.cursor = ms_to_frames(start_ms)
+            self.pending = None
+            self.finished = False
+            self.on_error = on_error
+
+            loaded_path, samples = self.loaded
+            if loaded_path == file_path and samples is not None:
+                self.samples = samples
+                return
+
+        threading.Thread(target=self._decode, args=(generation, file_path, transcode), daemon=True).start()
+
+    def stop(self):
+        with self.lock:
+            self.generation += 1
+            if self.channel is not None:
+                self.channel.stop()
+            self.playing = False
+            self.samples = None
+            self.mixer_decode = None
+
+    def _decode(self, generation, file_path, transcode):
+        """Decode thread: read file_path into memory without touching the mixer"""
+        try:
+            samples = decode_to_memory(file_path, transcode, use_mixer=False)
+        except Exception as e:
+            self.fail(generation, e)
+            return
+
+        with self.lock:
+            if generation != self.generation:
+                return
+            if samples is None:
+                self.mixer_decode = file_path
+            else:
+                self.loaded = (file_path, samples)
+                self.samples = samples
+
+    def fail(self, generation, error):
+        """End playback of generation and report the error"""
+        with self.lock:
+            if generation != self.generation:
+                return
+            self.playing = False
+            self.samples = None
+            on_error = self.on_error
+        if on_error:
+            on_error(error)
+
+    def get_position_ms(self):
+        """Source position being heard right now"""
+        positions, started_at = self.playhead
+        if positions is None or not len(positions):
+            return 0
+        offset = int((time.monotonic() - started_at) * PLAYER_RATE)
+        return int(positions[min(offset, len(positions) - 1)] * 1000 / PLAYER_RATE)
+
+    def get_loop_frames(self, n_frames):
+        """(start, end, crossfade) of the loop region in frames, or None when not looping"""
+        if not self.loop_enabled or n_frames == 0:
+            return None
+        start = min(max(0, ms_to_frames(self.loop_start_ms)), n_frames - 1)
+        end = ms_to_frames(self.loop_end_ms) if self.loop_end_ms > 0 else n_frames
+        end = min(max(start + 1, end), n_frames)
+        # The crossfade blends in the audio leading into the loop start (the file's tail when the loop starts at 0)
+        crossfade = min(ms_to_frames(self.crossfade_ms), (end - start) // 2)
+        return start, end, crossfade
+
+    def next_positions(self, cursor, n_frames, loop):
+        """Fractional source positions of the next chunk, the cursor after it and whether playback has ended"""
+        rate = self.rate
+        positions = cursor + np.arange(CHUNK_FRAMES) * rate
+        next_cursor = cursor + CHUNK_FRAMES * rate
+
+        if loop is not None:
+            start, end, _ = loop
+            length = end - start
+            # Wrap everything past the loop end back into the region (any number of times)
+            past_end = positions >= end
+            positions[past_end] = start + (positions[past_end] - start) % length
+            if next_cursor >= end:
+                next_cursor = start + (next_cursor - start) % length
+            return positions, next_cursor, False
+
+        positions = positions[positions < n_frames]
+        return positions, next_cursor, next_cursor >= n_frames
+
+    @staticmethod
+    def interpolate(samples, positions, loop):
+        """Linearly interpolated float32 frames at fractional source positions"""
+        left = positions.astype(np.intp)
+        right = left + 1
+        if loop is not None:
+            # The frame after the loop end is the loop start
+            start, end, _ = loop
+            right[right >= end] = start
+        np.minimum(right, len(samples) - 1, out=right)
+
+        frac = (positions - left).astype(np.float32)[:, None]
+        left_frames = samples[left].astype(np.float32)
+        return left_frames + (samples[right].astype(np.float32) - left_frames) * frac
+
+    def render_chunk(self, samples, positions, loop):
+        """Build the int16 PCM bytes for the given source positions (pitch and volume applied)"""
+        out = self.interpolate(samples, positions, loop)
+
+        if loop is not None and loop[2] > 0:
+            start, end, crossfade = loop
+            fade_from = end - crossfade
+            in_fade = positions >= fade_from
+            if in_fade.any():
+                # Fade the loop tail out while the audio leading into the loop start fades in
+                fade_positions = positions[in_fade]
+                weights = ((fade_positions - fade_from) / crossfade).astype(np.float32)[:, None]
+                lead_positions = fade_positions - (end - start)
+                lead_positions[lead_positions < 0] += len(samples)  # Before the file start, wrap into its tail
+                lead_in = self.interpolate(samples, lead_positions, None)
+                out[in_fade] = out[in_fade] * (1.0 - weights) + lead_in * weights
+
+        out *= self.volume
+        return np.clip(out, -32768, 32767).astype(np.int16).tobytes()
+
+    def pump(self):
+        """Keep one chunk queued behind the one playing (call from the UI thread every frame)"""
+        with self.lock:
+            generation = self.generation
+            if not self.playing:
+                return
+            try:
+                if self.mixer_decode is not None:
+                    # pygame decodes while loading, which needs the mixer
+                    samples = decode_to_memory(self.mixer_decode)
+                    self.loaded = (self.mixer_decode, samples)
+                    self.samples = samples
+                    self.mixer_decode = None
+                if self.samples is not None:
+                    self.queue_chunks(self.samples)
+                return
+            except Exception as e:
+                error = e
+        self.fail(generation, error)
+
+    def queue_chunks(self, samples):
+        """Render and queue chunks until one waits behind the playing one (lock held)"""
+        n_frames = len(samples)
+        if self.pending is not None and self.channel.get_queue() is None:
+            # The queued chunk just started playing
+            self.playhead = (self.pending, time.monotonic())
+            self.pending = None
+
+        while self.pending is None:
+            if self.finished:
+                if not self.channel.get_busy():
+                    self.playing = False
+                return
+
+            loop = self.get_loop_frames(n_frames)
+            positions, self.cursor, self.finished = self.next_positions(min(self.cursor, n_frames), n_frames, loop)
+            if not len(positions):
+                continue
+            sound = pygame.mixer.Sound(buffer=self.render_chunk(samples, positions, loop))
+            if self.channel.get_busy():
+                self.channel.queue(sound)
+                self.pending = positions
+            else:
+                self.channel.play(sound)
+                self.playhead = (positions, time.monotonic())
@@ -0,0 +1,338 @@
+"""
+Shared resourcecompiler.exe helper for the mapping tools
+Compiles many content files in one compiler run (-filelist) and reports success per file
+"""
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import tempfile
+import threading
+import time
+
+# Compiled extension for content files whose compiled name is not just "<ext>_c"
+COMPILED_EXTENSIONS = {
+    '.wav': '.vsnd_c',
+    '.mp3': '.vsnd_c',
+    '.svg': '.vsvg_c',
+}
+
+# A compiler output line reporting a failure ("ERROR: ...", "Failed to compile ..."), summary counts are removed first
+FAILURE_RE = re.compile(r'\b(errors?|failed|failure|fatal)\b', re.IGNORECASE)
+SUMMARY_COUNT_RE = re.compile(r'\b\d+\s+(errors?|failed|failures?|warnings?)\b', re.IGNORECASE)
+
+# Characters that continue a path, a reported name must not be followed by one (x.vmat vs x.vmat_old)
+PATH_CHAR_RE = re.compile(r'[A-Za-z0-9_.\-]')
+
+# Outputs older than the compile start by more than this are left over from an earlier run (mtime granularity)
+MTIME_SLACK = 2.0
+
+# Per-addon record of the inputs of the last successful compile of every file
+MANIFEST_NAME = '.compile_manifest.json'
+MANIFEST_VERSION = 1
+MANIFEST_LOCK = threading.Lock()  # Parallel compiles of one addon update the same manifest
+
+# Texture inputs a material names (TextureA "panorama/images/x.png"), part of the material's signature
+MATERIAL_EXTENSIONS = ('.vmat',)
+TEXTURE_REFERENCE_RE = re.compile(r'"([^"\r\n]+\.(?:png|tga|jpg|jpeg|psd|exr|tif|tiff|bmp))"', re.IGNORECASE)
+
+
+class BuildManifest:
+    """Source hashes and compile parameters of an addon's compiled files.
+
+    Stored in the addon's game folder next to the _c outputs. A file whose source
+    bytes and parameters match its entry (and whose output still exists) does not
+    need the compiler again.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}  # Content path relative to the addon -> {'source': sha1, 'params': sha1}
+
+    @classmethod
+    def load(cls, path):
+        manifest = cls(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                manifest.entries = data['entries']
+        except (OSError, ValueError, KeyError):
+            pass
+        return manifest
+
+    def save(self):
+        """Write the manifest (temp file + rename so a crash never leaves a torn file)"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': MANIFEST_VERSION, 'entries': self.entries}, f, indent=1, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Could not save compile manifest: {e}")
+
+    def is_current(self, key, signature):
+        return self.entries.get(key) == signature
+
+
+def hash_file(path):
+    """SHA-1 of a file's bytes ('' when it does not exist)"""
+    digest = hashlib.sha1()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+    except FileNotFoundError:
+        return ''
+    return digest.hexdigest()
+
+
+def get_manifest_location(game_root, content_path):
+    """(manifest path, key) of a content file, or (None, None) outside content/csgo_addons/<addon>"""
+    relative_path = os.path.relpath(content_path, os.path.join(game_root, 'content')).replace("\\", "/")
+    parts = relative_path.split('/')
+    if len(parts) < 3 or parts[0].lower() != 'csgo_addons':
+        return None, None
+    manifest_path = os.path.join(game_root, 'game', 'csgo_addons', parts[1], MANIFEST_NAME)
+    return manifest_path, '/'.join(parts[2:]).lower()
+
+
+def get_content_roots(game_root, content_path):
+    """Folders a content file's references resolve against: its addon's content folder, then content/csgo"""
+    roots = []
+    relative_path = os.path.relpath(content_path, os.path.join(game_root, 'content')).replace("\\", "/")
+    parts = relative_path.split('/')
+    if len(parts) >= 3 and parts[0].lower() == 'csgo_addons':
+        roots.append(os.path.join(game_root, 'content', 'csgo_addons', parts[1]))
+    roots.append(os.path.join(game_root, 'content', 'csgo'))
+    return roots
+
+
+def get_material_textures(game_root, content_path):
+    """(reference, resolved path or None) of every texture file a material names"""
+    try:
+        with open(content_path, 'r', encoding='utf-8', errors='ignore') as f:
+            references = sorted(set(TEXTURE_REFERENCE_RE.findall(f.read())))
+    except OSError:
+        return []
+    roots = get_content_roots(game_root, content_path)
+    textures = []
+    for reference in references:
+        resolved = None
+        for root in roots:
+            candidate = os.path.join(root, reference.replace("\\", "/"))
+            if os.path.isfile(candidate):
+                resolved = candidate
+                break
+        textures.append((reference, resolved))
+    return textures
+
+
+def get_compile_signature(game_root, content_path, extra_params=None):
+    """What a compile of content_path depends on: its bytes, the compiler build, the bytes of the
+    textures a material names and whatever extra_params(content_path) returns (e.g. encoding.txt settings)"""
+    params = hashlib.sha1()
+    try:
+        stat = os.stat(get_compiler_path(game_root))
+        params.update(f"{stat.st_size}|{stat.st_mtime_ns}".encode())
+    except OSError:
+        pass
+    if extra_params is not None:
+        params.update(extra_params(content_path).encode())
+    if content_path.lower().endswith(MATERIAL_EXTENSIONS):
+        # The loading screen writes the same vmat for every new screenshot, the texture bytes are what change
+        for reference, resolved in get_material_textures(game_root, content_path):
+            params.update(f"{reference.lower()}={hash_file(resolved) if resolved else ''}|".encode())
+    return {'source': hash_file(content_path), 'params': params.hexdigest()}
+
+
+def get_compiler_path(game_root):
+    return os.path.join(game_root, 'game', 'bin', 'win64', 'resourcecompiler.exe')
+
+
+def get_compiled_path(game_root, content_path):
+    """Where the compiler writes a content file (content/csgo_addons/x/a.vmat -> game/csgo_addons/x/a.vmat_c)"""
+    relative_path = os.path.relpath(content_path, os.path.join(game_root, 'content'))
+    base, ext = os.path.splitext(relative_path)
+    compiled_ext = COMPILED_EXTENSIONS.get(ext.lower(), ext + '_c')
+    return os.path.join(game_root, 'game', base + compiled_ext)
+
+
+def is_failure_line(line):
+    """True for lines reporting an error, not for summaries like "0 errors, 2 warnings" """
+    return bool(FAILURE_RE.search(SUMMARY_COUNT_RE.sub('', line)))
+
+
+def get_reported_names(game_root, content_path):
+    """Lowercased names the compiler may print for a file: its content path, its path inside the
+    addon and the compiled resource name (materials/x.vmat, materials/x.vmat_c, ...)"""
+    content_relative = os.path.relpath(content_path, os.path.join(game_root, 'content')).replace("\\", "/").lower()
+    compiled_relative = os.path.relpath(get_compiled_path(game_root, content_path), os.path.join(game_root, 'game')).replace("\\", "/").lower()
+    names = {os.path.abspath(content_path).replace("\\", "/").lower(), content_relative, compiled_relative}
+    for relative in (content_relative, compiled_relative):
+        parts = relative.split('/')
+        if len(parts) > 2 and parts[0] == 'csgo_addons':
+            names.add('/'.join(parts[2:]))
+    return names
+
+
+def line_names_path(line, name):
+    """Whether name appears in line as a whole path (not as part of a longer name)"""
+    index = line.find(name)
+    while index != -1:
+        end = index + len(name)
+        before_ok = index == 0 or not PATH_CHAR_RE.match(line[index - 1])
+        after_ok = end == len(line) or not PATH_CHAR_RE.match(line[end])
+        if before_ok and after_ok:
+            return True
+        index = line.find(name, index + 1)
+    return False
+
+
+def find_failed_files(output, reported_names):
+    """Files the compiler output reports as failed. reported_names maps file -> names from get_reported_names"""
+    failed = {}
+    for line in output.splitlines():
+        if not is_failure_line(line):
+            continue
+        lowered = line.replace("\\", "/").lower()
+        for path, names in reported_names.items():
+            if path not in failed and any(line_names_path(lowered, name) for name in names):
+                failed[path] = line.strip()
+    return failed
+
+
+def compile_files(game_root, file_paths, log=print, force=False, extra_params=None):
+    """
+    Compile content files with a single resourcecompiler.exe run
+
+    The compiler's startup (filesystem mount, shader and config load) is paid once
+    for the whole list instead of once per file. Files whose inputs match the addon's
+    build manifest are skipped and reported as cached.
+
+    Args:
+        game_root: CS2 install folder (containing 'game' and 'content')
+        file_paths: Content files to compile (.vmat, .svg, .wav, .vsndevts, ...)
+        log: Callable receiving progress/error messages
+        force: Compile even when the manifest says the output is up to date
+        extra_params: Callable returning a string of tool-specific inputs of a file
+            (settings files the compiler reads), changes to it force a recompile
+
+    Returns:
+        {file_path: True/False} for every file in file_paths
+    """
+    results = {path: False for path in file_paths}
+    if not file_paths:
+        return results
+
+    # Skip files whose source and settings are unchanged since their last successful compile
+    signatures = {}
+    manifests = {}
+    pending = []
+    for path in file_paths:
+        manifest_path, key = get_manifest_location(game_root, path)
+        if manifest_path is None:
+            pending.append(path)
+            continue
+        signature = signatures[path] = get_compile_signature(game_root, path, extra_params)
+        if manifest_path not in manifests:
+            manifests[manifest_path] = BuildManifest.load(manifest_path)
+        if (not force and manifests[manifest_path].is_current(key, signature)
+                and os.path.exists(get_compiled_path(game_root, path))):
+            results[path] = True
+            log(f"✓ Cached (unchanged): {os.path.basename(path)}")
+        else:
+            pending.append(path)
+
+    if pending:
+        results.update(run_compiler(game_root, pending, log))
+
+    # Record what was just compiled
+    compiled = [path for path in pending if results[path] and path in signatures]
+    if compiled:
+        with MANIFEST_LOCK:
+            updated = {}
+            for path in compiled:
+                manifest_path, key = get_manifest_location(game_root, path)
+                if manifest_path not in updated:
+                    # Reload under the lock, another compile may have saved in the meantime
+                    updated[manifest_path] = BuildManifest.load(manifest_path)
+                updated[manifest_path].entries[key] = signatures[path]
+            for manifest in updated.values():
+                manifest.save()
+    return results
+
+
+def run_compiler(game_root, file_paths, log=print):
+    """Run resourcecompiler.exe once over file_paths. Returns {file_path: True/False}"""
+    results = {path: False for path in file_paths}
+
+    compiler_path = get_compiler_path(game_root)
+    if not os.path.exists(compiler_path):
+        log(f"✗ Error: resourcecompiler.exe not found at {compiler_path}")
+        return results
+
+    # Input paths are relative to the 'game' directory, which is the compiler's working directory
+    compiler_cwd = os.path.join(game_root, 'game')
+    relative_paths = {path: os.path.relpath(path, start=compiler_cwd).replace("\\", "/") for path in file_paths}
+
+    fd, filelist_path = tempfile.mkstemp(prefix='resourcecompiler_', suffix='.txt')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(relative_paths.values()) + '\n')
+
+        log(f"Compiling {len(file_paths)} file{'s' if len(file_paths) != 1 else ''}...")
+        started_at = time.time()
+        # -f: rewrite every output, so an output older than this run is a failure (skipping is the manifest's job)
+        result = subprocess.run(
+            [compiler_path, '-f', '-filelist', filelist_path],
+            cwd=compiler_cwd,
+            capture_output=True,
+            text=True,
+            errors='replace',
+            creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+        )
+    except FileNotFoundError:
+        log(f"✗ Error: resourcecompiler.exe not found at {compiler_path}")
+        return results
+    except Exception as e:
+        log(f"✗ Unexpected error during compilation: {e}")
+        return results
+    finally:
+        try:
+            os.remove(filelist_path)
+        except OSError:
+            pass
+
+    output = (result.stdout or '') + '\n' + (result.stderr or '')
+    failed = find_failed_files(output, {path: get_reported_names(game_root, path) for path in file_paths})
+
+    for path in file_paths:
+        if path in failed:
+            continue
+        compiled_path = get_compiled_path(game_root, path)
+        if os.path.exists(compiled_path):
+            # Must have been written by this run, copies keep their old mtime (shutil.copy2)
+            results[path] = os.path.getmtime(compiled_path) >= started_at - MTIME_SLACK
+        else:
+            # Some outputs get a hashed name (e.g. textures of a material), trust the exit code for those
+            results[path] = result.returncode == 0
+
+    for path in file_paths:
+        name = os.path.basename(path)
+        if results[path]:
+            log(f"✓ Compilation successful for {name}")
+        elif path in failed:
+            log(f"✗ Compilation failed for {name}: {failed[path]}")
+        else:
+            log(f"✗ Compilation failed for {name}")
+
+    if not all(results.values()) and len(failed) < list(results.values()).count(False):
+        # Failures the output did not name a file for, show every error line
+        for line in output.splitlines():
+            if is_failure_line(line):
+                log(f"Compiler: {line.strip()}")
+    return results
@@ -0,0 +1,306 @@
+"""
+Decoded sound caches for the CS2 Sounds Manager
+Keeps decompiled internal sounds and ffmpeg conversions on disk so they are only produced once
+"""
+
+import hashlib
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+import threading
+
+# Default size budget for decoded previews (least recently used entries are evicted first)
+DEFAULT_PREVIEW_CACHE_BYTES = 512 * 1024 * 1024
+DEFAULT_TRANSCODE_CACHE_BYTES = 1024 * 1024 * 1024
+STREAM_READ_BYTES = 128 * 1024  # Bytes read per ffmpeg pipe read when a conversion is streamed (~0.75s of 44.1kHz stereo)
+
+
+class PreviewCache:
+    """Content-addressed cache of decompiled internal sounds.
+
+    Every entry is a folder named after a hash of the VPK entry path and its CRC32
+    from the VPK directory tree, holding the decoded file under its original name.
+    A CS2 update that changes a sound changes its CRC and therefore its entry.
+    Entries are touched on every hit and evicted least recently used first once the
+    cache grows over its size budget.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_PREVIEW_CACHE_BYTES):
+        self.cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), '.CS2KZ-mapping-tools', 'Sounds', 'preview')
+        self.max_bytes = max_bytes
+        self.evict_lock = threading.Lock()  # Folder warms, previews and conversions evict from several threads
+
+    @staticmethod
+    def make_key(vpk_entry_path, crc):
+        """Cache key for a VPK entry path plus its CRC32"""
+        crc_text = f"{crc:08x}" if crc is not None else "nocrc"
+        return hashlib.sha1(f"{vpk_entry_path.lower()}|{crc_text}".encode('utf-8')).hexdigest()[:20]
+
+    def get_entry_dir(self, vpk_entry_path, crc):
+        """Folder the decoded file for this entry lives in"""
+        return os.path.join(self.cache_dir, self.make_key(vpk_entry_path, crc))
+
+    def lookup(self, vpk_entry_path, crc):
+        """Return the cached decoded file for an entry (marking it as recently used), or None"""
+        entry_dir = self.get_entry_dir(vpk_entry_path, crc)
+        try:
+            for name in os.listdir(entry_dir):
+                file_path = os.path.join(entry_dir, name)
+                # Only files with an extension are complete (the decompiler writes then renames)
+                if os.path.isfile(file_path) and os.path.splitext(name)[1]:
+                    self.touch(entry_dir)
+                    return file_path
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Warning: Could not read preview cache entry: {e}")
+        return None
+
+    def make_temp_dir(self):
+        """Private folder to decode into, next to the cache so lookup and evict never see a half written file"""
+        parent = os.path.dirname(self.cache_dir)
+        os.makedirs(parent, exist_ok=True)
+        return tempfile.mkdtemp(prefix='decode-', dir=parent)
+
+    def add_file(self, entry_dir, temp_file, name):
+        """Move a finished decode into its entry folder and return its path (a decode that finished first is kept)"""
+        os.makedirs(entry_dir, exist_ok=True)
+        file_path = os.path.join(entry_dir, name)
+        try:
+            os.replace(temp_file, file_path)
+        except OSError:
+            # Windows refuses to replace a file that is being played
+            if not os.path.isfile(file_path):
+                raise
+        return file_path
+
+    def touch(self, entry_path):
+        """Mark an entry as recently used"""
+        try:
+            os.utime(entry_path, None)
+        except OSError:
+            pass
+
+    def get_entry_size(self, entry_path):
+        """Size of an entry folder (or a loose file left by older versions)"""
+        if os.path.isfile(entry_path):
+            return os.path.getsize(entry_path)
+        total = 0
+        for root, _, files in os.walk(entry_path):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
+
+    def evict(self, keep=None):
+        """Delete least recently used entries until the cache fits its size budget.
+
+        keep: entry folder that must survive (e.g. the sound that is about to play)
+        """
+        with self.evict_lock:
+            self.evict_locked(keep)
+
+    def evict_locked(self, keep):
+        try:
+            if not os.path.exists(self.cache_dir):
+                return
+
+            entries = []
+            total = 0
+            for name in os.listdir(self.cache_dir):
+                entry_path = os.path.join(self.cache_dir, name)
+                try:
+                    size = self.get_entry_size(entry_path)
+                    mtime = os.path.getmtime(entry_path)
+                except OSError:
+                    continue
+                entries.append((mtime, entry_path, size))
+                total += size
+
+            if total <= self.max_bytes:
+                return
+
+            # Oldest first
+            entries.sort()
+            for _, entry_path, size in entries:
+                if total <= self.max_bytes:
+                    break
+                if keep and os.path.normcase(entry_path) == os.path.normcase(keep):
+                    continue
+                try:
+                    if os.path.isdir(entry_path):
+                        shutil.rmtree(entry_path)
+                    else:
+                        os.remove(entry_path)
+                    total -= size
+                    print(f"🗑 Evicted preview cache entry: {os.path.basename(entry_path)} ({size / (1024 * 1024):.1f}MB)")
+                except Exception as e:
+                    print(f"Warning: Could not delete cache entry {entry_path}: {e}")
+        except Exception as e:
+            print(f"Warning: Cache cleanup failed: {e}")
+
+
+class TranscodeCache(PreviewCache):
+    """ffmpeg conversions keyed by a hash of the source content plus the conversion parameters.
+
+    Playback and export both ask for the same WAV of an MP3; with this cache ffmpeg
+    runs once per source and parameter set, across sessions. Entries are single
+    files evicted least recently used first, like the preview cache.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_TRANSCODE_CACHE_BYTES):
+        super().__init__(cache_dir or os.path.join(tempfile.gettempdir(), '.CS2KZ-mapping-tools', 'Sounds', 'transcode'), max_bytes)
+        self.source_hashes = {}  # (path, size, mtime_ns) -> content hash, skips re-hashing unchanged files
+        self.key_locks = {}  # Output key -> lock held while it converts, later callers wait for that result
+        self.key_locks_guard = threading.Lock()
+
+    def get_source_hash(self, source_path):
+        """SHA1 of a source file's content (memoized while the file is unchanged)"""
+        stat = os.stat(source_path)
+        memo_key = (os.path.normcase(os.path.abspath(source_path)), stat.st_size, stat.st_mtime_ns)
+        content_hash = self.source_hashes.get(memo_key)
+        if content_hash is None:
+            sha1 = hashlib.sha1()
+            with open(source_path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    sha1.update(block)
+            content_hash = sha1.hexdigest()
+            self.source_hashes[memo_key] = content_hash
+        return content_hash
+
+    def get_wav(self, ffmpeg_path, source_path, sample_rate=44100, on_chunk=None):
+        """Return a cached 16-bit PCM WAV of source_path at sample_rate, converting it with ffmpeg on a miss
+
+        on_chunk: called with (s16le bytes, channels) as ffmpeg produces them when this call
+                  converts (a live waveform), not on a hit
+        """
+        params = f"wav|pcm_s16le|{sample_rate}"
+        key = hashlib.sha1(f"{self.get_source_hash(source_path)}|{params}".encode('utf-8')).hexdigest()[:20]
+        output_path = os.path.join(self.cache_dir, key + '.wav')
+        if os.path.isfile(output_path):
+            self.touch(output_path)
+            return output_path
+
+        # Playback and the waveform ask for the same WAV at once, only the first one runs ffmpeg
+        with self.key_locks_guard:
+            key_lock = self.key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if os.path.isfile(output_path):
+                self.touch(output_path)
+                return output_path
+            return self.convert(ffmpeg_path, source_path, sample_rate, key, output_path, on_chunk)
+
+    def convert(self, ffmpeg_path, source_path, sample_rate, key, output_path, on_chunk=None):
+        """Run ffmpeg into a unique temp file and move it to output_path"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Unique temp name so parallel conversions of the same source never collide
+        temp_path = os.path.join(self.cache_dir, f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        if on_chunk is not None:
+            try:
+                self.convert_streamed(ffmpeg_path, source_path, sample_rate, temp_path, on_chunk)
+            except Exception:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+                raise
+            os.replace(temp_path, output_path)
+            self.evict(keep=output_path)
+            return output_path
+
+        ffmpeg_cmd = [
+            ffmpeg_path,
+            '-v', 'error',
+            '-i', source_path,
+            '-acodec', 'pcm_s16le',
+            '-ar', str(sample_rate),
+            '-f', 'wav',
+            '-y',
+            temp_path
+        ]
+        result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True,
+                                creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0)
+        if result.returncode != 0 or not os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise RuntimeError(f"ffmpeg conversion failed: {result.stderr.strip()}")
+
+        os.replace(temp_path, output_path)
+        self.evict(keep=output_path)
+        return output_path
+
+    def convert_streamed(self, ffmpeg_path, source_path, sample_rate, temp_path, on_chunk):
+        """Let ffmpeg write the WAV to a pipe, saving it to temp_path and handing on the samples as they arrive"""
+        ffmpeg_cmd = [
+            ffmpeg_path,
+            '-v', 'error',
+            '-i', source_path,
+            '-acodec', 'pcm_s16le',
+            '-ar', str(sample_rate),
+            '-f', 'wav',
+            '-'
+        ]
+        process = subprocess.Popen(ffmpeg_cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                   creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0)
+        finished = False
+        try:
+            with open(temp_path, 'wb') as f:
+                channels, data_size_pos = self.copy_wav_header(process.stdout, f)
+                frame_bytes = channels * 2
+                data_size = 0
+                pending = b''
+                while True:
+                    data = process.stdout.read(STREAM_READ_BYTES)
+                    if not data:
+                        break
+                    f.write(data)
+                    data_size += len(data)
+                    data = pending + data
+                    usable = len(data) - len(data) % frame_bytes
+                    pending = data[usable:]
+                    if usable:
+                        on_chunk(data[:usable], channels)
+
+                # A pipe cannot be seeked, ffmpeg leaves the sizes open, fill them in
+                f.seek(4)
+                f.write(struct.pack('<I', min(f.seek(0, os.SEEK_END) - 8, 0xFFFFFFFF)))
+                f.seek(data_size_pos)
+                f.write(struct.pack('<I', min(data_size, 0xFFFFFFFF)))
+            finished = True
+        finally:
+            process.stdout.close()
+            if not finished:
+                process.kill()
+            process.wait()
+
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg conversion failed with code {process.returncode}")
+
+    @staticmethod
+    def copy_wav_header(stream, f):
+        """Copy the RIFF header up to the data chunk from stream to f. Returns (channels, offset of the data size field)"""
+        def read_exact(size):
+            data = stream.read(size)
+            if len(data) != size:
+                raise RuntimeError("ffmpeg ended before the WAV header")
+            f.write(data)
+            return data
+
+        if read_exact(12)[8:12] != b'WAVE':
+            raise RuntimeError("ffmpeg did not write a WAV stream")
+        channels = None
+        while True:
+            chunk_id, chunk_size = struct.unpack('<4sI', read_exact(8))
+            if chunk_id == b'data':
+                if not channels:
+                    raise RuntimeError("WAV stream has no fmt chunk")
+                return channels, f.tell() - 4
+            body = read_exact(chunk_size + chunk_size % 2)
+            if chunk_id == b'fmt ':
+                channels = struct.unpack_from('<H', body, 2)[0]
@@ -0,0 +1,118 @@
+"""
+encoding.txt model for the CS2 Sounds Manager
+Folder-wide compression settings plus per-file entries (loop points), merged instead of overwritten
+"""
+
+import hashlib
+import os
+
+import kv3
+
+# Keys of encoding.txt that apply to every sound in the folder
+SETTING_KEYS = ('compress', 'rate', 'normalize')
+
+AUDIO_EXTENSIONS = ('.wav', '.mp3')
+
+
+class EncodingDocument:
+    """The encoding.txt of a sounds folder.
+
+    Folder-wide settings are replaced with the current ones, while every sound
+    keeps its own entry in the 'files' array, so adding one looped sound never
+    drops the loop points of the others.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.header = kv3.DEFAULT_HEADER
+        self.document = {}
+
+    @classmethod
+    def load(cls, path):
+        """Read path (a missing file is an empty document). Raises kv3.KV3Error on broken files"""
+        encoding = cls(path)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            if text.strip():
+                document = kv3.loads(text)
+                if not isinstance(document, dict):
+                    raise kv3.KV3Error("encoding.txt root is not an object")
+                encoding.header = kv3.read_header(text)
+                encoding.document = document
+        return encoding
+
+    def save(self):
+        kv3.write_file(self.path, kv3.dumps(self.document, self.header, quote_root_keys=False))
+
+    def set_settings(self, settings):
+        """Replace the folder-wide settings (compress, rate, normalize) with settings"""
+        files = self.document.pop('files', None)
+        for key in SETTING_KEYS:
+            self.document.pop(key, None)
+        self.document.update(settings)
+        if files:
+            self.document['files'] = files
+
+    def get_files(self):
+        files = self.document.get('files')
+        return files if isinstance(files, list) else []
+
+    def find_file(self, file_name):
+        """Index of file_name's entry in 'files' (case-insensitive), or None"""
+        lowered = file_name.lower()
+        for i, entry in enumerate(self.get_files()):
+            if isinstance(entry, dict) and str(entry.get('fileName', '')).lower() == lowered:
+                return i
+        return None
+
+    def get_file(self, file_name):
+        index = self.find_file(file_name)
+        return None if index is None else self.get_files()[index]
+
+    def set_file_loop(self, file_name, loop):
+        """Set (or with None, remove) the loop block of one file, leaving every other entry as it is"""
+        index = self.find_file(file_name)
+        files = self.get_files()
+
+        if loop is None:
+            if index is not None:
+                entry = files[index]
+                entry.pop('loop', None)
+                if set(entry) <= {'fileName'}:
+                    del files[index]
+                if not files:
+                    self.document.pop('files', None)
+            return
+
+        if index is None:
+            files.append({'fileName': file_name, 'loop': loop})
+            self.document['files'] = files
+        else:
+            files[index]['loop'] = loop
+
+    def get_file_signature(self, file_name):
+        """KV3 text of everything that affects compiling file_name (for incremental builds)"""
+        settings = {key: value for key, value in self.document.items() if key != 'files'}
+        return kv3.dumps({'settings': settings, 'file': self.get_file(file_name) or {}}, header=None)
+
+
+def get_encoding_signature(content_path):
+    """encoding.txt inputs of compiling an audio file, for resource_compiler's extra_params ('' for other files)"""
+    if not content_path.lower().endswith(AUDIO_EXTENSIONS):
+        return ''
+    # Loop points and compression come from the folder's encoding.txt, only this file's entry counts
+    encoding_path = os.path.join(os.path.dirname(content_path), 'encoding.txt')
+    try:
+        return EncodingDocument.load(encoding_path).get_file_signature(os.path.basename(content_path))
+    except FileNotFoundError:
+        return ''
+    except (OSError, ValueError):
+        # Unreadable, not UTF-8 or not KV3: fall back to the raw bytes so any edit still counts
+        digest = hashlib.sha1()
+        try:
+            with open(encoding_path, 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            pass
+        return 'raw:' + digest.hexdigest()
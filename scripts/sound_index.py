@@ -0,0 +1,267 @@
+"""
+Internal sound index for the CS2 Sounds Manager
+Caches the sound entries of pak01_dir.vpk on disk so the browser opens instantly
+"""
+
+import json
+import os
+import tempfile
+from array import array
+from bisect import bisect_left
+
+# Try to import optional modules
+try:
+    import vpk
+except ImportError:
+    vpk = None
+
+# Bump when the on-disk layout changes so old index files get rebuilt
+INDEX_VERSION = 2
+
+# Entries kept in the directory file itself rather than a numbered chunk
+VPK_DIR_ARCHIVE_INDEX = 0x7fff
+
+
+class InternalSoundIndex:
+    """Sound paths (and their VPK CRCs) from pak01_dir.vpk, persisted between runs.
+
+    The index file is keyed by the size and mtime of the VPK directory file, so a
+    CS2 update invalidates it and everything else loads straight from JSON.
+    """
+
+    def __init__(self, vpk_path):
+        self.vpk_path = vpk_path
+        self.index_path = os.path.join(tempfile.gettempdir(), '.CS2KZ-mapping-tools', 'Sounds', 'internal_sounds_index.json')
+        self.sounds = []  # Sorted display paths ("ambient/wind_01", without "sounds/" and ".vsnd_c")
+        self.crcs = {}  # Display path -> CRC32 of the .vsnd_c entry in the VPK directory tree
+        self.locations = {}  # Display path -> [archive_index, archive_offset, file_length] for direct chunk reads
+        self.vpk_size = 0
+        self.vpk_mtime = 0
+
+    def get_vpk_signature(self):
+        """Return (size, mtime_ns) of the VPK directory file"""
+        stat = os.stat(self.vpk_path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def is_current(self):
+        """Check if the loaded index still matches the VPK on disk"""
+        try:
+            return (self.vpk_size, self.vpk_mtime) == self.get_vpk_signature()
+        except OSError:
+            return False
+
+    def load(self):
+        """Load the index from disk. Returns True if a usable (possibly stale) index was read"""
+        try:
+            if not os.path.exists(self.index_path):
+                return False
+
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            if data.get('version') != INDEX_VERSION:
+                return False
+
+            self.vpk_size = data['vpk_size']
+            self.vpk_mtime = data['vpk_mtime']
+            self.crcs = data['crcs']
+            self.locations = data['locations']
+            self.sounds = sorted(self.crcs)
+            return True
+        except Exception as e:
+            print(f"Warning: Could not read internal sound index: {e}")
+            return False
+
+    def build(self):
+        """Walk the VPK directory tree and collect every sound entry (slow, run in a thread)"""
+        if vpk is None:
+            raise RuntimeError("vpk module not available. Install with: pip install python-vpk")
+
+        # Take the signature before reading so a mid-read update is detected next time
+        vpk_size, vpk_mtime = self.get_vpk_signature()
+        pak = vpk.open(self.vpk_path)
+
+        crcs = {}
+        locations = {}
+        for filepath in pak:
+            # Look for vsnd_c files (compiled sounds) in the sounds folder
+            if filepath.endswith('.vsnd_c') and 'sounds' in filepath.lower():
+                sound_path = self.to_sound_path(filepath)
+                meta = pak.get_file_meta(filepath)
+                crcs[sound_path] = meta['crc32']
+                # Only plain chunk entries can be read without python-vpk (no preload bytes)
+                if meta['preload_length'] == 0 and meta['archive_index'] != VPK_DIR_ARCHIVE_INDEX:
+                    locations[sound_path] = [meta['archive_index'], meta['archive_offset'], meta['file_length']]
+
+        self.vpk_size = vpk_size
+        self.vpk_mtime = vpk_mtime
+        self.crcs = crcs
+        self.locations = locations
+        self.sounds = sorted(crcs)
+
+    def save(self):
+        """Write the index to disk (temp file + rename so a crash never leaves a torn index)"""
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            data = {
+                'version': INDEX_VERSION,
+                'vpk_size': self.vpk_size,
+                'vpk_mtime': self.vpk_mtime,
+                'crcs': self.crcs,
+                'locations': self.locations,
+            }
+            temp_path = self.index_path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(temp_path, self.index_path)
+            return True
+        except Exception as e:
+            print(f"Warning: Could not save internal sound index: {e}")
+            return False
+
+    @staticmethod
+    def to_sound_path(vpk_entry_path):
+        """Convert a VPK entry ("sounds/ambient/wind_01.vsnd_c") to a display path ("ambient/wind_01")"""
+        # Remove .vsnd_c extension for display
+        sound_path = vpk_entry_path.replace('.vsnd_c', '')
+        # Strip "sounds/" prefix to avoid redundant root folder in tree
+        if sound_path.lower().startswith('sounds/'):
+            sound_path = sound_path[7:]  # Remove "sounds/" (7 characters)
+        return sound_path
+
+    @staticmethod
+    def to_vpk_path(sound_path):
+        """Convert a display path back to its VPK entry path"""
+        # The sound is stored without "sounds/" prefix, add it back for VPK lookup
+        # Keep forward slashes for VPK (it uses forward slashes internally)
+        return ('sounds/' + sound_path + '.vsnd_c').replace('\\', '/')
+
+
+class SoundSearchIndex:
+    """Trigram index over the internal sound paths for fast substring search.
+
+    Paths are lowercased once; each trigram maps to the (ascending) indices of the
+    paths containing it. A query intersects the posting lists of its trigrams and
+    only verifies the few surviving candidates, instead of scanning every path.
+    """
+
+    def __init__(self, sounds):
+        self.sounds = sounds  # Sorted display paths, results keep this order
+        self.lowered = [sound.lower() for sound in sounds]
+        self.trigrams = {}
+        self.last_result = ("", None)  # (query, indices), swapped as one so threads never see a torn pair
+
+        trigrams = self.trigrams
+        for i, path in enumerate(self.lowered):
+            for gram in {path[j:j + 3] for j in range(len(path) - 2)}:
+                postings = trigrams.get(gram)
+                if postings is None:
+                    postings = trigrams[gram] = array('I')
+                postings.append(i)
+
+    def search(self, query):
+        """Return the sound paths containing query (case-insensitive), in sorted order"""
+        query = query.lower()
+        if not query:
+            return self.sounds
+
+        last_query, last_indices = self.last_result
+        if len(query) >= 3:
+            candidates = self._trigram_candidates(query)
+        elif last_indices is not None and last_query and last_query in query:
+            # Typing one more character only narrows the previous result, reuse it
+            candidates = last_indices
+        else:
+            # Too short for a trigram lookup, fall back to the pre-lowercased paths
+            candidates = range(len(self.lowered))
+
+        lowered = self.lowered
+        indices = [i for i in candidates if query in lowered[i]]
+
+        self.last_result = (query, indices)
+        return [self.sounds[i] for i in indices]
+
+    def _trigram_candidates(self, query):
+        """Indices of paths that contain every trigram of query (ascending)"""
+        postings = []
+        for gram in {query[j:j + 3] for j in range(len(query) - 2)}:
+            gram_postings = self.trigrams.get(gram)
+            if gram_postings is None:
+                return []
+            postings.append(gram_postings)
+
+        # Intersect starting from the rarest trigram to keep the set small
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for gram_postings in postings[1:]:
+            candidates.intersection_update(gram_postings)
+            if not candidates:
+                return []
+        return sorted(candidates)
+
+
+def build_sound_tree(sounds):
+    """Build the folder hierarchy for the sound browser.
+
+    Every node is a dict of folder name -> child node, plus a sorted '__files__'
+    list with the full sound paths of the files directly inside it.
+    """
+    tree = {}
+    for sound in sounds:
+        parts = sound.split('/')
+        current = tree
+        for part in parts[:-1]:  # All but the last (filename)
+            child = current.get(part)
+            if child is None:
+                child = current[part] = {}
+            current = child
+        # Add filename
+        files = current.get('__files__')
+        if files is None:
+            files = current['__files__'] = []
+        files.append(sound)
+
+    def sort_files(node):
+        for name, child in node.items():
+            if name == '__files__':
+                child.sort()
+            else:
+                sort_files(child)
+
+    sort_files(tree)
+    return tree
+
+
+def get_folder_sounds(sounds, folder):
+    """All sound paths inside folder (recursively), taken from the sorted sound list"""
+    prefix = folder.rstrip('/') + '/'
+    start = bisect_left(sounds, prefix)
+    end = start
+    while end < len(sounds) and sounds[end].startswith(prefix):
+        end += 1
+    return sounds[start:end]
+
+
+def flatten_sound_tree(tree, expanded_folders):
+    """Flatten the visible part of a sound tree into rows for clipped rendering.
+
+    Returns a list of (depth, is_folder, name, path) tuples in display order:
+    folders first (sorted), then files. Children are only listed for folders whose
+    path is in expanded_folders.
+    """
+    rows = []
+
+    def add_rows(node, path, depth):
+        # Folders first
+        for folder_name in sorted(k for k in node if k != '__files__'):
+            folder_path = f"{path}/{folder_name}" if path else folder_name
+            rows.append((depth, True, folder_name, folder_path))
+            if folder_path in expanded_folders:
+                add_rows(node[folder_name], folder_path, depth + 1)
+
+        # Files in this folder
+        for sound in node.get('__files__', ()):
+            rows.append((depth, False, sound.rsplit('/', 1)[-1], sound))
+
+    add_rows(tree, "", 0)
+    return rows
@@ -0,0 +1,116 @@
+"""
+Soundevents table for the CS2 Sounds Manager
+Keeps soundevents_addon.vsndevts parsed in memory and writes it back atomically
+"""
+
+import os
+import threading
+
+import kv3
+
+# Parsed tables by file path, reused while the file on disk is unchanged
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+class SoundEventTable:
+    """The events of a .vsndevts file as an ordered name -> event dict.
+
+    Events are edited by name (upsert, delete, bulk import). Saving splices only
+    the edited events into the original text: untouched events keep their comments
+    and number formatting, while an edited event is written fresh by the KV3 writer
+    (comments inside that event are lost), so nested arrays and objects can never
+    be cut apart by a text edit.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.header = kv3.DEFAULT_HEADER
+        self.events = {}
+        self.signature = None  # (size, mtime_ns) of the file when it was last read or written
+        self.text = None  # File text the spans point into (None: no file yet, saving writes it whole)
+        self.spans = {}  # Event name -> (start, end) of its text
+        self.root_end = None
+        self.changed = set()  # Events edited since the last save
+        self.lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path):
+        """Table for path, parsed again only when the file changed since the last read/write"""
+        key = os.path.normcase(os.path.abspath(path))
+        with _tables_lock:
+            table = _tables.get(key)
+            if table is None:
+                table = _tables[key] = cls(path)
+        with table.lock:
+            if table.signature != table.get_signature():
+                table.load()
+        return table
+
+    def get_signature(self):
+        try:
+            stat = os.stat(self.path)
+            return stat.st_size, stat.st_mtime_ns
+        except OSError:
+            return None
+
+    def load(self):
+        """Read the file (a missing file is an empty table). Raises kv3.KV3Error on broken files"""
+        self.header = kv3.DEFAULT_HEADER
+        self.events = {}
+        self.text = None
+        self.changed = set()
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            if text.strip():
+                self.set_text(text)
+                self.header = kv3.read_header(text)
+        self.signature = self.get_signature()
+
+    def set_text(self, text):
+        """Parse text as the current file contents"""
+        document, spans, root_end = kv3.loads_with_spans(text)
+        if not isinstance(document, dict):
+            raise kv3.KV3Error("Soundevents root is not an object")
+        self.events = document
+        self.text = text
+        self.spans = spans
+        self.root_end = root_end
+
+    def save(self):
+        if self.text is None:
+            text = kv3.dumps(self.events, self.header)
+        else:
+            text = kv3.splice_root(self.text, self.spans, self.root_end, self.events, self.changed)
+        kv3.write_file(self.path, text)
+        # Spans of the new text (events stay the same objects in memory)
+        events = self.events
+        self.set_text(text)
+        self.events = events
+        self.changed = set()
+        self.signature = self.get_signature()
+
+    def upsert(self, name, event):
+        """Add or replace one event (a replaced event keeps its position)"""
+        with self.lock:
+            self.events[name] = event
+            self.changed.add(name)
+            self.save()
+
+    def delete(self, name):
+        """Remove an event. Returns False if there was none with that name"""
+        with self.lock:
+            if name not in self.events:
+                return False
+            del self.events[name]
+            self.save()
+            return True
+
+    def import_events(self, events):
+        """Add or replace many (name, event) pairs with a single write"""
+        with self.lock:
+            for name, event in events:
+                self.events[name] = event
+                self.changed.add(name)
+            self.save()
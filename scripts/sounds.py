@@ -10,7 +10,6 @@ import OpenGL.GL as gl
 import sys
 import subprocess
 import os
-import re
 import shutil
 import tempfile
 import winreg
@@ -19,6 +18,8 @@ from tkinter import filedialog
 import tkinter as tk
 from PIL import Image
 import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import urllib.request
 import zipfile
 import io
@@ -36,6 +37,29 @@ except ImportError:
     print("Warning: pygame module not available. Install with: pip install pygame")
     pygame = None
 
+from sound_cache import PreviewCache, TranscodeCache
+from sound_index import InternalSoundIndex, SoundSearchIndex, build_sound_tree, flatten_sound_tree, get_folder_sounds
+from vsnd_reader import extract_vsnd
+from resource_compiler import compile_files
+from soundevent_table import SoundEventTable
+from kv3 import KV3Error
+from sound_encoding import EncodingDocument, get_encoding_signature
+from job_queue import JobQueue
+
+# NumPy powered WAV analysis (falls back to the struct based reader without it)
+try:
+    from audio_analysis import PeakAccumulator, analyze_wav, samples_to_float, WAVE_FORMAT_PCM
+except ImportError:
+    print("Warning: numpy not available, using slow WAV analysis. Install with: pip install numpy")
+    analyze_wav = None
+    PeakAccumulator = None
+
+# In-process preview player (needs numpy + pygame)
+try:
+    from preview_player import PreviewPlayer
+except ImportError:
+    PreviewPlayer = None
+
 # Try to import VSND decompiler
 try:
     from vsnd_decompiler import VSNDDecompiler
@@ -46,6 +70,57 @@ except Exception as e:
 
 # Constants
 CUSTOM_TITLE_BAR_HEIGHT = 30
+MAX_AUDIO_ANALYSIS_ENTRIES = 512  # Decoded files whose duration/waveform stay in memory
+WARM_FOLDER_WORKERS = min(4, os.cpu_count() or 1)  # Parallel decodes when warming a folder
+COMPILE_WORKERS = min(4, os.cpu_count() or 1)  # Parallel resourcecompiler processes for batch adds (one filelist each)
+WAVEFORM_DECODE_RATE = 44100  # Sample rate of the PCM MP3 waveforms are built from (the player/transcode rate)
+WAVEFORM_PUBLISH_INTERVAL = 0.1  # Seconds between live timeline updates while an MP3 decodes
+
+# Everything an add job reads from the UI, copied when the job is queued (later UI edits do not change it)
+SoundAddSettings = namedtuple('SoundAddSettings', [
+    'cs2_basefolder',
+    'addon_name',
+    'use_internal_sound',
+    'sound_file_path',
+    'selected_internal_sound',
+    'cached_internal_sound_path',
+    'output_name',
+    'sound_name',
+    'use_wav_markers',
+    'audio_duration_ms',
+    'encoding_format',
+    'encoding_minbitrate',
+    'encoding_maxbitrate',
+    'encoding_vbr',
+    'encoding_sample_rate',
+    'encoding_normalize',
+    'encoding_normalize_level',
+    'encoding_normalize_compression',
+    'encoding_normalize_limiter',
+    'encoding_loop_enabled',
+    'encoding_loop_start_ms',
+    'encoding_loop_end_ms',
+    'encoding_crossfade_ms',
+    'sound_type',
+    'volume',
+    'pitch',
+    'distance_near',
+    'distance_near_volume',
+    'curve_near_mid_cp1',
+    'curve_near_mid_cp2',
+    'curve_near_mid_cp3',
+    'curve_near_mid_cp4',
+    'distance_mid',
+    'distance_mid_volume',
+    'curve_mid_far_cp1',
+    'curve_mid_far_cp2',
+    'curve_mid_far_cp3',
+    'curve_mid_far_cp4',
+    'distance_far',
+    'distance_far_volume',
+    'show_occlusion',
+    'occlusion_intensity',
+])
 
 
 def resource_path(relative_path):
@@ -72,6 +147,13 @@ except ImportError:
             pass
         def get_current_theme(self):
             return {'bg': '#1e1e1e', 'fg': '#ffffff', 'button_bg': '#2d2d2d', 'button_hover': '#3d3d3d'}
+        def get_setting(self, key, default=None):
+            return default
+
+try:
+    from frame_pacer import FramePacer, DEFAULT_MAX_FPS
+except ImportError:
+    FramePacer = None
 
 
 class SoundsManagerApp:
@@ -82,6 +164,11 @@ class SoundsManagerApp:
         # Theme manager
         self.theme_manager = ThemeManager()
         
+        # Sleeps between frames while nothing moves (FPS cap from the main app's settings)
+        self.frame_pacer = FramePacer() if FramePacer else None
+        if self.frame_pacer:
+            self.frame_pacer.set_max_fps(self.theme_manager.get_setting('imgui_max_fps', DEFAULT_MAX_FPS))
+        
         # Application state
         self.cs2_basefolder = None
         self.addon_name = ""
@@ -98,12 +185,25 @@ class SoundsManagerApp:
         # Internal sound browser
         self.internal_sounds = []  # List of internal sound paths from VPK
         self.internal_sounds_tree = {}  # Hierarchical structure for tree display
+        self.internal_sound_index = None  # InternalSoundIndex backing the list (persisted between runs)
+        self.internal_sound_search = None  # SoundSearchIndex for the filter box (built once per load)
         self.internal_sounds_loaded = False
         self.loading_internal_sounds = False
         self.selected_internal_sound = ""
         self.internal_sound_filter = ""
         self.filtered_internal_sounds = []
+        self.filtered_internal_sounds_tree = {}  # Tree of the current filter result (the full tree when unfiltered)
+        self.expanded_sound_folders = set()  # Folder paths opened in the sound browser
+        self.internal_sound_rows = None  # Flattened visible rows, rebuilt when the tree or expansion changes
         self.cached_internal_sound_path = ""  # Path to cached/decompiled internal sound WAV
+        self.preview_cache = PreviewCache()  # Decoded internal sounds keyed by VPK path + CRC (LRU by size)
+        self.transcode_cache = TranscodeCache()  # ffmpeg WAV conversions keyed by source hash + params
+        self.audio_analysis_cache = {}  # Decoded file path -> (duration_ms, waveform, peaks, summary)
+        self.warming_folders = set()  # Sound browser folders currently being pre-decoded
+        # Add/compile work runs here instead of in the button handlers; one job at a time since
+        # jobs edit the same addon files (soundevents, encoding.txt), compiles inside a job run in parallel
+        self.jobs = JobQueue(workers=1, on_event=FramePacer.wake if FramePacer else None)
+        self.job_status = ""  # Bottom bar text for the running/queued jobs
         
         # Audio preview (pygame mixer)
         self.preview_sound = None
@@ -116,6 +216,7 @@ class SoundsManagerApp:
             except Exception as e:
                 print(f"Warning: pygame mixer initialization failed: {e}")
                 pygame = None
+        self.preview_player = PreviewPlayer() if PreviewPlayer else None  # Exact loops without mixer restarts
         
         # VSND decompiler for internal sound preview
         self.vsnd_decompiler = None
@@ -168,6 +269,10 @@ class SoundsManagerApp:
         # Audio timeline and loop points
         self.audio_duration_ms = 0  # Duration of loaded audio in milliseconds
         self.audio_waveform = []  # Simplified waveform data for visualization
+        self.audio_peaks = None  # PeakPyramid (min/max at several zoom levels) when the samples were read
+        self.audio_waveform_failed = False  # Analysis or waveform decode failed, the timeline shows a placeholder
+        self.analyzed_audio_path = ""  # File the timeline currently shows (streamed peaks only land for it)
+        self.waveform_streams = set()  # Files whose waveform is being decoded in the background
         self.playback_position_ms = 0  # Current playback position
         self.playback_start_time = 0  # Time when playback started
         self.timeline_width = 550  # Width of timeline visualization (wider)
@@ -245,10 +350,8 @@ class SoundsManagerApp:
             except Exception as e:
                 print(f"⚠ ffmpeg PATH configuration warning: {e}")
         
-        # Clean up old preview cache on startup
-        cache_dir = os.path.join(tempfile.gettempdir(), '.CS2KZ-mapping-tools', 'Sounds', 'preview')
-        if os.path.exists(cache_dir):
-            self.cleanup_preview_cache(cache_dir, max_files=5)
+        # Trim the decoded preview cache to its size budget on startup
+        self.preview_cache.evict()
         
         # Window dimensions - will be adjusted dynamically based on content
         self.window_width = 900  # Adjusted for narrower left panel
@@ -323,46 +426,42 @@ class SoundsManagerApp:
             return []
     
     def load_internal_sounds(self):
-        """Load internal CS2 sounds from VPK in background thread"""
+        """Load internal CS2 sounds from the on-disk index, rebuilding it from the VPK in background if stale"""
         if not self.cs2_basefolder:
             self.log("✗ CS2 path not detected")
             return
         
-        self.loading_internal_sounds = True
-        self.log("Loading internal CS2 sounds from VPK...")
+        pak_path = os.path.join(self.cs2_basefolder, 'game', 'csgo', 'pak01_dir.vpk')
+        if not os.path.exists(pak_path):
+            self.log(f"✗ VPK not found at: {pak_path}")
+            return
+        
+        index = InternalSoundIndex(pak_path)
+        self.internal_sound_index = index
+        
+        # Warm start: the cached index loads in milliseconds
+        if index.load():
+            self.apply_internal_sound_index(index)
+            if index.is_current():
+                self.log(f"✓ Loaded {len(index.sounds)} internal sounds (cached index)")
+                return
+            self.log("⏳ CS2 VPK changed, rebuilding sound index in background...")
+        else:
+            self.log("Loading internal CS2 sounds from VPK...")
+        
+        self.loading_internal_sounds = not self.internal_sounds_loaded
         
         def load_thread():
             try:
-                pak_path = os.path.join(self.cs2_basefolder, 'game', 'csgo', 'pak01_dir.vpk')
-                if not os.path.exists(pak_path):
-                    self.log(f"✗ VPK not found at: {pak_path}")
-                    self.loading_internal_sounds = False
-                    return
-                
-                # Open VPK
-                pak = vpk.open(pak_path)
-                
-                # Extract all sound paths
-                sounds = []
-                vsnd_count = 0
-                for filepath in pak:
-                    # Look for vsnd_c files (compiled sounds)
-                    if filepath.endswith('.vsnd_c'):
-                        vsnd_count += 1
-                        # Check if it's in sounds folder (use backslash for Windows paths)
-                        if 'sounds' in filepath.lower():
-                            # Remove .vsnd_c extension for display
-                            sound_path = filepath.replace('.vsnd_c', '')
-                            # Strip "sounds/" prefix to avoid redundant root folder in tree
-                            if sound_path.lower().startswith('sounds/'):
-                                sound_path = sound_path[7:]  # Remove "sounds/" (7 characters)
-                            sounds.append(sound_path)
-                
-                self.internal_sounds = sorted(sounds)
-                self.filtered_internal_sounds = self.internal_sounds
-                self.internal_sounds_loaded = True
+                # Build into a fresh index so the cached list stays usable meanwhile
+                new_index = InternalSoundIndex(pak_path)
+                new_index.build()
+                new_index.save()
+                
+                self.internal_sound_index = new_index
+                self.apply_internal_sound_index(new_index)
                 self.loading_internal_sounds = False
-                self.log(f"✓ Loaded {len(sounds)} internal sounds")
+                self.log(f"✓ Loaded {len(new_index.sounds)} internal sounds")
                 
             except Exception as e:
                 self.log(f"✗ Error loading internal sounds: {e}")
@@ -371,65 +470,180 @@ class SoundsManagerApp:
         thread = threading.Thread(target=load_thread, daemon=True)
         thread.start()
     
+    def apply_internal_sound_index(self, index):
+        """Make the sounds of an index available to the browser and build its search index"""
+        self.internal_sounds_tree = build_sound_tree(index.sounds)
+        self.internal_sounds = index.sounds
+        self.internal_sound_search = None
+        self.filter_internal_sounds(self.internal_sound_filter)
+        self.internal_sounds_loaded = True
+        
+        def search_index_thread():
+            search = SoundSearchIndex(index.sounds)
+            # Ignore the result if a newer index was applied in the meantime
+            if self.internal_sounds is index.sounds:
+                self.internal_sound_search = search
+                if self.internal_sound_filter:
+                    self.filter_internal_sounds(self.internal_sound_filter)
+        
+        thread = threading.Thread(target=search_index_thread, daemon=True)
+        thread.start()
+    
     def filter_internal_sounds(self, search_text):
         """Filter internal sounds based on search text"""
         if not search_text:
             self.filtered_internal_sounds = self.internal_sounds
+            self.filtered_internal_sounds_tree = self.internal_sounds_tree
         else:
-            search_lower = search_text.lower()
-            self.filtered_internal_sounds = [
-                sound for sound in self.internal_sounds
-                if search_lower in sound.lower()
-            ]
+            if self.internal_sound_search:
+                self.filtered_internal_sounds = self.internal_sound_search.search(search_text)
+            else:
+                # Search index still building, scan the list once
+                search_lower = search_text.lower()
+                self.filtered_internal_sounds = [
+                    sound for sound in self.internal_sounds
+                    if search_lower in sound.lower()
+                ]
+            self.filtered_internal_sounds_tree = build_sound_tree(self.filtered_internal_sounds)
+        self.internal_sound_rows = None
+    
+    def get_internal_sound_rows(self):
+        """Visible rows of the sound browser, flattened once per tree/expansion change"""
+        rows = self.internal_sound_rows
+        if rows is None:
+            rows = flatten_sound_tree(self.filtered_internal_sounds_tree, self.expanded_sound_folders)
+            self.internal_sound_rows = rows
+        return rows
+    
+    def get_internal_sound_crc(self, sound):
+        """CRC32 of an internal sound's .vsnd_c entry from the VPK directory tree (None if unknown)"""
+        index = self.internal_sound_index
+        return index.crcs.get(sound) if index else None
     
-    def cleanup_preview_cache(self, cache_dir, max_files=5, make_room_for_new=False):
-        """Keep only the most recent N preview files in cache"""
+    def decode_internal_sound(self, sound):
+        """Return a decoded audio file for an internal sound, from the preview cache, the native reader or the decompiler"""
+        # The selected sound is stored without "sounds/" prefix, add it back for VPK lookup
+        internal_path = InternalSoundIndex.to_vpk_path(sound)
+        crc = self.get_internal_sound_crc(sound)
+        
+        # Recently heard sounds are served straight from the cache
+        cached_path = self.preview_cache.lookup(internal_path, crc)
+        if cached_path:
+            self.log(f"✓ Using cached decode of {sound}")
+            return cached_path
+        
+        vpk_path = os.path.join(self.cs2_basefolder, 'game', 'csgo', 'pak01_dir.vpk')
+        entry_dir = self.preview_cache.get_entry_dir(internal_path, crc)
+        
+        # Decode into a private folder (a folder warm and a preview of the same sound run at once), then move it in
+        temp_dir = self.preview_cache.make_temp_dir()
         try:
-            if not os.path.exists(cache_dir):
-                return
-                
-            # Get all files in cache directory (audio files with or without extensions)
-            cache_files = []
+            decoded_path = self.decode_internal_sound_to(sound, internal_path, vpk_path, os.path.join(temp_dir, os.path.basename(sound)), crc)
+            if not decoded_path:
+                return None
+            decoded_path = self.preview_cache.add_file(entry_dir, decoded_path, os.path.basename(decoded_path))
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        
+        # Keep the cache within its size budget (never evicting the sound we just decoded)
+        self.preview_cache.touch(entry_dir)
+        self.preview_cache.evict(keep=entry_dir)
+        return decoded_path
+    
+    def decode_internal_sound_to(self, sound, internal_path, vpk_path, output_path, crc):
+        """Decode an internal sound to output_path plus its extension with the native reader or the decompiler"""
+        # Most sounds are plain MP3/WAV inside the resource, read them without starting .NET
+        extracted_path = self.extract_internal_sound(sound, vpk_path, output_path, crc)
+        if extracted_path:
+            return extracted_path
+        
+        if not self.vsnd_decompiler:
+            return None
+        
+        self.log(f"⏳ Decompiling {sound}...")
+        
+        # Decompile from VPK
+        decompiled_path = self.vsnd_decompiler.decompile_vsnd(
+            vpk_path=vpk_path,
+            internal_sound_path=internal_path,
+            output_path=output_path
+        )
+        
+        if not decompiled_path or not os.path.exists(decompiled_path):
+            return None
+        
+        # Decompiler outputs MP3 files without extension
+        # Just rename to .mp3 and use as-is (conversion on-demand during loop playback)
+        if not os.path.splitext(decompiled_path)[1]:
+            mp3_path = decompiled_path + '.mp3'
+            os.replace(decompiled_path, mp3_path)
+            decompiled_path = mp3_path
+            self.log(f"    Renamed to .mp3")
+        return decompiled_path
+    
+    def extract_internal_sound(self, sound, vpk_path, output_path, crc):
+        """Extract an internal sound with the native reader. Returns None to fall back to the decompiler"""
+        index = self.internal_sound_index
+        location = index.locations.get(sound) if index else None
+        if not location:
+            return None
+        
+        try:
+            return extract_vsnd(vpk_path, location, output_path, crc)
+        except Exception as e:
+            self.log(f"ℹ Native reader could not extract {sound}: {e}")
+            return None
+    
+    def warm_sound_folder(self, folder):
+        """Decode and analyze every sound in a browser folder in the background so previews start instantly"""
+        if folder in self.warming_folders:
+            return
+        
+        sounds = get_folder_sounds(self.internal_sounds, folder)
+        if not sounds:
+            return
+        
+        self.warming_folders.add(folder)
+        self.log(f"⏳ Warming {len(sounds)} sounds in {folder}...")
+        
+        def warm_one(sound):
+            decoded_path = self.decode_internal_sound(sound)
+            if not decoded_path:
+                return False
+            if decoded_path not in self.audio_analysis_cache:
+                # Without ffmpeg MP3s are analyzed when selected, only the UI thread may use the mixer
+                analysis = self.compute_audio_analysis(decoded_path, use_mixer=False)
+                if analysis is not None:
+                    self.store_audio_analysis(decoded_path, analysis)
+            return True
+        
+        def warm_thread():
+            warmed = 0
+            failed = 0
             try:
-                for f in os.listdir(cache_dir):
-                    file_path = os.path.join(cache_dir, f)
-                    # Only include files (not directories)
-                    if os.path.isfile(file_path):
-                        cache_files.append(file_path)
-            except Exception as e:
-                print(f"Warning: Could not list cache directory: {e}")
-                return
-            
-            # Debug: show what we found
-            if cache_files:
-                print(f"🔍 Found {len(cache_files)} files in cache")
-            
-            # Determine how many files to keep
-            if make_room_for_new:
-                # Keep max_files - 1 to make room for incoming file
-                target_count = max_files - 1
-            else:
-                # Keep exactly max_files
-                target_count = max_files
-            
-            # If we have more than target, delete oldest
-            if len(cache_files) > target_count:
-                # Sort by modification time (oldest first)
-                cache_files.sort(key=lambda f: os.path.getmtime(f))
+                with ThreadPoolExecutor(max_workers=WARM_FOLDER_WORKERS) as pool:
+                    futures = [pool.submit(warm_one, sound) for sound in sounds]
+                    for future in as_completed(futures):
+                        try:
+                            if future.result():
+                                warmed += 1
+                            else:
+                                failed += 1
+                        except Exception as e:
+                            failed += 1
+                            print(f"Warning: Could not warm sound: {e}")
                 
-                # Delete oldest files
-                files_to_delete = len(cache_files) - target_count
-                for file_path in cache_files[:files_to_delete]:
-                    try:
-                        os.remove(file_path)
-                        print(f"🗑 Removed old cache: {os.path.basename(file_path)}")
-                    except Exception as e:
-                        print(f"Warning: Could not delete cache file {file_path}: {e}")
-        except Exception as e:
-            print(f"Warning: Cache cleanup failed: {e}")
+                if failed:
+                    self.log(f"✓ Warmed {warmed} sounds in {folder} ({failed} failed)")
+                else:
+                    self.log(f"✓ Warmed {warmed} sounds in {folder}")
+            finally:
+                self.warming_folders.discard(folder)
+        
+        threading.Thread(target=warm_thread, daemon=True).start()
     
     def preview_internal_sound(self):
-        """Extract and play internal CS2 sound using .NET Core decompiler"""
+        """Extract and play internal CS2 sound (cached decode or .NET Core decompiler)"""
         if not pygame:
             self.log("✗ pygame not available. Install with: pip install pygame")
             return
@@ -438,89 +652,119 @@ class SoundsManagerApp:
             self.log("✗ No sound selected for preview")
             return
         
-        # Try to use vsnd_decompiler with .NET Core
-        if self.vsnd_decompiler:
-            try:
-                # Build paths
-                vpk_path = os.path.join(self.cs2_basefolder, 'game', 'csgo', 'pak01_dir.vpk')
-                # The selected sound is stored without "sounds/" prefix, add it back for VPK lookup
-                internal_path = 'sounds/' + self.selected_internal_sound + '.vsnd_c'
-                # Keep forward slashes for VPK (it uses forward slashes internally)
-                internal_path = internal_path.replace('\\', '/')
-                
-                # Create cache directory
-                cache_dir = os.path.join(tempfile.gettempdir(), '.CS2KZ-mapping-tools', 'Sounds', 'preview')
-                os.makedirs(cache_dir, exist_ok=True)
-                
-                # Build output path (decompiler outputs files without extensions)
-                sound_name = os.path.basename(self.selected_internal_sound)
-                output_path = os.path.join(cache_dir, sound_name)
-                
-                # Clean up any old cache files (from previous runs with incorrect logic)
-                # We'll regenerate them with proper MP3→WAV conversion
-                for ext in ['.wav', '.mp3', '']:
-                    old_file = output_path + ext
-                    if os.path.exists(old_file):
-                        try:
-                            # Try to verify if it's a valid WAV by checking conversion timestamp
-                            # For now, just delete and regenerate to ensure consistency
-                            os.remove(old_file)
-                        except:
-                            pass
-                
-                # Clean up old cache files before adding new one (make room for the new file)
-                self.cleanup_preview_cache(cache_dir, max_files=5, make_room_for_new=True)
-                
-                self.log(f"⏳ Decompiling {self.selected_internal_sound}...")
-                
-                # Decompile from VPK
-                decompiled_path = self.vsnd_decompiler.decompile_vsnd(
-                    vpk_path=vpk_path,
-                    internal_sound_path=internal_path,
-                    output_path=output_path
-                )
+        try:
+            decompiled_path = self.decode_internal_sound(self.selected_internal_sound)
+            
+            if decompiled_path:
+                self.cached_internal_sound_path = decompiled_path
+                self.analyze_audio_file(decompiled_path)  # Analyze for waveform and loop
+                self.play_sound_file(decompiled_path)
+            elif not self.vsnd_decompiler:
+                # Fallback message if decompiler not available
+                self.log("ℹ Internal sound preview requires .NET Desktop Runtime 8.0")
+                self.log("  Download: https://dotnet.microsoft.com/download/dotnet/8.0")
+                self.log("  The sound will still work in-game when you click 'Add Sound'")
+                self.log(f"  Selected: {self.selected_internal_sound}")
+            else:
+                self.log("✗ Failed to decompile sound")
+                self.log("ℹ Internal sound preview requires .NET Desktop Runtime 8.0")
+                self.log("  Download: https://dotnet.microsoft.com/download/dotnet/8.0")
+                self.log("  Click 'Download x64' under '.NET Desktop Runtime 8.0'")
+                self.log("  The sound will still work in-game when you click 'Add Sound'")
                 
-                if decompiled_path and os.path.exists(decompiled_path):
-                    # Decompiler outputs MP3 files without extension
-                    # Just rename to .mp3 and use as-is (conversion on-demand during loop playback)
-                    if not os.path.splitext(decompiled_path)[1]:
-                        mp3_path = decompiled_path + '.mp3'
-                        os.rename(decompiled_path, mp3_path)
-                        decompiled_path = mp3_path
-                        self.log(f"    Renamed to .mp3")
-                    
-                    self.cached_internal_sound_path = decompiled_path
-                    self.analyze_audio_file(decompiled_path)  # Analyze for waveform and loop
-                    self.play_sound_file(decompiled_path)
-                else:
-                    self.log("✗ Failed to decompile sound")
-                    self.log("ℹ Internal sound preview requires .NET Desktop Runtime 8.0")
-                    self.log("  Download: https://dotnet.microsoft.com/download/dotnet/8.0")
-                    self.log("  Click 'Download x64' under '.NET Desktop Runtime 8.0'")
-                    self.log("  The sound will still work in-game when you click 'Add Sound'")
-                    
-            except Exception as e:
-                error_str = str(e)
-                if "MemoryMarshal" in error_str or "TypeLoadException" in error_str:
-                    self.log("✗ .NET 8 Desktop Runtime is required for internal sound preview")
-                    self.log("  Download: https://dotnet.microsoft.com/download/dotnet/8.0")
-                    self.log("  Click 'Download x64' under '.NET Desktop Runtime 8.0'")
-                    self.log("  The sound will still work in-game when you click 'Add Sound'")
-                else:
-                    self.log(f"✗ Error previewing sound: {e}")
-                    import traceback
-                    traceback.print_exc()
-        else:
-            # Fallback message if decompiler not available
-            self.log("ℹ Internal sound preview requires .NET Desktop Runtime 8.0")
-            self.log("  Download: https://dotnet.microsoft.com/download/dotnet/8.0")
-            self.log("  The sound will still work in-game when you click 'Add Sound'")
-            self.log(f"  Selected: {self.selected_internal_sound}")
+        except Exception as e:
+            error_str = str(e)
+            if "MemoryMarshal" in error_str or "TypeLoadException" in error_str:
+                self.log("✗ .NET 8 Desktop Runtime is required for internal sound preview")
+                self.log("  Download: https://dotnet.microsoft.com/download/dotnet/8.0")
+                self.log("  Click 'Download x64' under '.NET Desktop Runtime 8.0'")
+                self.log("  The sound will still work in-game when you click 'Add Sound'")
+            else:
+                self.log(f"✗ Error previewing sound: {e}")
+                import traceback
+                traceback.print_exc()
     
     
+    def play_preview(self, file_path, start_ms=0):
+        """Play a file through the in-process preview player (decoded once, loops are sample accurate)"""
+        # Release anything the legacy music stream still holds
+        try:
+            pygame.mixer.music.stop()
+            pygame.mixer.music.unload()
+        except:
+            pass
+        
+        self.sync_preview_player()
+        self.preview_player.play(
+            file_path,
+            transcode=self.get_transcoded_wav,
+            start_ms=start_ms,
+            on_error=lambda e: self.log(f"✗ Error playing sound: {e}")
+        )
+        self.preview_playing = True
+        self.playback_position_ms = int(start_ms)
+    
+    def get_transcoded_wav(self, source_path, on_chunk=None):
+        """Cached 44.1kHz 16-bit WAV of a sound (shared by playback and export), or None without ffmpeg
+        
+        on_chunk receives the samples while ffmpeg converts (see TranscodeCache.get_wav)
+        """
+        if not self.ffmpeg_path or not os.path.exists(self.ffmpeg_path):
+            return None
+        return self.transcode_cache.get_wav(self.ffmpeg_path, source_path, WAVEFORM_DECODE_RATE, on_chunk)
+    
+    def is_animating(self):
+        """Whether frames have to keep coming without input (playback, streaming, drags, text cursor)"""
+        return (self.preview_playing or bool(self.waveform_streams) or self.loading_internal_sounds
+                or self.dragging_window or any(imgui.is_mouse_down(button) for button in range(3))
+                or imgui.get_io().want_text_input)
+    
+    def process_job_events(self):
+        """Apply job queue events on the render thread (status text, failures)"""
+        events = self.jobs.poll_events()
+        if not events:
+            return
+        
+        for kind, job in events:
+            if kind == 'failed':
+                self.log(f"✗ {job.title} failed: {job.error}")
+        
+        jobs = self.jobs.get_jobs()
+        if not jobs:
+            self.job_status = ""
+            return
+        current = jobs[0]
+        status = f"⏳ {current.title}"
+        if current.state == 'running' and current.message:
+            status += f": {current.message} ({int(current.progress * 100)}%)"
+        if len(jobs) > 1:
+            status += f"  +{len(jobs) - 1} queued"
+        self.job_status = status
+    
+    def sync_preview_player(self):
+        """Hand the current loop, pitch and volume settings to the preview player (applied with its next chunk)"""
+        player = self.preview_player
+        if not player:
+            return
+        player.set_loop(self.encoding_loop_enabled, self.encoding_loop_start_ms,
+                        self.encoding_loop_end_ms, self.encoding_crossfade_ms)
+        player.set_rate(self.pitch if self.show_pitch else 1.0)
+        player.set_volume(self.preview_volume)
+    
     def play_sound_file(self, file_path):
         """Play audio file using pygame with pitch adjustment and loop points"""
         try:
+            # The preview player streams loops, pitch and large MP3s straight from memory (no mixer restarts)
+            if self.preview_player:
+                pitch_msg = f" (pitch: {self.pitch:.2f})" if self.show_pitch and self.pitch != 1.0 else ""
+                if self.encoding_loop_enabled and self.audio_duration_ms > 0:
+                    self.play_preview(file_path, self.encoding_loop_start_ms)
+                    self.log(f"♪ Playing: {os.path.basename(file_path)}{pitch_msg} (looping: {self.encoding_loop_start_ms/1000:.2f}s - {self.encoding_loop_end_ms/1000:.2f}s)")
+                else:
+                    self.play_preview(file_path)
+                    self.log(f"♪ Playing: {os.path.basename(file_path)}{pitch_msg}")
+                return
+            
             # Check if it's a large MP3 file (pygame has issues with large MP3s)
             is_large_mp3 = False
             actual_play_path = file_path
@@ -540,19 +784,6 @@ class SoundsManagerApp:
                         is_large_mp3 = False
                     else:
                         try:
-                            from pydub import AudioSegment
-                            
-                            # Explicitly set ffmpeg paths (PATH might not work if pydub was already imported)
-                            ffmpeg_dir = os.path.dirname(self.ffmpeg_path)
-                            ffprobe_path = os.path.join(ffmpeg_dir, 'ffprobe.exe')
-                            AudioSegment.converter = self.ffmpeg_path
-                            AudioSegment.ffprobe = ffprobe_path
-                            
-                            self.log(f"  DEBUG: ffmpeg={self.ffmpeg_path}")
-                            self.log(f"  DEBUG: ffprobe={ffprobe_path}")
-                            self.log(f"  DEBUG: Source MP3={file_path}")
-                            self.log(f"  DEBUG: Source size={os.path.getsize(file_path)} bytes")
-                            
                             # Stop and unload any current playback to release file locks
                             try:
                                 pygame.mixer.music.stop()
@@ -560,37 +791,8 @@ class SoundsManagerApp:
                             except:
                                 pass
                             
-                            # Create temp WAV for playback
-                            temp_dir = os.path.join(os.getenv('LOCALAPPDATA'), 'Temp', '.CS2KZ-mapping-tools', 'Sounds', 'temp')
-                            os.makedirs(temp_dir, exist_ok=True)
-                            temp_wav_path = os.path.join(temp_dir, "large_mp3_preview.wav")
-                            
-                            self.log(f"  DEBUG: Converting MP3→WAV with ffmpeg directly...")
-                            # Use ffmpeg directly instead of pydub's MP3 decoder (more reliable)
-                            import subprocess
-                            
-                            # Call ffmpeg directly to convert MP3 to WAV
-                            # -i input, -y overwrite, -acodec pcm_s16le standard WAV codec
-                            ffmpeg_cmd = [
-                                self.ffmpeg_path,
-                                '-i', file_path,
-                                '-acodec', 'pcm_s16le',
-                                '-ar', '44100',
-                                '-y',  # Overwrite output
-                                temp_wav_path
-                            ]
-                            
-                            self.log(f"  DEBUG: Running: {' '.join(ffmpeg_cmd)}")
-                            result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True, creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0)
-                            
-                            if result.returncode != 0:
-                                self.log(f"  DEBUG: ffmpeg stderr: {result.stderr}")
-                                raise Exception(f"ffmpeg failed with code {result.returncode}")
-                            
-                            wav_size = os.path.getsize(temp_wav_path) if os.path.exists(temp_wav_path) else 0
-                            self.log(f"  DEBUG: WAV created, size={wav_size} bytes")
-                            
-                            actual_play_path = temp_wav_path
+                            # Converted once per source file, reused by later previews and by Add Sound
+                            actual_play_path = self.get_transcoded_wav(file_path)
                             self.log(f"  ✓ Converted to WAV for playback")
                         except Exception as e:
                             self.log(f"  ✗ Conversion failed: {e}")
@@ -674,6 +876,8 @@ class SoundsManagerApp:
         if not pygame:
             return
         try:
+            if self.preview_player:
+                self.preview_player.stop()
             pygame.mixer.music.stop()
             pygame.mixer.music.unload()  # Unload the file to release the lock
             self.preview_playing = False
@@ -698,6 +902,15 @@ class SoundsManagerApp:
         if not audio_path or not self.encoding_loop_enabled:
             return
         
+        # Loop the region in-process: gapless, crossfaded, and loop point edits apply while playing
+        if self.preview_player:
+            try:
+                self.play_preview(audio_path, self.encoding_loop_start_ms)
+                self.log(f"♪ Playing loop: {self.encoding_loop_start_ms/1000:.2f}s - {self.encoding_loop_end_ms/1000:.2f}s")
+            except Exception as e:
+                self.log(f"✗ Error playing loop region: {e}")
+            return
+        
         # Check if it's a WAV file - we can use pydub for WAV without ffmpeg
         is_wav = audio_path.lower().endswith('.wav')
         
@@ -910,111 +1123,241 @@ class SoundsManagerApp:
     def analyze_audio_file(self, file_path):
         """Analyze audio file to extract duration and generate waveform data"""
         try:
-            import wave
-            import struct
-            
             # Reset timeline data
             self.audio_duration_ms = 0
             self.audio_waveform = []
+            self.audio_peaks = None
+            self.audio_waveform_failed = False
+            self.analyzed_audio_path = file_path
             self.encoding_loop_start_ms = 0
             self.encoding_loop_end_ms = 0
             self.playback_position_ms = 0
             
-            # Try to detect file type (some decompiled files have no extension)
-            is_mp3 = file_path.lower().endswith('.mp3')
-            is_wav = file_path.lower().endswith('.wav')
-            
-            # If no extension, try to detect by attempting to open as WAV first
-            if not is_mp3 and not is_wav:
-                try:
-                    with wave.open(file_path, 'rb') as test_wav:
-                        is_wav = True
-                except:
-                    is_mp3 = True  # Assume MP3 if WAV fails
-            
-            # Check file extension
-            if is_mp3:
-                # For MP3, just get duration with pygame (no conversion for UI responsiveness)
-                try:
-                    sound = pygame.mixer.Sound(file_path)
-                    duration_seconds = sound.get_length()
-                    self.audio_duration_ms = int(duration_seconds * 1000)
-                    self.encoding_loop_end_ms = self.audio_duration_ms
-                    
-                    # Generate simple waveform placeholder for MP3s
-                    # Actual waveform would require conversion which blocks UI
-                    num_samples = 200
-                    # Create a semi-random looking waveform (alternating between 0.2-0.5)
-                    import random
-                    random.seed(hash(file_path))  # Consistent per file
-                    self.audio_waveform = [random.uniform(0.2, 0.5) for _ in range(num_samples)]
-                    
-                    self.log(f"✓ Analyzed MP3: {duration_seconds:.2f}s (approximate waveform)")
-                except Exception as e:
-                    self.log(f"✗ Error analyzing MP3: {e}")
-                    return False
-                    
-            elif is_wav:
-                # For WAV, use wave module to extract detailed data
-                with wave.open(file_path, 'rb') as wav_file:
-                    framerate = wav_file.getframerate()
-                    n_frames = wav_file.getnframes()
-                    n_channels = wav_file.getnchannels()
-                    sampwidth = wav_file.getsampwidth()
-                    
-                    # Calculate duration
-                    duration_seconds = n_frames / framerate
-                    self.audio_duration_ms = int(duration_seconds * 1000)
-                    self.encoding_loop_end_ms = self.audio_duration_ms
-                    
-                    # Read all frames
-                    frames = wav_file.readframes(n_frames)
-                    
-                    # Convert to samples
-                    if sampwidth == 1:
-                        fmt = f"{n_frames * n_channels}B"
-                        samples = struct.unpack(fmt, frames)
-                        samples = [(s - 128) / 128.0 for s in samples]
-                    elif sampwidth == 2:
-                        fmt = f"{n_frames * n_channels}h"
-                        samples = struct.unpack(fmt, frames)
-                        samples = [s / 32768.0 for s in samples]
-                    else:
-                        # Unsupported sample width, use placeholder
-                        samples = [0.5] * (n_frames * n_channels)
-                    
-                    # If stereo, average channels
-                    if n_channels == 2:
-                        samples = [(samples[i] + samples[i+1]) / 2 for i in range(0, len(samples), 2)]
-                    
-                    # Downsample for visualization (200 points)
-                    num_vis_samples = 200
-                    chunk_size = max(1, len(samples) // num_vis_samples)
-                    
-                    self.audio_waveform = []
-                    for i in range(num_vis_samples):
-                        start_idx = i * chunk_size
-                        end_idx = min(start_idx + chunk_size, len(samples))
-                        if start_idx < len(samples):
-                            chunk = samples[start_idx:end_idx]
-                            # Get peak amplitude in this chunk (max absolute value)
-                            peak = max(abs(s) for s in chunk) if chunk else 0.0
-                            self.audio_waveform.append(peak)
-                        else:
-                            self.audio_waveform.append(0.0)
-                    
-                    self.log(f"✓ Analyzed WAV: {duration_seconds:.2f}s, {framerate}Hz, {n_channels}ch")
-            else:
-                return False
-                
+            # Warmed folders have the analysis ready already
+            analysis = self.audio_analysis_cache.get(file_path)
+            if analysis is None:
+                analysis = self.compute_audio_analysis(file_path)
+                self.store_audio_analysis(file_path, analysis)
+            
+            duration_ms, waveform, peaks, summary = analysis
+            self.audio_duration_ms = duration_ms
+            self.encoding_loop_end_ms = duration_ms
+            self.audio_waveform = waveform
+            self.audio_peaks = peaks
+            self.log(summary)
+            
+            # MP3s only have a placeholder so far, decode the real waveform without blocking the UI
+            if peaks is None and self.can_decode_waveform(file_path):
+                self.audio_waveform = []
+                self.start_waveform_stream(file_path, duration_ms)
             return True
             
         except Exception as e:
+            self.audio_waveform_failed = True
             self.log(f"✗ Error analyzing audio: {e}")
             import traceback
             traceback.print_exc()
             return False
     
+    def store_audio_analysis(self, file_path, analysis):
+        """Remember the analysis of a decoded file (oldest entries are dropped first)"""
+        cache = self.audio_analysis_cache
+        cache[file_path] = analysis
+        while len(cache) > MAX_AUDIO_ANALYSIS_ENTRIES:
+            del cache[next(iter(cache))]
+    
+    def can_decode_waveform(self, file_path):
+        """Check if an MP3's real waveform can be decoded in the background (needs numpy and ffmpeg)"""
+        return (PeakAccumulator is not None and file_path.lower().endswith('.mp3')
+                and bool(self.ffmpeg_path) and os.path.exists(self.ffmpeg_path))
+    
+    def get_mixer_peaks(self, sound):
+        """Peak pyramid of a pygame Sound's samples, or None (UI thread, where the mixer is re-initialized)"""
+        if PeakAccumulator is None:
+            return None
+        framerate, mixer_format, channels = pygame.mixer.get_init()
+        if mixer_format != -16:
+            return None
+        raw = sound.get_raw()
+        accumulator = PeakAccumulator(framerate)
+        accumulator.add(samples_to_float(raw[:len(raw) - len(raw) % (channels * 2)], WAVE_FORMAT_PCM, 16, channels))
+        return accumulator.to_pyramid(final=True)
+    
+    def decode_waveform_peaks(self, file_path, duration_ms, on_progress=None):
+        """
+        Build a compressed file's peak pyramid from the PCM playback uses (run off the render thread)
+        
+        The file is never decoded just for its waveform: the samples the preview player
+        already holds or the transcode cache WAV (shared with playback and export) are read.
+        When the WAV still has to be converted, the peaks fill in as ffmpeg streams it.
+        
+        Args:
+            file_path: Audio file to decode
+            duration_ms: Known duration, keeps the time axis stable while decoding
+            on_progress: Called with a partial PeakPyramid every WAVEFORM_PUBLISH_INTERVAL seconds
+        """
+        import time
+        
+        framerate = WAVEFORM_DECODE_RATE
+        accumulator = PeakAccumulator(framerate, duration_ms * framerate // 1000)
+        last_publish = [time.monotonic()]
+        
+        def add_chunk(raw, channels):
+            accumulator.add(samples_to_float(raw, WAVE_FORMAT_PCM, 16, channels))
+            if on_progress and time.monotonic() - last_publish[0] >= WAVEFORM_PUBLISH_INTERVAL:
+                on_progress(accumulator.to_pyramid())
+                last_publish[0] = time.monotonic()
+        
+        loaded_path, samples = self.preview_player.loaded if self.preview_player else (None, None)
+        if loaded_path == file_path and samples is not None:
+            # int16 (frames, 2) at the player rate, walked in chunks so the timeline fills in live
+            for i in range(0, len(samples), framerate):
+                add_chunk(samples[i:i + framerate], samples.shape[1])
+            return accumulator.to_pyramid(final=True)
+        
+        # One ffmpeg conversion into the transcode cache, playback reads the same WAV
+        wav_path = self.get_transcoded_wav(file_path, on_chunk=add_chunk)
+        if not wav_path:
+            raise RuntimeError("ffmpeg is required to decode MP3 waveforms in the background")
+        if accumulator.n_frames == 0:
+            # Converted earlier (or by playback meanwhile), read the cached WAV
+            return analyze_wav(wav_path)[0]
+        return accumulator.to_pyramid(final=True)
+    
+    def start_waveform_stream(self, file_path, duration_ms):
+        """Decode an MP3's waveform in the background, updating the timeline as chunks arrive"""
+        if file_path in self.waveform_streams:
+            return
+        self.waveform_streams.add(file_path)
+        
+        def publish(peaks):
+            # The user may have moved on to another sound meanwhile
+            if self.analyzed_audio_path == file_path:
+                self.audio_peaks = peaks
+        
+        def stream_thread():
+            try:
+                peaks = self.decode_waveform_peaks(file_path, duration_ms, on_progress=publish)
+                waveform = peaks.get_envelope(200)
+                summary = f"✓ Analyzed MP3: {peaks.n_frames / peaks.framerate:.2f}s"
+                self.store_audio_analysis(file_path, (peaks.duration_ms, waveform, peaks, summary))
+                if self.analyzed_audio_path == file_path:
+                    self.audio_waveform = waveform
+                publish(peaks)
+            except Exception as e:
+                if self.analyzed_audio_path == file_path:
+                    self.audio_waveform_failed = True
+                self.log(f"✗ Could not decode MP3 waveform: {e}")
+            finally:
+                self.waveform_streams.discard(file_path)
+        
+        threading.Thread(target=stream_thread, daemon=True).start()
+    
+    def compute_audio_analysis(self, file_path, use_mixer=True):
+        """Read an audio file and return (duration_ms, waveform, peaks, summary) without touching UI state
+        
+        use_mixer=False (worker threads) never creates pygame objects: MP3s are read from
+        the transcode cache WAV, or None is returned without ffmpeg.
+        """
+        import wave
+        import struct
+        
+        # Try to detect file type (some decompiled files have no extension)
+        is_mp3 = file_path.lower().endswith('.mp3')
+        is_wav = file_path.lower().endswith('.wav')
+        
+        # If no extension, try to detect by attempting to open as WAV first
+        if not is_mp3 and not is_wav:
+            try:
+                with wave.open(file_path, 'rb') as test_wav:
+                    is_wav = True
+            except:
+                is_mp3 = True  # Assume MP3 if WAV fails
+        
+        # Check file extension
+        if is_mp3:
+            if not use_mixer:
+                wav_path = self.get_transcoded_wav(file_path) if analyze_wav else None
+                if not wav_path:
+                    return None
+                peaks = analyze_wav(wav_path)[0]
+                return peaks.duration_ms, peaks.get_envelope(200), peaks, f"✓ Analyzed MP3: {peaks.n_frames / peaks.framerate:.2f}s"
+            
+            # For MP3, just get duration with pygame (no conversion for UI responsiveness)
+            sound = pygame.mixer.Sound(file_path)
+            duration_seconds = sound.get_length()
+            
+            # Without ffmpeg there is no background decode, the mixer just decoded the whole file anyway
+            if not self.can_decode_waveform(file_path):
+                peaks = self.get_mixer_peaks(sound)
+                if peaks is not None:
+                    return int(duration_seconds * 1000), peaks.get_envelope(200), peaks, f"✓ Analyzed MP3: {duration_seconds:.2f}s"
+            
+            # Generate simple waveform placeholder for MP3s
+            # Actual waveform would require conversion which blocks UI
+            num_samples = 200
+            # Create a semi-random looking waveform (alternating between 0.2-0.5)
+            import random
+            rng = random.Random(hash(file_path))  # Consistent per file (own generator, safe from worker threads)
+            waveform = [rng.uniform(0.2, 0.5) for _ in range(num_samples)]
+            
+            return int(duration_seconds * 1000), waveform, None, f"✓ Analyzed MP3: {duration_seconds:.2f}s (approximate waveform)"
+        
+        # Vectorized path: any bit depth / channel count, min/max peaks for every zoom level
+        if analyze_wav:
+            peaks, n_channels, bits = analyze_wav(file_path)
+            duration_seconds = peaks.n_frames / peaks.framerate
+            summary = f"✓ Analyzed WAV: {duration_seconds:.2f}s, {peaks.framerate}Hz, {n_channels}ch, {bits}-bit"
+            return peaks.duration_ms, peaks.get_envelope(200), peaks, summary
+        
+        # For WAV, use wave module to extract detailed data
+        with wave.open(file_path, 'rb') as wav_file:
+            framerate = wav_file.getframerate()
+            n_frames = wav_file.getnframes()
+            n_channels = wav_file.getnchannels()
+            sampwidth = wav_file.getsampwidth()
+            
+            # Calculate duration
+            duration_seconds = n_frames / framerate
+            
+            # Read all frames
+            frames = wav_file.readframes(n_frames)
+            
+            # Convert to samples
+            if sampwidth == 1:
+                fmt = f"{n_frames * n_channels}B"
+                samples = struct.unpack(fmt, frames)
+                samples = [(s - 128) / 128.0 for s in samples]
+            elif sampwidth == 2:
+                fmt = f"{n_frames * n_channels}h"
+                samples = struct.unpack(fmt, frames)
+                samples = [s / 32768.0 for s in samples]
+            else:
+                # Unsupported sample width, use placeholder
+                samples = [0.5] * (n_frames * n_channels)
+            
+            # If stereo, average channels
+            if n_channels == 2:
+                samples = [(samples[i] + samples[i+1]) / 2 for i in range(0, len(samples), 2)]
+            
+            # Downsample for visualization (200 points)
+            num_vis_samples = 200
+            chunk_size = max(1, len(samples) // num_vis_samples)
+            
+            waveform = []
+            for i in range(num_vis_samples):
+                start_idx = i * chunk_size
+                end_idx = min(start_idx + chunk_size, len(samples))
+                if start_idx < len(samples):
+                    chunk = samples[start_idx:end_idx]
+                    # Get peak amplitude in this chunk (max absolute value)
+                    peak = max(abs(s) for s in chunk) if chunk else 0.0
+                    waveform.append(peak)
+                else:
+                    waveform.append(0.0)
+            
+            return int(duration_seconds * 1000), waveform, None, f"✓ Analyzed WAV: {duration_seconds:.2f}s, {framerate}Hz, {n_channels}ch"
+    
     def update_addon_filter(self, search_text):
         """Filter available addons based on search text"""
         if not search_text:
@@ -1032,6 +1375,9 @@ class SoundsManagerApp:
         """Add message to console output"""
         self.console_output.append(message)
         print(message)
+        # Background threads report through here, redraw an idle window to show it
+        if self.frame_pacer and self.window:
+            self.frame_pacer.wake()
     
     def browse_sound_file(self):
         """Open file dialog to select sound file"""
@@ -1067,12 +1413,12 @@ class SoundsManagerApp:
         else:
             self.log("✗ No file selected")
     
-    def check_and_download_lame_dll(self):
+    def check_and_download_lame_dll(self, game_root):
         """Check if lame_enc.dll exists, download if missing"""
-        if not self.cs2_basefolder:
+        if not game_root:
             return False
         
-        dll_path = os.path.join(self.cs2_basefolder, 'game', 'bin', 'win64', 'lame_enc.dll')
+        dll_path = os.path.join(game_root, 'game', 'bin', 'win64', 'lame_enc.dll')
         
         # Check if DLL already exists
         if os.path.exists(dll_path):
@@ -1123,97 +1469,68 @@ class SoundsManagerApp:
             return False
     
 
-    def create_encoding_txt(self, sounds_folder, sound_filename, use_compression=True):
-        """Create encoding.txt file for Source 2 sound compilation with loop points and compression"""
+    def create_encoding_txt(self, settings, sounds_folder, sound_filename, use_compression=True):
+        """Update encoding.txt with the compression settings and this sound's loop points (other sounds keep theirs)
+        
+        Raises on failure so the add job fails instead of compiling without the loop points / compression.
+        """
         try:
             encoding_path = os.path.join(sounds_folder, 'encoding.txt')
-            
-            # Build the encoding.txt content
-            header = '''<!-- kv3 encoding:text:version{e21c7f3c-8a33-41c5-9977-a76d3a32aa0d} format:generic:version{7412167c-06e9-4698-aff2-e63eb59037e7} -->
-{
-'''
+            encoding = EncodingDocument.load(encoding_path)
             
             # Global compression settings
-            compress_block = ""
-            if self.encoding_format != "PCM":
-                if self.encoding_format == "mp3":
-                    vbr_value = 1 if self.encoding_vbr else 0
-                    compress_block = f'''\tcompress =
-\t{{
-\t\tformat = "mp3"
-\t\tminbitrate = {self.encoding_minbitrate}
-\t\tmaxbitrate = {self.encoding_maxbitrate}
-\t\tvbr = {vbr_value}
-\t}}
-'''
-                elif self.encoding_format == "adpcm":
-                    compress_block = '''\tcompress =
-\t{
-\t\tformat = "adpcm"
-\t}
-'''
+            encoding_settings = {}
+            if settings.encoding_format == "mp3":
+                encoding_settings['compress'] = {
+                    'format': "mp3",
+                    'minbitrate': settings.encoding_minbitrate,
+                    'maxbitrate': settings.encoding_maxbitrate,
+                    'vbr': 1 if settings.encoding_vbr else 0,
+                }
+            elif settings.encoding_format == "adpcm":
+                encoding_settings['compress'] = {'format': "adpcm"}
             
             # Sample rate settings
-            sample_rate_block = ""
-            if self.encoding_sample_rate > 0:
-                sample_rate_block = f'''\trate = {self.encoding_sample_rate}
-'''
+            if settings.encoding_sample_rate > 0:
+                encoding_settings['rate'] = settings.encoding_sample_rate
             
             # Normalization settings
-            normalize_block = ""
-            if self.encoding_normalize:
-                normalize_block = f'''\tnormalize =
-\t{{
-\t\tlevel = {self.encoding_normalize_level}
-'''
-                if self.encoding_normalize_compression:
-                    normalize_block += '''\t\tcompression = true
-'''
-                if self.encoding_normalize_limiter:
-                    normalize_block += '''\t\tlimiter = true
-'''
-                normalize_block += '''\t}
-'''
-            
-            # File-specific settings (loop points)
-            files_block = ""
-            if self.encoding_loop_enabled and self.audio_duration_ms > 0:
-                # Convert milliseconds to seconds
-                loop_start_sec = self.encoding_loop_start_ms / 1000.0
-                loop_end_sec = self.encoding_loop_end_ms / 1000.0
-                
-                files_block = f'''\tfiles =
-\t[
-\t\t{{
-\t\t\tfileName = "{sound_filename}"
-\t\t\tloop =
-\t\t\t{{
-\t\t\t\tloop_start_time = {loop_start_sec}
-\t\t\t\tloop_end_time = {loop_end_sec}
-\t\t\t\tcrossfade_ms = {self.encoding_crossfade_ms}
-\t\t\t}}
-\t\t}},
-\t]
-'''
-            
-            footer = '}\n'
-            
-            # Write the file
-            with open(encoding_path, 'w', encoding='utf-8') as f:
-                f.write(header + compress_block + sample_rate_block + normalize_block + files_block + footer)
-            
-            self.log(f"✓ Created encoding.txt: {encoding_path}")
-            if self.encoding_format != "PCM":
-                if self.encoding_format == "mp3":
-                    self.log(f"  - MP3 compression: {self.encoding_minbitrate}-{self.encoding_maxbitrate} kbps (VBR: {self.encoding_vbr})")
+            if settings.encoding_normalize:
+                normalize = {'level': settings.encoding_normalize_level}
+                if settings.encoding_normalize_compression:
+                    normalize['compression'] = True
+                if settings.encoding_normalize_limiter:
+                    normalize['limiter'] = True
+                encoding_settings['normalize'] = normalize
+            
+            encoding.set_settings(encoding_settings)
+            
+            # File-specific settings (loop points), batch adds (no file name) leave every entry alone
+            loop = None
+            if sound_filename:
+                if settings.encoding_loop_enabled and settings.audio_duration_ms > 0:
+                    # Convert milliseconds to seconds
+                    loop = {
+                        'loop_start_time': round(settings.encoding_loop_start_ms / 1000.0, 3),
+                        'loop_end_time': round(settings.encoding_loop_end_ms / 1000.0, 3),
+                        'crossfade_ms': settings.encoding_crossfade_ms,
+                    }
+                encoding.set_file_loop(sound_filename, loop)
+            
+            encoding.save()
+            
+            self.log(f"✓ Updated encoding.txt ({len(encoding.get_files())} file entries): {encoding_path}")
+            if settings.encoding_format != "PCM":
+                if settings.encoding_format == "mp3":
+                    self.log(f"  - MP3 compression: {settings.encoding_minbitrate}-{settings.encoding_maxbitrate} kbps (VBR: {settings.encoding_vbr})")
                 else:
-                    self.log(f"  - {self.encoding_format.upper()} compression")
-            if self.encoding_sample_rate > 0:
-                self.log(f"  - Sample rate: {self.encoding_sample_rate} Hz")
-            if self.encoding_normalize:
-                self.log(f"  - Normalization: {self.encoding_normalize_level} dB")
-            if self.encoding_loop_enabled:
-                self.log(f"  - Loop points: {loop_start_sec:.2f}s to {loop_end_sec:.2f}s (crossfade: {self.encoding_crossfade_ms}ms)")
+                    self.log(f"  - {settings.encoding_format.upper()} compression")
+            if settings.encoding_sample_rate > 0:
+                self.log(f"  - Sample rate: {settings.encoding_sample_rate} Hz")
+            if settings.encoding_normalize:
+                self.log(f"  - Normalization: {settings.encoding_normalize_level} dB")
+            if loop:
+                self.log(f"  - Loop points: {loop['loop_start_time']:.2f}s to {loop['loop_end_time']:.2f}s (crossfade: {settings.encoding_crossfade_ms}ms)")
             
             return True
             
@@ -1221,7 +1538,7 @@ class SoundsManagerApp:
             self.log(f"✗ Error creating encoding.txt: {e}")
             import traceback
             traceback.print_exc()
-            return False
+            raise
     
     def download_ffmpeg(self):
         """Download ffmpeg in background thread (non-blocking)"""
@@ -1329,15 +1646,29 @@ class SoundsManagerApp:
                 self.log("✗ Error: Selected sound file does not exist")
                 return
         
+        # The job works on a snapshot of the settings, later UI edits do not change a queued add
+        event_name = self.output_name if self.output_name else self.sound_name
+        self.jobs.submit(f"Add {event_name}", self.add_sound_job, self.get_add_settings())
+        self.log(f"⏳ Queued: add {event_name}")
+    
+    def get_add_settings(self):
+        """Immutable snapshot of the settings an add job uses (jobs never read the app's attributes)"""
+        settings = SoundAddSettings(**{field: getattr(self, field) for field in SoundAddSettings._fields})
+        return settings._replace(addon_name=self.addon_name.strip())
+    
+    def add_sound_job(self, job, settings):
+        """Copy, convert and compile the selected sound and update soundevents (runs on the job queue).
+        Raises on errors so the job ends up failed"""
         try:
-            addon_name = self.addon_name.strip()
+            addon_name = settings.addon_name
+            job.report(0.1, "Copying")
             
             # Handle custom file or internal sound differently
-            if not self.use_internal_sound:
+            if not settings.use_internal_sound:
                 # Custom file workflow (original behavior)
                 # Construct the sounds folder path
                 sounds_folder = os.path.join(
-                    self.cs2_basefolder,
+                    settings.cs2_basefolder,
                     'content',
                     'csgo_addons',
                     addon_name,
@@ -1349,32 +1680,34 @@ class SoundsManagerApp:
                 self.log(f"✓ Content sounds folder: {sounds_folder}")
                 
                 # Use output_name for the destination filename if specified, otherwise use original filename
-                output_filename = self.output_name if self.output_name else os.path.splitext(os.path.basename(self.sound_file_path))[0]
-                file_extension = os.path.splitext(self.sound_file_path)[1]
+                output_filename = settings.output_name if settings.output_name else os.path.splitext(os.path.basename(settings.sound_file_path))[0]
+                file_extension = os.path.splitext(settings.sound_file_path)[1]
                 dest_filename = output_filename + file_extension
                 dest_path = os.path.join(sounds_folder, dest_filename)
-                shutil.copy2(self.sound_file_path, dest_path)
+                shutil.copy2(settings.sound_file_path, dest_path)
                 self.log(f"✓ Content root file (.wav/.mp3): {dest_path}")
                 
                 # Create encoding.txt for loop points and compression (Source 2 native method)
-                if self.use_wav_markers and self.audio_duration_ms > 0:
+                if settings.use_wav_markers and settings.audio_duration_ms > 0:
                     # Check if MP3 compression is enabled and lame_enc.dll is needed
-                    if self.encoding_format == "mp3":
-                        self.check_and_download_lame_dll()
+                    if settings.encoding_format == "mp3":
+                        self.check_and_download_lame_dll(settings.cs2_basefolder)
                     
                     # use_wav_markers now means "use Source 2 encoding.txt for looping/compression"
-                    self.create_encoding_txt(sounds_folder, dest_filename, use_compression=True)
+                    job.report(0.2, "Writing encoding.txt")
+                    self.create_encoding_txt(settings, sounds_folder, dest_filename, use_compression=True)
                 
                 # Update sound_name to use the output name for soundevent creation
                 sound_name_for_event = output_filename
                 
                 # Compile the sound file directly (creates .vsnd_c in game root)
-                if not self.compile_sound_file(dest_path):
+                job.report(0.3, "Compiling sound")
+                if not self.compile_sound_file(settings.cs2_basefolder, dest_path):
                     self.log("✗ Warning: Sound file compilation failed, but content file was created")
                 else:
                     # Calculate game root path where .vsnd_c will be
                     game_sounds_folder = os.path.join(
-                        self.cs2_basefolder,
+                        settings.cs2_basefolder,
                         'game',
                         'csgo_addons',
                         addon_name,
@@ -1386,16 +1719,15 @@ class SoundsManagerApp:
             else:
                 # Internal sound workflow - copy the decompiled sound to addon folder
                 # so it gets compiled and appears in asset browser like custom sounds
-                self.log(f"✓ Using internal CS2 sound: {self.selected_internal_sound}")
+                self.log(f"✓ Using internal CS2 sound: {settings.selected_internal_sound}")
                 
                 # Ensure we have a cached/decompiled version
-                if not self.cached_internal_sound_path or not os.path.exists(self.cached_internal_sound_path):
-                    self.log("✗ Error: Internal sound not available. Please preview it first.")
-                    return
+                if not settings.cached_internal_sound_path or not os.path.exists(settings.cached_internal_sound_path):
+                    raise RuntimeError("Internal sound not available. Please preview it first.")
                 
                 # Construct the sounds folder path in content
                 sounds_folder = os.path.join(
-                    self.cs2_basefolder,
+                    settings.cs2_basefolder,
                     'content',
                     'csgo_addons',
                     addon_name,
@@ -1407,42 +1739,29 @@ class SoundsManagerApp:
                 self.log(f"✓ Content sounds folder: {sounds_folder}")
                 
                 # Use output_name for the destination filename
-                output_filename = self.output_name if self.output_name else os.path.splitext(os.path.basename(self.cached_internal_sound_path))[0]
+                output_filename = settings.output_name if settings.output_name else os.path.splitext(os.path.basename(settings.cached_internal_sound_path))[0]
                 
                 # Check if source is MP3 and we need WAV for loop points
-                file_extension = os.path.splitext(self.cached_internal_sound_path)[1]
+                file_extension = os.path.splitext(settings.cached_internal_sound_path)[1]
                 is_mp3 = file_extension.lower() == '.mp3'
                 
                 # Convert MP3 to WAV if loop points are enabled (CS2 requires WAV for loops)
-                if is_mp3 and self.use_wav_markers and self.encoding_loop_enabled:
+                if is_mp3 and settings.use_wav_markers and settings.encoding_loop_enabled:
+                    job.report(0.15, "Converting to WAV")
                     self.log("  Converting MP3 to WAV (required for loop points)...")
                     try:
-                        import subprocess
-                        
                         dest_filename = output_filename + '.wav'
                         dest_path = os.path.join(sounds_folder, dest_filename)
                         
-                        # Use ffmpeg directly for conversion (more reliable than pydub)
-                        if self.ffmpeg_path and os.path.exists(self.ffmpeg_path):
-                            ffmpeg_cmd = [
-                                self.ffmpeg_path,
-                                '-i', self.cached_internal_sound_path,
-                                '-acodec', 'pcm_s16le',
-                                '-ar', '44100',
-                                '-y',
-                                dest_path
-                            ]
-                            result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True, 
-                                                  creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0)
-                            
-                            if result.returncode == 0 and os.path.exists(dest_path):
-                                self.log(f"✓ Content root file (.wav): {dest_path}")
-                            else:
-                                raise Exception(f"ffmpeg conversion failed: {result.stderr}")
+                        # Use ffmpeg for conversion (more reliable than pydub), cached so a previewed sound is not converted again
+                        wav_path = self.get_transcoded_wav(settings.cached_internal_sound_path)
+                        if wav_path:
+                            shutil.copy2(wav_path, dest_path)
+                            self.log(f"✓ Content root file (.wav): {dest_path}")
                         else:
                             # Fallback to pydub if ffmpeg not available
                             from pydub import AudioSegment
-                            audio = AudioSegment.from_mp3(self.cached_internal_sound_path)
+                            audio = AudioSegment.from_mp3(settings.cached_internal_sound_path)
                             audio.export(dest_path, format="wav")
                             self.log(f"✓ Content root file (.wav): {dest_path}")
                     except Exception as e:
@@ -1451,33 +1770,35 @@ class SoundsManagerApp:
                         # Fall back to copying MP3
                         dest_filename = output_filename + file_extension
                         dest_path = os.path.join(sounds_folder, dest_filename)
-                        shutil.copy2(self.cached_internal_sound_path, dest_path)
+                        shutil.copy2(settings.cached_internal_sound_path, dest_path)
                         self.log(f"✓ Content root file ({file_extension}): {dest_path}")
                 else:
                     # Copy the sound file as-is (MP3 or WAV)
                     dest_filename = output_filename + file_extension
                     dest_path = os.path.join(sounds_folder, dest_filename)
-                    shutil.copy2(self.cached_internal_sound_path, dest_path)
+                    shutil.copy2(settings.cached_internal_sound_path, dest_path)
                     self.log(f"✓ Content root file ({file_extension}): {dest_path}")
                 
                 # Create encoding.txt for loop points and compression if enabled
-                if self.use_wav_markers and self.audio_duration_ms > 0:
+                if settings.use_wav_markers and settings.audio_duration_ms > 0:
                     # Check if MP3 compression is enabled and lame_enc.dll is needed
-                    if self.encoding_format == "mp3":
-                        self.check_and_download_lame_dll()
+                    if settings.encoding_format == "mp3":
+                        self.check_and_download_lame_dll(settings.cs2_basefolder)
                     
-                    self.create_encoding_txt(sounds_folder, dest_filename, use_compression=True)
+                    job.report(0.2, "Writing encoding.txt")
+                    self.create_encoding_txt(settings, sounds_folder, dest_filename, use_compression=True)
                 
                 # Update sound_name to use the output name for soundevent creation
                 sound_name_for_event = output_filename
                 
                 # Compile the sound file directly (creates .vsnd_c in game root)
-                if not self.compile_sound_file(dest_path):
+                job.report(0.3, "Compiling sound")
+                if not self.compile_sound_file(settings.cs2_basefolder, dest_path):
                     self.log("✗ Warning: Sound file compilation failed, but content file was created")
                 else:
                     # Calculate game root path where .vsnd_c will be
                     game_sounds_folder = os.path.join(
-                        self.cs2_basefolder,
+                        settings.cs2_basefolder,
                         'game',
                         'csgo_addons',
                         addon_name,
@@ -1488,8 +1809,9 @@ class SoundsManagerApp:
                     self.log(f"✓ Game root file (.vsnd_c): {vsnd_c_path}")
             
             # Update soundevents_addon.vsndevts file
+            job.report(0.7, "Updating soundevents")
             soundevents_folder = os.path.join(
-                self.cs2_basefolder,
+                settings.cs2_basefolder,
                 'content',
                 'csgo_addons',
                 addon_name,
@@ -1501,14 +1823,15 @@ class SoundsManagerApp:
             
             # Both custom files and internal sounds now use local filename
             # (internal sounds are copied to addon folder now)
-            self.update_soundevents_file(soundevents_file, dest_filename, None)
+            self.update_soundevents_file(settings, soundevents_file, dest_filename, None)
             
             # Compile the soundevents file so Hammer can see it
-            if not self.compile_sound_file(soundevents_file):
+            job.report(0.8, "Compiling soundevents")
+            if not self.compile_sound_file(settings.cs2_basefolder, soundevents_file):
                 self.log("✗ Warning: Soundevents file compilation failed")
             else:
                 game_soundevents_folder = os.path.join(
-                    self.cs2_basefolder,
+                    settings.cs2_basefolder,
                     'game',
                     'csgo_addons',
                     addon_name,
@@ -1517,18 +1840,173 @@ class SoundsManagerApp:
                 soundevents_c_path = os.path.join(game_soundevents_folder, 'soundevents_addon.vsndevts_c')
                 self.log(f"✓ Game soundevents file (.vsndevts_c): {soundevents_c_path}")
             
-            event_name = self.output_name if self.output_name else self.sound_name
+            event_name = settings.output_name if settings.output_name else settings.sound_name
             self.log(f"✓ Sound added successfully! Event name: {event_name}")
             
-        except Exception as e:
-            self.log(f"✗ Error adding sound: {e}")
+        except Exception:
+            # Logged by process_job_events when the job fails
+            import traceback
+            traceback.print_exc()
+            raise
+    
+    def browse_sound_files_batch(self):
+        """Pick several sound files and add them all at once"""
+        root = tk.Tk()
+        root.withdraw()
+        root.attributes('-topmost', True)
+        
+        file_paths = filedialog.askopenfilenames(
+            title="Select Sound Files",
+            filetypes=[
+                ("Audio Files", "*.mp3 *.wav"),
+                ("MP3 Files", "*.mp3"),
+                ("WAV Files", "*.wav"),
+                ("All Files", "*.*")
+            ]
+        )
+        root.destroy()
+        
+        if file_paths:
+            self.add_sounds_batch(file_paths)
+        else:
+            self.log("✗ No files selected")
+    
+    def browse_sound_folder_batch(self):
+        """Pick a folder and add every .wav/.mp3 directly inside it"""
+        root = tk.Tk()
+        root.withdraw()
+        root.attributes('-topmost', True)
+        
+        folder = filedialog.askdirectory(title="Select Folder With Sounds")
+        root.destroy()
+        
+        if not folder:
+            self.log("✗ No folder selected")
+            return
+        
+        file_paths = [os.path.join(folder, name) for name in sorted(os.listdir(folder))
+                      if name.lower().endswith(('.wav', '.mp3'))]
+        if file_paths:
+            self.add_sounds_batch(file_paths)
+        else:
+            self.log(f"✗ No .wav or .mp3 files in {folder}")
+    
+    def add_internal_folder_batch(self, folder):
+        """Decode every internal sound in a browser folder, then add them all to the addon"""
+        sounds = get_folder_sounds(self.internal_sounds, folder)
+        if not sounds:
+            return
+        
+        if self.validate_batch_target():
+            self.jobs.submit(f"Add {folder}", self.add_internal_folder_job, self.get_add_settings(), sounds, folder)
+    
+    def add_internal_folder_job(self, job, settings, sounds, folder):
+        """Decode the internal sounds of a folder, then add them as one batch (runs on the job queue)"""
+        job.report(0.0, f"Decoding {len(sounds)} sounds")
+        self.log(f"⏳ Decoding {len(sounds)} sounds from {folder}...")
+        with ThreadPoolExecutor(max_workers=WARM_FOLDER_WORKERS) as pool:
+            decoded = list(pool.map(self.decode_internal_sound, sounds))
+        file_paths = [path for path in decoded if path]
+        if not file_paths:
+            raise RuntimeError(f"None of the {len(sounds)} sounds could be decoded")
+        if len(file_paths) < len(sounds):
+            self.log(f"✗ {len(sounds) - len(file_paths)} sounds could not be decoded")
+        self.add_sounds_batch_job(job, settings, file_paths)
+    
+    def validate_batch_target(self):
+        """Check the addon name and CS2 path before queueing a batch add"""
+        if not self.addon_name.strip():
+            self.log("✗ Error: Please enter an addon name")
+            return False
+        
+        if not self.cs2_basefolder:
+            self.log("✗ Error: CS2 path not detected")
+            return False
+        return True
+    
+    def add_sounds_batch(self, source_paths):
+        """Add many sound files at once: one soundevents write, parallel compiles, one vsndevts compile"""
+        if self.validate_batch_target():
+            self.jobs.submit(f"Add {len(source_paths)} sounds", self.add_sounds_batch_job,
+                             self.get_add_settings(), list(source_paths))
+    
+    def add_sounds_batch_job(self, job, settings, source_paths):
+        """Worker for add_sounds_batch (runs on the job queue). Raises on errors so the job ends up failed"""
+        addon_name = settings.addon_name
+        try:
+            job.report(0.1, f"Copying {len(source_paths)} sounds")
+            sounds_folder = os.path.join(settings.cs2_basefolder, 'content', 'csgo_addons', addon_name, 'sounds')
+            os.makedirs(sounds_folder, exist_ok=True)
+            self.log(f"⏳ Adding {len(source_paths)} sounds to {addon_name}...")
+            
+            # Copy into the content sounds folder (the file name becomes the event name)
+            copied = []
+            seen_names = set()
+            for source_path in source_paths:
+                sound_name, file_extension = os.path.splitext(os.path.basename(source_path))
+                if file_extension.lower() not in ('.wav', '.mp3'):
+                    self.log(f"  Skipped {os.path.basename(source_path)} (not .wav/.mp3)")
+                    continue
+                if sound_name.lower() in seen_names:
+                    self.log(f"  Skipped {os.path.basename(source_path)} (duplicate name)")
+                    continue
+                seen_names.add(sound_name.lower())
+                
+                dest_filename = sound_name + file_extension
+                dest_path = os.path.join(sounds_folder, dest_filename)
+                if os.path.normcase(os.path.abspath(source_path)) != os.path.normcase(os.path.abspath(dest_path)):
+                    shutil.copy2(source_path, dest_path)
+                copied.append((sound_name, dest_filename, dest_path))
+            
+            if not copied:
+                raise RuntimeError("No .wav/.mp3 sounds to add")
+            self.log(f"✓ Copied {len(copied)} sounds to {sounds_folder}")
+            
+            # Compression settings apply to the whole folder, loop points are per sound and not set in batch mode
+            if settings.use_wav_markers:
+                if settings.encoding_format == "mp3":
+                    self.check_and_download_lame_dll(settings.cs2_basefolder)
+                self.create_encoding_txt(settings, sounds_folder, None, use_compression=True)
+            
+            # Every soundevent in a single write
+            soundevents_folder = os.path.join(settings.cs2_basefolder, 'content', 'csgo_addons', addon_name, 'soundevents')
+            os.makedirs(soundevents_folder, exist_ok=True)
+            soundevents_file = os.path.join(soundevents_folder, 'soundevents_addon.vsndevts')
+            entries = [(sound_name, self.build_soundevent_entry(settings, sound_name, f"sounds/{sound_name}.vsnd"))
+                       for sound_name, _, _ in copied]
+            job.report(0.3, "Updating soundevents")
+            self.write_soundevents(soundevents_file, entries)
+            
+            # Compile the audio files as a few filelists in parallel (compiler startup paid once per list)
+            failed = []
+            audio_paths = [dest_path for _, _, dest_path in copied]
+            workers = min(COMPILE_WORKERS, len(audio_paths))
+            filelists = [audio_paths[i::workers] for i in range(workers)]
+            job.report(0.4, f"Compiling {len(audio_paths)} sounds")
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for results in pool.map(lambda paths: self.compile_sound_files(settings.cs2_basefolder, paths), filelists):
+                    failed.extend(os.path.basename(path) for path, ok in results.items() if not ok)
+            
+            job.report(0.9, "Compiling soundevents")
+            
+            # Soundevents compiled once for the whole batch
+            if not self.compile_sound_file(settings.cs2_basefolder, soundevents_file):
+                self.log("✗ Warning: Soundevents file compilation failed")
+            
+            if failed:
+                self.log(f"✓ Added {len(copied) - len(failed)} of {len(copied)} sounds ({len(failed)} failed to compile: {', '.join(sorted(failed))})")
+            else:
+                self.log(f"✓ Added {len(copied)} sounds successfully!")
+        except Exception:
+            # Logged by process_job_events when the job fails
             import traceback
             traceback.print_exc()
+            raise
     
-    def update_soundevents_file(self, soundevents_file, sound_filename=None, internal_sound_path=None):
+    def update_soundevents_file(self, settings, soundevents_file, sound_filename=None, internal_sound_path=None):
         """Update or create the soundevents_addon.vsndevts file with new sound entry"""
         # Use output_name for the soundevent name (user-customizable)
-        event_name = self.output_name if self.output_name else self.sound_name
+        event_name = settings.output_name if settings.output_name else settings.sound_name
         
         # Determine the vsnd reference based on whether it's custom or internal
         if internal_sound_path:
@@ -1539,101 +2017,59 @@ class SoundsManagerApp:
             vsnd_filename = os.path.splitext(sound_filename)[0] + ".vsnd"
             vsnd_reference = f"sounds/{vsnd_filename}"
         
-        # Generate the soundevent entry
-        # Add wav_markers line if enabled
-        wav_markers_line = ""
-        if self.use_wav_markers:
-            wav_markers_line = '\t\tuse_wav_markers = true\n'
-        
-        soundevent_entry = f'''\t"{event_name}" =
-\t{{
-\t\ttype = "{self.sound_type}"
-\t\tvsnd_files_track_01 = "{vsnd_reference}"
-\t\tvolume = {self.volume:.1f}
-\t\tpitch = {self.pitch:.2f}
-{wav_markers_line}\t\tuse_distance_volume_mapping_curve = true
-\t\tdistance_volume_mapping_curve = 
-\t\t[
-\t\t\t[{self.distance_near:.1f}, {self.distance_near_volume:.1f}, {self.curve_near_mid_cp1:.3f}, {self.curve_near_mid_cp2:.3f}, {self.curve_near_mid_cp3:.3f}, {self.curve_near_mid_cp4:.3f},],
-\t\t\t[{self.distance_mid:.1f}, {self.distance_mid_volume:.1f}, {self.curve_mid_far_cp1:.3f}, {self.curve_mid_far_cp2:.3f}, {self.curve_mid_far_cp3:.3f}, {self.curve_mid_far_cp4:.3f}],
-\t\t\t[{self.distance_far:.1f}, {self.distance_far_volume:.1f}, 0.0, 0.0, 1.0, 1.0],
-\t\t]
-\t\tocclusion = {str(self.show_occlusion).lower()}
-\t\tocclusion_intensity = {int(self.occlusion_intensity)}
-\t}}
-'''
-        
-        if os.path.exists(soundevents_file):
-            # File exists, check if sound name already exists and remove it
-            with open(soundevents_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Remove existing entry with the same name if it exists
-            # Pattern to match the entire sound entry block
-            pattern = rf'\t"{re.escape(event_name)}"\s*=\s*\{{[^}}]*\}}\n?'
-            content = re.sub(pattern, '', content, flags=re.DOTALL)
-            
-            # Find the last closing brace
-            last_brace_index = content.rfind('}')
-            if last_brace_index != -1:
-                # Insert before the last closing brace
-                new_content = content[:last_brace_index] + soundevent_entry + content[last_brace_index:]
-            else:
-                # Shouldn't happen, but append anyway
-                new_content = content + soundevent_entry + '\n}'
-            
-            with open(soundevents_file, 'w', encoding='utf-8') as f:
-                f.write(new_content)
-            
+        self.write_soundevents(soundevents_file, [(event_name, self.build_soundevent_entry(settings, event_name, vsnd_reference))])
+    
+    def build_soundevent_entry(self, settings, event_name, vsnd_reference):
+        """Build the soundevent for one sound with the current settings (a KV3 object)"""
+        event = {
+            'type': settings.sound_type,
+            'vsnd_files_track_01': vsnd_reference,
+            'volume': round(float(settings.volume), 1),
+            'pitch': round(float(settings.pitch), 2),
+        }
+        if settings.use_wav_markers:
+            event['use_wav_markers'] = True
+        event['use_distance_volume_mapping_curve'] = True
+        event['distance_volume_mapping_curve'] = [
+            [round(float(value), digits) for value, digits in (
+                (settings.distance_near, 1), (settings.distance_near_volume, 1), (settings.curve_near_mid_cp1, 3),
+                (settings.curve_near_mid_cp2, 3), (settings.curve_near_mid_cp3, 3), (settings.curve_near_mid_cp4, 3))],
+            [round(float(value), digits) for value, digits in (
+                (settings.distance_mid, 1), (settings.distance_mid_volume, 1), (settings.curve_mid_far_cp1, 3),
+                (settings.curve_mid_far_cp2, 3), (settings.curve_mid_far_cp3, 3), (settings.curve_mid_far_cp4, 3))],
+            [round(float(settings.distance_far), 1), round(float(settings.distance_far_volume), 1), 0.0, 0.0, 1.0, 1.0],
+        ]
+        event['occlusion'] = bool(settings.show_occlusion)
+        event['occlusion_intensity'] = int(settings.occlusion_intensity)
+        return event
+    
+    def write_soundevents(self, soundevents_file, entries):
+        """Add or replace (event_name, event) pairs in the soundevents file with a single write"""
+        existed = os.path.exists(soundevents_file)
+        try:
+            table = SoundEventTable.open(soundevents_file)
+        except KV3Error as e:
+            # Never overwrite a file we could not read, it would lose its events
+            raise RuntimeError(f"Could not parse {os.path.basename(soundevents_file)}: {e}")
+        
+        table.import_events(entries)
+        
+        if existed:
             self.log(f"✓ Updated soundevents file (overwritten if existed): {soundevents_file}")
         else:
-            # Create new file with header and soundevent
-            header = '''<!-- kv3 encoding:text:version{e21c7f3c-8a33-41c5-9977-a76d3a32aa0d} format:generic:version{7412167c-06e9-4698-aff2-e63eb59037e7} -->
-{
-'''
-            footer = '}\n'
-            
-            with open(soundevents_file, 'w', encoding='utf-8') as f:
-                f.write(header + soundevent_entry + footer)
-            
             self.log(f"✓ Created soundevents file: {soundevents_file}")
     
-    def compile_sound_file(self, audio_file_path):
+    def compile_sound_file(self, game_root, audio_file_path):
         """Compile a .wav/.mp3 file using resourcecompiler.exe to create .vsnd_c"""
-        if not self.cs2_basefolder:
+        return self.compile_sound_files(game_root, [audio_file_path])[audio_file_path]
+    
+    def compile_sound_files(self, game_root, file_paths):
+        """Compile several content files in one resourcecompiler.exe run. Returns {path: success}"""
+        if not game_root:
             self.log("✗ Error: CS2 path not detected")
-            return False
+            return {path: False for path in file_paths}
         
-        compiler_path = os.path.join(self.cs2_basefolder, 'game', 'bin', 'win64', 'resourcecompiler.exe')
-        if not os.path.exists(compiler_path):
-            self.log(f"✗ Error: resourcecompiler.exe not found at {compiler_path}")
-            return False
-        
-        # Set the working directory for the compiler (should be the 'game' directory)
-        compiler_cwd = os.path.join(self.cs2_basefolder, 'game')
-        
-        try:
-            # The input file path needs to be relative to the 'game' directory
-            relative_audio_path = os.path.relpath(audio_file_path, start=compiler_cwd).replace("\\", "/")
-            
-            self.log(f"Compiling {os.path.basename(audio_file_path)}...")
-            
-            command = [compiler_path, '-i', relative_audio_path]
-            result = subprocess.run(command, cwd=compiler_cwd, check=True, capture_output=True, text=True)
-            
-            self.log(f"✓ Compilation successful for {os.path.basename(audio_file_path)}")
-            return True
-            
-        except subprocess.CalledProcessError as e:
-            self.log(f"✗ Compilation failed for {os.path.basename(audio_file_path)}: {e}")
-            self.log(f"Compiler stderr: {e.stderr}")
-            return False
-        except FileNotFoundError:
-            self.log(f"✗ Error: resourcecompiler.exe not found at {compiler_path}")
-            return False
-        except Exception as e:
-            self.log(f"✗ Unexpected error during compilation: {e}")
-            return False
+        return compile_files(game_root, file_paths, log=self.log, extra_params=get_encoding_signature)
     
     def open_addon_sounds_folder(self):
         """Open the addon sounds folder in Windows Explorer"""
@@ -2266,63 +2702,18 @@ class SoundsManagerApp:
                 # Sound list in scrollable child window with tree structure
                 imgui.begin_child("##internal_sounds_list", 0, 250, border=True)
                 
-                # Build tree structure from filtered sounds
-                tree = {}
-                for sound in self.filtered_internal_sounds:
-                    parts = sound.split('/')
-                    current = tree
-                    for part in parts[:-1]:  # All but the last (filename)
-                        if part not in current:
-                            current[part] = {}
-                        current = current[part]
-                    # Add filename
-                    if '__files__' not in current:
-                        current['__files__'] = []
-                    current['__files__'].append(sound)
-                
-                # Render tree recursively
-                def render_tree(node, path=""):
-                    # Render folders first
-                    for folder_name in sorted([k for k in node.keys() if k != '__files__']):
-                        folder_path = f"{path}/{folder_name}" if path else folder_name
-                        
-                        imgui.push_style_color(imgui.COLOR_HEADER_HOVERED, *theme['button_hover'])
-                        imgui.push_style_color(imgui.COLOR_HEADER_ACTIVE, *theme['button_active'])
-                        imgui.push_style_color(imgui.COLOR_HEADER, *theme['button'])
-                        
-                        # Tree node for folder
-                        opened = imgui.tree_node(f"{folder_name}###{folder_path}")
-                        
-                        imgui.pop_style_color(3)
-                        
-                        if opened:
-                            render_tree(node[folder_name], folder_path)
-                            imgui.tree_pop()
-                    
-                    # Render files in this folder
-                    if '__files__' in node:
-                        for sound in sorted(node['__files__']):
-                            is_selected = (sound == self.selected_internal_sound)
-                            display_name = os.path.basename(sound)
-                            
-                            imgui.push_style_color(imgui.COLOR_HEADER_HOVERED, *theme['button_hover'])
-                            imgui.push_style_color(imgui.COLOR_HEADER_ACTIVE, *theme['button_active'])
-                            
-                            if is_selected:
-                                imgui.push_style_color(imgui.COLOR_HEADER, *theme['button_active'])
-                            else:
-                                imgui.push_style_color(imgui.COLOR_HEADER, *theme['button'])
-                            
-                            clicked, _ = imgui.selectable(f"  {display_name}###{sound}", is_selected)
-                            if clicked:
-                                self.selected_internal_sound = sound
-                                self.sound_name = display_name
-                                self.output_name = display_name
-                                self.preview_internal_sound()
-                            
-                            imgui.pop_style_color(3)
-                
-                render_tree(tree)
+                # Only submit the rows inside the scroll region (pyimgui 2.0 has no ListClipper), dummies keep the scrollbar right
+                rows = self.get_internal_sound_rows()
+                row_height = imgui.get_text_line_height_with_spacing()
+                spacing = imgui.get_style().item_spacing.y
+                first = min(len(rows), int(imgui.get_scroll_y() // row_height))
+                last = min(len(rows), first + int(imgui.get_window_height() // row_height) + 2)
+                if first > 0:
+                    imgui.dummy(0, first * row_height - spacing)
+                for i in range(first, last):
+                    self.render_internal_sound_row(rows[i], theme)
+                if last < len(rows):
+                    imgui.dummy(0, (len(rows) - last) * row_height - spacing)
                 
                 imgui.end_child()
                 
@@ -2927,10 +3318,17 @@ class SoundsManagerApp:
         
         imgui.begin("##bottom_bar", flags=flags)
         
+        # Progress of queued add/compile jobs on the left
+        if self.job_status:
+            imgui.set_cursor_pos_y(10 + (40 - imgui.get_text_line_height()) / 2)
+            imgui.text(self.job_status)
+            imgui.same_line()
+            imgui.set_cursor_pos_y(10)
+        
         # Calculate button widths
         button_width = 150
         button_spacing = 10
-        total_button_width = (button_width * 2) + button_spacing
+        total_button_width = (button_width * 3) + (button_spacing * 2)
         
         # Position buttons on the right side
         imgui.set_cursor_pos_x(self.window_width - total_button_width - 14)
@@ -2955,11 +3353,83 @@ class SoundsManagerApp:
         if imgui.button("Add Sound", width=button_width, height=40):
             self.add_sound()
         
+        imgui.same_line(spacing=button_spacing)
+        
+        # Add Many button (many files or a whole folder in one batch)
+        if imgui.button("Add Many...", width=button_width, height=40):
+            imgui.open_popup("##add_many_popup")
+        if imgui.is_item_hovered():
+            imgui.begin_tooltip()
+            imgui.text("Add several sounds at once (compiled in parallel)")
+            imgui.end_tooltip()
+        
         imgui.pop_style_color(3)
         
+        with imgui.begin_popup("##add_many_popup") as popup:
+            if popup.opened:
+                if imgui.menu_item("Select Files...")[0]:
+                    self.browse_sound_files_batch()
+                if imgui.menu_item("Select Folder...")[0]:
+                    self.browse_sound_folder_batch()
+        
         imgui.end()
         imgui.pop_style_var(2)
     
+    def render_internal_sound_row(self, row, theme):
+        """Render one folder or file row of the internal sound browser"""
+        depth, is_folder, name, path = row
+        indent = depth * imgui.get_style().indent_spacing
+        if indent:
+            imgui.indent(indent)
+        
+        imgui.push_style_color(imgui.COLOR_HEADER_HOVERED, *theme['button_hover'])
+        imgui.push_style_color(imgui.COLOR_HEADER_ACTIVE, *theme['button_active'])
+        
+        if is_folder:
+            imgui.push_style_color(imgui.COLOR_HEADER, *theme['button'])
+            
+            # Tree node for folder (open state is ours, rows are not nested in ImGui)
+            is_open = path in self.expanded_sound_folders
+            imgui.set_next_item_open(is_open)
+            opened = imgui.tree_node(f"{name}###{path}", imgui.TREE_NODE_NO_TREE_PUSH_ON_OPEN)
+            if opened != is_open:
+                if opened:
+                    self.expanded_sound_folders.add(path)
+                else:
+                    self.expanded_sound_folders.discard(path)
+                self.internal_sound_rows = None
+            
+            # Right-click a folder to pre-decode its sounds into the preview cache
+            with imgui.begin_popup_context_item(f"##warm_{path}") as popup:
+                if popup.opened:
+                    warming = path in self.warming_folders
+                    label = "Warming..." if warming else "Warm folder (pre-decode previews)"
+                    clicked, _ = imgui.menu_item(label, enabled=not warming)
+                    if clicked:
+                        self.warm_sound_folder(path)
+                    clicked, _ = imgui.menu_item("Add folder to addon")
+                    if clicked:
+                        self.add_internal_folder_batch(path)
+        else:
+            is_selected = (path == self.selected_internal_sound)
+            
+            if is_selected:
+                imgui.push_style_color(imgui.COLOR_HEADER, *theme['button_active'])
+            else:
+                imgui.push_style_color(imgui.COLOR_HEADER, *theme['button'])
+            
+            clicked, _ = imgui.selectable(f"  {name}###{path}", is_selected)
+            if clicked:
+                self.selected_internal_sound = path
+                self.sound_name = name
+                self.output_name = name
+                self.preview_internal_sound()
+        
+        imgui.pop_style_color(3)
+        
+        if indent:
+            imgui.unindent(indent)
+    
     def reapply_theme(self):
         """Reapply theme colors when theme changes"""
         theme = self.theme_manager.get_theme()
@@ -3209,7 +3679,7 @@ class SoundsManagerApp:
     
     def render_audio_timeline(self):
         """Render audio timeline with waveform, loop markers, and playback position"""
-        if self.audio_duration_ms == 0:
+        if self.audio_duration_ms == 0 and not self.audio_waveform_failed:
             return  # No audio loaded
         
         draw_list = imgui.get_window_draw_list()
@@ -3232,8 +3702,32 @@ class SoundsManagerApp:
         border_color = imgui.get_color_u32_rgba(*theme['border'])
         draw_list.add_rect(timeline_x, timeline_y, timeline_x + width, timeline_y + height, border_color, 0.0, 0, 1.0)
         
-        # Draw waveform
-        if len(self.audio_waveform) > 0:
+        # Draw waveform (true min/max per column when the samples were read)
+        peaks = self.audio_peaks  # Read once, a background decode may swap it mid-frame
+        if self.audio_waveform_failed:
+            # A flat line and a note instead of an empty box
+            placeholder_color = imgui.get_color_u32_rgba(0.5, 0.5, 0.5, 0.6)
+            center_y = timeline_y + height / 2
+            draw_list.add_line(timeline_x, center_y, timeline_x + width, center_y, placeholder_color, 1.0)
+            placeholder_text = "Waveform unavailable"
+            text_size = imgui.calc_text_size(placeholder_text)
+            draw_list.add_text(timeline_x + (width - text_size.x) / 2, center_y - text_size.y - 4, placeholder_color, placeholder_text)
+            if self.audio_duration_ms == 0:
+                # Nothing to place loop markers on
+                imgui.dummy(width, height + 35)
+                return
+        elif peaks is not None and peaks.peak > 0:
+            waveform_color = imgui.get_color_u32_rgba(0.3, 0.5, 0.7, 0.8)
+            center_y = timeline_y + height / 2
+            # Normalize so the highest peak fills the available height
+            scale = height * 0.85 / 2 / max(peaks.peak, 0.01)
+            
+            num_columns = max(1, int(width / 2))
+            mins, maxs = peaks.get_peaks(0, self.audio_duration_ms, num_columns)
+            for i, (low, high) in enumerate(zip(mins.tolist(), maxs.tolist())):
+                x = timeline_x + (i / num_columns) * width
+                draw_list.add_line(x, center_y - high * scale, x, center_y - low * scale, waveform_color, 1.5)
+        elif len(self.audio_waveform) > 0:
             waveform_color = imgui.get_color_u32_rgba(0.3, 0.5, 0.7, 0.8)
             center_y = timeline_y + height / 2
             waveform_height = height * 0.85  # Use more of the height
@@ -3301,7 +3795,15 @@ class SoundsManagerApp:
                 self.dragging_loop_end = False
         
         # Draw playback position if playing
-        if self.preview_playing and pygame.mixer.music.get_busy():
+        player = self.preview_player
+        if self.preview_playing and player and player.playing:
+            # The preview player knows the exact source frame being heard
+            self.playback_position_ms = player.get_position_ms()
+            if self.audio_duration_ms > 0 and self.playback_position_ms <= self.audio_duration_ms:
+                playback_x = timeline_x + (self.playback_position_ms / self.audio_duration_ms) * width
+                playback_color = imgui.get_color_u32_rgba(1.0, 1.0, 1.0, 0.8)
+                draw_list.add_line(playback_x, timeline_y, playback_x, timeline_y + height, playback_color, 2.0)
+        elif self.preview_playing and pygame.mixer.music.get_busy():
             # Calculate elapsed time since playback started
             current_time = pygame.time.get_ticks()
             elapsed_ms = current_time - self.playback_start_time
@@ -3648,7 +4150,8 @@ class SoundsManagerApp:
                 # Check if cached sound is MP3
                 is_mp3 = self.cached_internal_sound_path.lower().endswith('.mp3')
                 
-                if is_mp3:
+                # The preview player loops MP3s exactly, ffmpeg is only needed for the legacy path
+                if is_mp3 and not self.preview_player:
                     imgui.spacing()
                     imgui.text_colored("(i) Internal sounds as MP3 (limited loop support)", 0.8, 0.8, 0.0, 1.0)
                     
@@ -3687,12 +4190,25 @@ class SoundsManagerApp:
         self.init_window()
         
         while not glfw.window_should_close(self.window):
-            glfw.poll_events()
+            if self.frame_pacer:
+                self.frame_pacer.wait(self.is_animating())
+            else:
+                glfw.poll_events()
             self.impl.process_inputs()
             
             # Check for theme updates
             if self.theme_manager.check_for_updates():
                 self.reapply_theme()
+                if self.frame_pacer:
+                    self.frame_pacer.set_max_fps(self.theme_manager.get_setting('imgui_max_fps', DEFAULT_MAX_FPS))
+            
+            # Loop point / pitch / volume edits reach the playing preview within one chunk
+            self.sync_preview_player()
+            if self.preview_player:
+                self.preview_player.pump()
+            
+            # Progress and results of background jobs
+            self.process_job_events()
             
             # Handle window dragging
             if self.dragging_window:
@@ -3723,6 +4239,13 @@ class SoundsManagerApp:
             self.impl.render(imgui.get_draw_data())
             glfw.swap_buffers(self.window)
         
+        # Release the VPK held open by the decompiler session
+        if self.vsnd_decompiler:
+            self.vsnd_decompiler.close_package()
+        
+        # Background jobs may still log, they must not wake a terminated GLFW
+        if self.frame_pacer:
+            FramePacer.close()
         self.impl.shutdown()
         glfw.terminate()
 
@@ -4,9 +4,11 @@ Downloads and caches DLLs in temp directory
 Uses .NET Core runtime (like Hammer5Tools)
 """
 
+import ctypes
 import os
 import sys
 import tempfile
+import threading
 import urllib.request
 from pathlib import Path
 
@@ -30,6 +32,16 @@ class VSNDDecompiler:
         self.FileExtract = None
         self.Package = None
         
+        # Reflection handles, resolved once in initialize()
+        self.read_entry_method = None
+        self.extract_method = None
+        
+        # Long-lived package session: the VPK directory tree is parsed once, not per sound
+        self.package = None
+        self.package_path = None
+        self.package_signature = None  # (size, mtime) of the VPK when it was opened
+        self.lock = threading.Lock()  # ValvePak Package is not thread-safe
+        
     def ensure_dlls(self):
         """Download DLLs if they don't exist"""
         os.makedirs(self.dll_dir, exist_ok=True)
@@ -95,6 +107,9 @@ class VSNDDecompiler:
                 print("✗ Could not find required .NET types")
                 return False
             
+            if not self.resolve_methods():
+                return False
+            
             self.initialized = True
             print("✓ VSND decompiler initialized with .NET Core")
             return True
@@ -115,10 +130,89 @@ class VSNDDecompiler:
             traceback.print_exc()
             return False
     
+    def resolve_methods(self):
+        """Find Package.ReadEntry and FileExtract.Extract once via reflection"""
+        from System.Reflection import BindingFlags
+        
+        # Find ReadEntry method
+        for method in self.Package.GetMethods(BindingFlags.Public | BindingFlags.Instance):
+            if method.Name == "ReadEntry":
+                params = method.GetParameters()
+                if len(params) >= 2:
+                    self.read_entry_method = method
+                    break
+        
+        if not self.read_entry_method:
+            print("✗ Could not find ReadEntry method")
+            return False
+        
+        # Find Extract method (static method on FileExtract)
+        for method in self.FileExtract.GetMethods(BindingFlags.Public | BindingFlags.Static):
+            if method.Name == "Extract":
+                self.extract_method = method
+                break
+        
+        if not self.extract_method:
+            print("✗ Could not find FileExtract.Extract method")
+            return False
+        
+        return True
+    
+    def open_package(self, vpk_path):
+        """Return the open Package for vpk_path, reading the directory tree only when needed"""
+        import System
+        
+        stat = os.stat(vpk_path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        
+        if self.package is not None and self.package_path == vpk_path and self.package_signature == signature:
+            return self.package
+        
+        # Different VPK, or CS2 updated it since we opened it
+        self.close_package()
+        
+        package = System.Activator.CreateInstance(self.Package)
+        package.Read(vpk_path)
+        
+        self.package = package
+        self.package_path = vpk_path
+        self.package_signature = signature
+        print(f"✓ Opened VPK: {vpk_path}")
+        return package
+    
+    def close_package(self):
+        """Dispose the open Package (if any)"""
+        package = self.package
+        self.package = None
+        self.package_path = None
+        self.package_signature = None
+        if package is not None and hasattr(package, 'Dispose'):
+            try:
+                package.Dispose()
+            except Exception:
+                pass
+    
+    @staticmethod
+    def to_net_bytes(data):
+        """Copy Python bytes into a new .NET byte[] in one Marshal.Copy call"""
+        import System
+        from System import Byte, IntPtr
+        from System.Runtime.InteropServices import Marshal
+        
+        length = len(data)
+        net_array = System.Array.CreateInstance(Byte, length)
+        if length:
+            buffer = ctypes.create_string_buffer(bytes(data), length)
+            Marshal.Copy(IntPtr(ctypes.addressof(buffer)), net_array, 0, length)
+        return net_array
+    
     def decompile_vsnd(self, vpk_path, internal_sound_path, output_path):
         """
         Decompile .vsnd_c file from VPK to .wav or .mp3 (Hammer5Tools method)
         
+        The VPK stays open between calls, so only the first call pays for parsing
+        the directory tree. Safe to call from several threads (calls are serialized).
+        
         Args:
             vpk_path: Path to pak01_dir.vpk
             internal_sound_path: Path inside VPK (e.g., 'sounds/items/healthshot_thud_01.vsnd_c')
@@ -130,120 +224,90 @@ class VSNDDecompiler:
         if not self.initialized and not self.initialize():
             return None
         
+        with self.lock:
+            try:
+                return self._decompile_vsnd(vpk_path, internal_sound_path, output_path)
+            except Exception as e:
+                print(f"✗ Error decompiling vsnd: {e}")
+                import traceback
+                traceback.print_exc()
+                # Don't keep a package around that may be in a broken state
+                self.close_package()
+                return None
+    
+    def _decompile_vsnd(self, vpk_path, internal_sound_path, output_path):
+        """decompile_vsnd body, called with the lock held"""
+        import System
+        from System.IO import File, MemoryStream
+        from System import Byte
+        
+        # Open VPK (reused across calls) and find the file
+        package = self.open_package(vpk_path)
+        
+        # Normalize path - VPK uses forward slashes
+        normalized_path = internal_sound_path.replace("\\", "/")
+        file_entry = package.FindEntry(normalized_path)
+        
+        if not file_entry:
+            print(f"✗ File not found in VPK: {normalized_path}")
+            print(f"  Tried path: {normalized_path}")
+            return None
+        
+        # Invoke ReadEntry to get file data
+        params = self.read_entry_method.GetParameters()
+        args = System.Array.CreateInstance(System.Object, len(params))
+        args[0] = file_entry
+        args[1] = System.Array.CreateInstance(Byte, 0)
+        if len(params) > 2:
+            args[2] = True  # validateCrc
+        
+        self.read_entry_method.Invoke(package, args)
+        data = args[1]  # out parameter contains the data
+        
+        # Keep the data as a .NET byte[] - the resource reads it in place
+        if isinstance(data, (bytes, bytearray)):
+            data = self.to_net_bytes(data)
+        
+        # Create resource and load data
+        resource = System.Activator.CreateInstance(self.Resource)
+        memory_stream = MemoryStream(data)
+        
         try:
-            import System
-            from System.IO import MemoryStream
-            from System import Array, Byte
-            from System.Reflection import BindingFlags
+            resource.Read(memory_stream)
             
-            # Open VPK and extract file
-            package = System.Activator.CreateInstance(self.Package)
-            try:
-                package.Read(vpk_path)
-                
-                # Normalize path - VPK uses forward slashes
-                normalized_path = internal_sound_path.replace("\\", "/")
-                file_entry = package.FindEntry(normalized_path)
-                
-                if not file_entry:
-                    print(f"✗ File not found in VPK: {normalized_path}")
-                    print(f"  Tried path: {normalized_path}")
-                    return None
-                
-                # Find ReadEntry method
-                read_method = None
-                methods = self.Package.GetMethods(BindingFlags.Public | BindingFlags.Instance)
-                for method in methods:
-                    if method.Name == "ReadEntry":
-                        params = method.GetParameters()
-                        if len(params) >= 2:
-                            read_method = method
-                            break
-                
-                if not read_method:
-                    print("✗ Could not find ReadEntry method")
-                    return None
-                
-                # Invoke ReadEntry to get file data
-                params = read_method.GetParameters()
-                args = System.Array.CreateInstance(System.Object, len(params))
-                args[0] = file_entry
-                args[1] = System.Array.CreateInstance(Byte, 0)
-                if len(params) > 2:
-                    args[2] = True  # validateCrc
-                
-                read_method.Invoke(package, args)
-                data = args[1]  # out parameter contains the data
-                
-                # Convert to Python bytes if needed
-                if not isinstance(data, bytes):
-                    data = bytes([data[i] for i in range(data.Length)])
+            # Invoke Extract (static method)
+            extract_params = self.extract_method.GetParameters()
+            extract_args = System.Array.CreateInstance(System.Object, len(extract_params))
+            extract_args[0] = resource
+            for i in range(1, len(extract_params)):
+                extract_args[i] = None
+            
+            content_file = self.extract_method.Invoke(None, extract_args)
+            
+            if content_file and hasattr(content_file, 'Data') and content_file.Data:
+                # Determine output format
+                ext = 'wav'
+                if hasattr(content_file, 'FileName') and content_file.FileName:
+                    file_ext = os.path.splitext(str(content_file.FileName))[1][1:]
+                    if file_ext:
+                        ext = file_ext
+                elif hasattr(content_file, 'Type') and str(content_file.Type).lower() == 'mp3':
+                    ext = 'mp3'
                 
-                # Create resource and load data
-                resource = System.Activator.CreateInstance(self.Resource)
-                memory_stream = MemoryStream(data)
+                # Save file straight from .NET (one bulk write, no per-byte interop)
+                output_file = output_path.replace('.wav', f'.{ext}').replace('.mp3', f'.{ext}')
+                os.makedirs(os.path.dirname(output_file), exist_ok=True)
                 
-                try:
-                    resource.Read(memory_stream)
-                    
-                    # Find Extract method (static method on FileExtract)
-                    extract_method = None
-                    methods = self.FileExtract.GetMethods(BindingFlags.Public | BindingFlags.Static)
-                    for method in methods:
-                        if method.Name == "Extract":
-                            extract_method = method
-                            break
-                    
-                    if not extract_method:
-                        print("✗ Could not find FileExtract.Extract method")
-                        return None
-                    
-                    # Invoke Extract (static method)
-                    extract_params = extract_method.GetParameters()
-                    extract_args = System.Array.CreateInstance(System.Object, len(extract_params))
-                    extract_args[0] = resource
-                    for i in range(1, len(extract_params)):
-                        extract_args[i] = None
-                    
-                    content_file = extract_method.Invoke(None, extract_args)
-                    
-                    if content_file and hasattr(content_file, 'Data') and content_file.Data:
-                        # Determine output format
-                        ext = 'wav'
-                        if hasattr(content_file, 'FileName') and content_file.FileName:
-                            file_ext = os.path.splitext(str(content_file.FileName))[1][1:]
-                            if file_ext:
-                                ext = file_ext
-                        elif hasattr(content_file, 'Type') and str(content_file.Type).lower() == 'mp3':
-                            ext = 'mp3'
-                        
-                        # Save file
-                        output_file = output_path.replace('.wav', f'.{ext}').replace('.mp3', f'.{ext}')
-                        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-                        
-                        out_bytes = bytes([content_file.Data[i] for i in range(content_file.Data.Length)])
-                        with open(output_file, 'wb') as f:
-                            f.write(out_bytes)
-                        
-                        print(f"✓ Decompiled {internal_sound_path} to {output_file} ({len(out_bytes)} bytes)")
-                        return output_file
-                    else:
-                        print("✗ Failed to extract content from .vsnd_c file")
-                        return None
+                out_data = content_file.Data
+                File.WriteAllBytes(output_file, out_data)
                 
-                finally:
-                    memory_stream.Dispose()
-                    if hasattr(resource, 'Dispose'):
-                        resource.Dispose()
-            
-            finally:
-                if hasattr(package, 'Dispose'):
-                    package.Dispose()
-            
-            return None
-            
-        except Exception as e:
-            print(f"✗ Error decompiling vsnd: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+                print(f"✓ Decompiled {internal_sound_path} to {output_file} ({out_data.Length} bytes)")
+                return output_file
+            else:
+                print("✗ Failed to extract content from .vsnd_c file")
+                return None
+        
+        finally:
+            memory_stream.Dispose()
+            if hasattr(resource, 'Dispose'):
+                resource.Dispose()
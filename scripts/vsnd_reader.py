@@ -0,0 +1,188 @@
+"""
+Native VSND reader - no pythonnet / .NET required
+Reads compiled .vsnd_c resources straight from the VPK chunk files and pulls out
+the embedded audio (MP3, RIFF/WAV or raw PCM). Anything else is left to VSNDDecompiler.
+"""
+
+import os
+import struct
+import zlib
+
+# MPEG audio sample rates by version bits (index 3 is reserved)
+MPEG_SAMPLE_RATES = {
+    0b11: (44100, 48000, 32000),  # MPEG 1
+    0b10: (22050, 24000, 16000),  # MPEG 2
+    0b00: (11025, 12000, 8000),   # MPEG 2.5
+}
+
+# Sound header of the DATA block: version 4 stores the format as an enum, older versions bit-pack it
+SOUND_FORMAT_V4_BITS = {0: 16, 1: 8}  # PCM16, PCM8 (2 = MP3, 3 = ADPCM)
+SOUND_TYPE_WAV = 1  # Older headers: 0 = AAC, 1 = WAV, 2 = MP3
+WAVE_AUDIO_FORMAT_PCM = 0  # Older headers: 0 = PCM, 1 = ADPCM
+
+
+def get_chunk_path(vpk_dir_path, archive_index):
+    """Path of the VPK chunk holding an entry (pak01_dir.vpk -> pak01_003.vpk)"""
+    if not vpk_dir_path.endswith('_dir.vpk'):
+        raise ValueError(f"Not a VPK directory file: {vpk_dir_path}")
+    return vpk_dir_path[:-len('_dir.vpk')] + f'_{archive_index:03d}.vpk'
+
+
+def read_vpk_entry(vpk_dir_path, location, crc=None):
+    """Read an entry's bytes directly from its VPK chunk.
+
+    location: (archive_index, archive_offset, file_length) from the sound index
+    crc: expected CRC32 from the directory tree, verified when given
+    """
+    archive_index, archive_offset, file_length = location
+    with open(get_chunk_path(vpk_dir_path, archive_index), 'rb') as f:
+        f.seek(archive_offset)
+        data = f.read(file_length)
+
+    if len(data) != file_length:
+        raise ValueError(f"Short read from VPK chunk ({len(data)} of {file_length} bytes)")
+    if crc is not None and zlib.crc32(data) != crc:
+        raise ValueError("CRC mismatch reading VPK entry (is CS2 updating?)")
+    return data
+
+
+def parse_resource_blocks(data):
+    """Parse the block table of a compiled Source 2 resource.
+
+    Returns {block_type: (absolute_offset, size)}, e.g. {'RED2': ..., 'DATA': ...}
+    """
+    if len(data) < 16:
+        raise ValueError("File too small to be a compiled resource")
+
+    # FileSize (u32), HeaderVersion (u16), Version (u16), BlockOffset (u32), BlockCount (u32)
+    _, header_version, _, block_offset, block_count = struct.unpack_from('<IHHII', data, 0)
+    if header_version != 12:
+        raise ValueError(f"Unsupported resource header version {header_version}")
+
+    # Offsets are relative to the position of the field that stores them
+    table_pos = 8 + block_offset
+    if table_pos + block_count * 12 > len(data):
+        raise ValueError("Resource block table is truncated")
+
+    blocks = {}
+    for i in range(block_count):
+        entry_pos = table_pos + i * 12
+        block_type = data[entry_pos:entry_pos + 4].decode('ascii', errors='replace')
+        offset, size = struct.unpack_from('<II', data, entry_pos + 4)
+        blocks[block_type] = (entry_pos + 4 + offset, size)
+    return blocks
+
+
+def is_mp3_frame(data, pos=0):
+    """Check for a valid MPEG audio frame header at pos"""
+    if pos + 4 > len(data):
+        return False
+    b1, b2 = data[pos + 1], data[pos + 2]
+    if data[pos] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return False
+    version = (b1 >> 3) & 0b11
+    layer = (b1 >> 1) & 0b11
+    bitrate_index = b2 >> 4
+    sample_rate_index = (b2 >> 2) & 0b11
+    return (version in MPEG_SAMPLE_RATES and layer != 0
+            and bitrate_index not in (0, 0xF) and sample_rate_index != 3)
+
+
+def detect_audio_payload(payload):
+    """Return 'mp3' or 'wav' if the payload is a self-describing audio stream, else None"""
+    if payload[:4] == b'RIFF' and payload[8:12] == b'WAVE':
+        return 'wav'
+    if payload[:3] == b'ID3' or is_mp3_frame(payload):
+        return 'mp3'
+    return None
+
+
+def read_sound_header(data, offset, size, resource_version):
+    """(sample_rate, channels, bits) from the DATA block of a raw PCM sound, or None for other formats"""
+    if size < 4 or resource_version > 4:
+        return None
+
+    if resource_version == 4:
+        sample_rate, sound_format, channels = struct.unpack_from('<HBB', data, offset)
+        bits = SOUND_FORMAT_V4_BITS.get(sound_format)
+    else:
+        info = struct.unpack_from('<I', data, offset)[0]
+        if info & 0b11 != SOUND_TYPE_WAV or (info >> 12) & 0b11 != WAVE_AUDIO_FORMAT_PCM:
+            return None
+        bits = (info >> 2) & 0x1F
+        channels = (info >> 7) & 0b11
+        sample_rate = (info >> 14) & 0x1FFFF
+
+    if bits not in (8, 16) or channels < 1 or sample_rate < 1:
+        return None
+    return sample_rate, channels, bits
+
+
+def make_wav_header(sample_rate, channels, bits, data_size):
+    """RIFF/WAVE header for data_size bytes of PCM"""
+    block_align = channels * bits // 8
+    fmt = struct.pack('<HHIIHH', 1, channels, sample_rate, sample_rate * block_align, block_align, bits)
+    return (b'RIFF' + struct.pack('<I', 4 + 8 + len(fmt) + 8 + data_size) + b'WAVE'
+            + b'fmt ' + struct.pack('<I', len(fmt)) + fmt
+            + b'data' + struct.pack('<I', data_size))
+
+
+def get_audio_payload(data):
+    """Extract the embedded audio of a .vsnd_c resource.
+
+    The audio is appended after the DATA block. MP3 and WAV streams are returned as
+    they are, raw PCM gets a WAV header built from the sound header in the DATA block.
+    Returns (extension, bytes), or None for formats that need the decompiler (e.g. ADPCM).
+    """
+    blocks = parse_resource_blocks(data)
+    if 'DATA' not in blocks:
+        raise ValueError("Resource has no DATA block")
+
+    offset, size = blocks['DATA']
+    payload = data[offset + size:]
+    ext = detect_audio_payload(payload)
+    if ext != 'wav':
+        # Raw PCM is checked before the MP3 sniff, samples can look like a frame header
+        resource_version = struct.unpack_from('<H', data, 6)[0]
+        header = read_sound_header(data, offset, size, resource_version)
+        if header is not None:
+            sample_rate, channels, bits = header
+            block_align = channels * bits // 8
+            payload = payload[:len(payload) - len(payload) % block_align]
+            return 'wav', make_wav_header(sample_rate, channels, bits, len(payload)) + payload
+    if ext is None:
+        return None
+
+    if ext == 'wav':
+        # Drop any padding after the RIFF chunk
+        riff_size = struct.unpack_from('<I', payload, 4)[0] + 8
+        payload = payload[:riff_size]
+    return ext, payload
+
+
+def extract_vsnd(vpk_dir_path, location, output_path, crc=None):
+    """
+    Extract the audio of a .vsnd_c entry without .NET
+
+    Args:
+        vpk_dir_path: Path to pak01_dir.vpk
+        location: (archive_index, archive_offset, file_length) of the .vsnd_c entry
+        output_path: Output path without extension (.mp3/.wav is appended)
+        crc: Expected CRC32 of the entry, verified when given
+
+    Returns:
+        Path to output file, or None if the payload is not MP3/WAV (use the .NET decompiler)
+    """
+    data = read_vpk_entry(vpk_dir_path, location, crc)
+    result = get_audio_payload(data)
+    if result is None:
+        return None
+
+    ext, payload = result
+    output_file = f"{output_path}.{ext}"
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    # Write without extension then rename, the preview cache treats files with an extension as complete
+    with open(output_path, 'wb') as f:
+        f.write(payload)
+    os.replace(output_path, output_file)
+    return output_file
@@ -0,0 +1,157 @@
+"""
+Tests for the native VSND reader
+Builds minimal compiled resources in memory and checks the block table and audio payload extraction
+"""
+
+import os
+import struct
+import sys
+import tempfile
+import unittest
+import wave
+import zlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from vsnd_reader import extract_vsnd, get_audio_payload, parse_resource_blocks
+
+# MPEG 1 Layer III, 128kbps, 44.1kHz frame header
+MP3_FRAME = b'\xff\xfb\x90\x64' + b'\x00' * 28
+
+
+def build_resource(blocks, payload=b'', header_version=12, resource_version=0):
+    """Compiled resource with the given (type, data) blocks followed by payload.
+
+    Layout: 16 byte header, block table (12 bytes per block), block data, payload.
+    """
+    header_size = 16
+    table_size = len(blocks) * 12
+    table = b''
+    block_data = b''
+    data_pos = header_size + table_size
+    for i, (block_type, data) in enumerate(blocks):
+        entry_pos = header_size + i * 12
+        # Offsets are relative to the offset field itself
+        table += block_type.encode('ascii') + struct.pack('<II', data_pos + len(block_data) - (entry_pos + 4), len(data))
+        block_data += data
+
+    body = table + block_data + payload
+    # BlockOffset is relative to its own position (8), the table starts right after the header
+    header = struct.pack('<IHHII', header_size + len(body), header_version, resource_version, header_size - 8, len(blocks))
+    return header + body
+
+
+def build_wav(frames=b'\x00\x00' * 8):
+    """16-bit mono RIFF/WAV"""
+    fmt = struct.pack('<HHIIHH', 1, 1, 44100, 88200, 2, 16)
+    chunks = b'WAVE' + b'fmt ' + struct.pack('<I', len(fmt)) + fmt + b'data' + struct.pack('<I', len(frames)) + frames
+    return b'RIFF' + struct.pack('<I', len(chunks)) + chunks
+
+
+class ParseResourceBlocksTest(unittest.TestCase):
+
+    def test_block_offsets(self):
+        data = build_resource([('RED2', b'r' * 10), ('DATA', b'd' * 6)])
+        blocks = parse_resource_blocks(data)
+        self.assertEqual(set(blocks), {'RED2', 'DATA'})
+        offset, size = blocks['RED2']
+        self.assertEqual(data[offset:offset + size], b'r' * 10)
+        offset, size = blocks['DATA']
+        self.assertEqual(data[offset:offset + size], b'd' * 6)
+
+    def test_unsupported_header_version(self):
+        with self.assertRaises(ValueError):
+            parse_resource_blocks(build_resource([('DATA', b'')], header_version=11))
+
+    def test_truncated_block_table(self):
+        data = build_resource([('RED2', b''), ('DATA', b'')])
+        with self.assertRaises(ValueError):
+            parse_resource_blocks(data[:16 + 12])
+
+    def test_too_small(self):
+        with self.assertRaises(ValueError):
+            parse_resource_blocks(b'\x00' * 8)
+
+
+class AudioPayloadTest(unittest.TestCase):
+
+    def test_mp3_after_data_block(self):
+        data = build_resource([('RED2', b'r' * 4), ('DATA', b'd' * 12)], MP3_FRAME * 3)
+        self.assertEqual(get_audio_payload(data), ('mp3', MP3_FRAME * 3))
+
+    def test_id3_tagged_mp3(self):
+        payload = b'ID3\x04\x00\x00\x00\x00\x00\x00' + MP3_FRAME
+        data = build_resource([('DATA', b'd' * 4)], payload)
+        self.assertEqual(get_audio_payload(data), ('mp3', payload))
+
+    def test_wav_padding_is_dropped(self):
+        wav = build_wav()
+        data = build_resource([('DATA', b'd' * 8)], wav + b'\x00' * 16)
+        self.assertEqual(get_audio_payload(data), ('wav', wav))
+
+    def assert_wav(self, result, sample_rate, channels, bits, frames):
+        ext, payload = result
+        self.assertEqual(ext, 'wav')
+        with tempfile.TemporaryDirectory() as temp_dir:
+            wav_path = os.path.join(temp_dir, 'sound.wav')
+            with open(wav_path, 'wb') as f:
+                f.write(payload)
+            with wave.open(wav_path, 'rb') as wav_file:
+                self.assertEqual(wav_file.getframerate(), sample_rate)
+                self.assertEqual(wav_file.getnchannels(), channels)
+                self.assertEqual(wav_file.getsampwidth(), bits // 8)
+                self.assertEqual(wav_file.readframes(wav_file.getnframes()), frames)
+
+    def test_raw_pcm16_version_4(self):
+        # SampleRate (u16), format (u8, 0 = PCM16), channels (u8), then the rest of the header
+        header = struct.pack('<HBB', 44100, 0, 2) + b'\x00' * 28
+        frames = struct.pack('<8h', -1025, 25744, 2, -2, 3, -3, 4, -4)  # Starts like an MP3 frame header (FF FB 90 64)
+        data = build_resource([('DATA', header)], frames + b'\x00', resource_version=4)
+        self.assert_wav(get_audio_payload(data), 44100, 2, 16, frames)
+
+    def test_raw_pcm_bitpacked_header(self):
+        # type 1 (WAV), 16 bits, 1 channel, sample size 2, format 0 (PCM), 22050Hz
+        info = 1 | (16 << 2) | (1 << 7) | (2 << 9) | (0 << 12) | (22050 << 14)
+        frames = struct.pack('<4h', 100, 200, 300, 400)
+        data = build_resource([('DATA', struct.pack('<I', info) + b'\x00' * 28)], frames, resource_version=3)
+        self.assert_wav(get_audio_payload(data), 22050, 1, 16, frames)
+
+    def test_adpcm_needs_decompiler(self):
+        header = struct.pack('<HBB', 44100, 3, 1) + b'\x00' * 28
+        data = build_resource([('DATA', header)], b'\x01\x02\x03\x04' * 8, resource_version=4)
+        self.assertIsNone(get_audio_payload(data))
+
+    def test_missing_data_block(self):
+        with self.assertRaises(ValueError):
+            get_audio_payload(build_resource([('RED2', b'r' * 4)], MP3_FRAME))
+
+
+class ExtractVsndTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.vpk_dir_path = os.path.join(self.temp_dir.name, 'pak01_dir.vpk')
+        self.resource = build_resource([('DATA', b'd' * 8)], MP3_FRAME * 2)
+        # The entry sits after some other data in chunk 2
+        with open(os.path.join(self.temp_dir.name, 'pak01_002.vpk'), 'wb') as f:
+            f.write(b'\xaa' * 100 + self.resource)
+        self.location = (2, 100, len(self.resource))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_extract_mp3(self):
+        output_path = os.path.join(self.temp_dir.name, 'out', 'sound')
+        output_file = extract_vsnd(self.vpk_dir_path, self.location, output_path, zlib.crc32(self.resource))
+        self.assertEqual(output_file, output_path + '.mp3')
+        self.assertFalse(os.path.exists(output_path))
+        with open(output_file, 'rb') as f:
+            self.assertEqual(f.read(), MP3_FRAME * 2)
+
+    def test_crc_mismatch(self):
+        with self.assertRaises(ValueError):
+            extract_vsnd(self.vpk_dir_path, self.location, os.path.join(self.temp_dir.name, 'sound'), zlib.crc32(self.resource) ^ 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
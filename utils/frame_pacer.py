@@ -0,0 +1,64 @@
+"""
+Frame pacing for the imgui tools
+Renders at a capped rate while something moves and sleeps on GLFW events while the window is idle
+"""
+import threading
+import time
+
+import glfw
+
+DEFAULT_MAX_FPS = 60
+IDLE_TIMEOUT = 0.5  # Seconds an idle window sleeps before redrawing anyway (background results, clocks)
+ACTIVE_FRAMES = 3  # Frames rendered after every wake-up, imgui needs a few to settle hover/click state
+
+
+class FramePacer:
+    """Replaces glfw.poll_events() at the top of a render loop.
+
+    wait(animating) blocks until the next frame is due: at most max_fps frames
+    per second while animating (or just after input), otherwise until an input
+    event, a wake() from another thread or IDLE_TIMEOUT.
+    """
+
+    _lock = threading.Lock()  # Orders wake() against close()
+    _closed = False
+
+    def __init__(self, max_fps=DEFAULT_MAX_FPS):
+        self.max_fps = max_fps
+        self.active_frames = ACTIVE_FRAMES
+        self.last_frame = 0.0
+
+    def set_max_fps(self, max_fps):
+        try:
+            self.max_fps = max(1, int(max_fps))
+        except (TypeError, ValueError):
+            self.max_fps = DEFAULT_MAX_FPS
+
+    def wait(self, animating=False):
+        if animating or self.active_frames > 0:
+            # Keep rendering, but no faster than the cap
+            remaining = self.last_frame + 1.0 / self.max_fps - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+            glfw.poll_events()
+            self.active_frames = max(0, self.active_frames - 1)
+        else:
+            started = time.perf_counter()
+            glfw.wait_events_timeout(IDLE_TIMEOUT)
+            if time.perf_counter() - started < IDLE_TIMEOUT * 0.9:
+                # Woken by an event rather than the timeout
+                self.active_frames = ACTIVE_FRAMES
+        self.last_frame = time.perf_counter()
+
+    @classmethod
+    def wake(cls):
+        """Wake a sleeping render loop (safe to call from any thread, a no-op once closed)"""
+        with cls._lock:
+            if not cls._closed:
+                glfw.post_empty_event()
+
+    @classmethod
+    def close(cls):
+        """Call before glfw.terminate(), later wake() calls from background threads are ignored"""
+        with cls._lock:
+            cls._closed = True
@@ -10,6 +10,9 @@ import time
 class ThemeManager:
     """Manager to read and monitor theme from main app settings"""
     
+    # Minimum seconds between settings.json stats in check_for_updates (called every frame)
+    CHECK_INTERVAL = 1.0
+    
     # Font configuration for each theme
     FONTS = {
         'dracula': 'Roboto-Regular.ttf',  # Dracula uses Roboto
@@ -125,7 +128,9 @@ class ThemeManager:
         self.app_dir = os.path.join(self.temp_dir, '.CS2KZ-mapping-tools')
         self.settings_file = os.path.join(self.app_dir, 'settings.json')
         self.last_mtime = 0
+        self.last_check = 0.0
         self.current_theme = 'grey'
+        self.settings = {}
         self._load_theme()
     
     def _load_theme(self):
@@ -140,6 +145,7 @@ class ThemeManager:
                 
                 with open(self.settings_file, 'r') as f:
                     settings = json.load(f)
+                    self.settings = settings
                     theme = settings.get('appearance_mode', 'grey')
                     if theme in self.THEMES:
                         self.current_theme = theme
@@ -153,7 +159,11 @@ class ThemeManager:
             self.current_theme = 'grey'
     
     def check_for_updates(self):
-        """Check if theme has been updated"""
+        """Check if theme has been updated (the file is looked at once per CHECK_INTERVAL)"""
+        now = time.monotonic()
+        if now - self.last_check < self.CHECK_INTERVAL:
+            return False
+        self.last_check = now
         try:
             if os.path.exists(self.settings_file):
                 mtime = os.path.getmtime(self.settings_file)
@@ -168,6 +178,10 @@ class ThemeManager:
         """Get current theme colors"""
         return self.THEMES.get(self.current_theme, self.THEMES['grey'])
     
+    def get_setting(self, key, default=None):
+        """Any other value from the main app's settings.json"""
+        return self.settings.get(key, default)
+    
     def get_theme_name(self):
         """Get current theme name"""
         return self.current_theme
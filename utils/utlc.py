@@ -218,6 +218,23 @@ def RunCommand(cmd, errorCallback = None):
 		else:
 			Error ( "Error running:\n>>>%s\nAborting" % cmd )
 
+# like RunCommand, but echoes and returns the output lines so callers can attribute failures
+# lineCallback (optional) gets every line as it arrives, e.g. to report progress
+def RunCommandOutput(cmd, lineCallback = None):
+	print_I( "--------------------------------" )
+	print_I( "- Running Command: " + cmd )
+	print_I( "--------------------------------" )
+
+	lines = []
+	process = subprocess.Popen( cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors="replace" )
+	for line in process.stdout:
+		print( line, end="" )
+		lines.append( line.rstrip( "\r\n" ) )
+		if lineCallback is not None:
+			lineCallback( lines[-1] )
+	process.wait()
+	return process.returncode, lines
+
 def EnsureFileWritable( fname ):
 	if ( os.path.exists( fname ) ):
 		os.chmod( fname, stat.S_IWRITE )